@@ -78,7 +78,7 @@ class FPAPanel(wx.Panel):
             else:
                 speed = 10**math.floor(math.log10(math.fabs(move))) 
                 direction = math.copysign(1,move)           
-                travel = new.NewportFocusMove(self.controller, self.socket[0],
+                travel = new.NewportFocusMove(self.controller, self.socket,
                                               self.motor, move, speed, 
                                               direction)
                 self.pa = self.pa + travel
@@ -116,7 +116,7 @@ class FPAPanel(wx.Panel):
         try:
             step = self.step_size.GetValue()
             speed = 10**math.floor(math.log10(math.fabs(step)))   
-            travel = new.NewportFocusMove(self.controller, self.socket[0],
+            travel = new.NewportFocusMove(self.controller, self.socket,
                                           self.motor, step, speed, direction)
             self.pa = self.pa + travel
         except ValueError:
@@ -136,7 +136,7 @@ class FPAPanel(wx.Panel):
         travel = 0       
         while work:
             try:
-                travel = travel + new.NewportFocusMove(self.controller, self.socket[0],
+                travel = travel + new.NewportFocusMove(self.controller, self.socket,
                                           self.motor, 1, 10, 1)
                 print travel
             except:
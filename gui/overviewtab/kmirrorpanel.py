@@ -51,7 +51,8 @@ class KmirrorPanel(wx.Panel):
         self.mode_txt = wx.StaticText(self, label="Mode:")
         self.mode     = wx.ComboBox(
             self, -1, size=(126,-1), 
-            choices=("Discrete Tracking", "Velocity Tracking"), 
+            choices=("Discrete Tracking", "Velocity Tracking",
+                     "Trajectory Tracking"), 
             style=wx.CB_READONLY)
 
         self.t_angle_text  = wx.StaticText(self, label="T-Angle:")
@@ -206,6 +207,8 @@ class KmirrorPanel(wx.Panel):
             self.DiscreteTracking(1, user_angle, self._track_event)
         if selected_mode is 1:
             self.VelocityTracking(1, self._track_event)
+        if selected_mode is 2:
+            self.kmirror.track(user_angle, self._track_event, mode='pvt')
 
     @run_async(daemon=True)
     def DiscreteTracking(self, cadence, ua, stop_event):
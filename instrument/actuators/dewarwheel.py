@@ -1,10 +1,24 @@
+import threading
+
+from configobj import ConfigObj
+
 import newport as np
 from instrument.component import InstrumentComponent, InstrumentError, logCall
 
+# Serializes writes of the calibration file, shared by all wheels.
+_calibration_lock = threading.Lock()
+
 class DewarWheel(InstrumentComponent):
     """Represents a Newport controlled wheel in the dewar.
 
+    A wheel calibrated with calibrate() and configured with
+    "positioning = encoder" moves with one GroupMoveAbsolute to the encoder
+    position recorded for each position instead of counting switches. The
+    calibration is kept in the file named by "wheel calibration" in the
+    general config section.
+
     Methods:
+        calibrate
         home
         initialize
         kill
@@ -18,7 +32,7 @@ class DewarWheel(InstrumentComponent):
         Arguments:
             instrument -- Copy of the NESSI instrument -> Instrument
             name       -- Name of the wheel to control -> str 
-            sockets    -- List of integers representing TCP sockets ->[Int]
+            sockets    -- Pool of Newport sockets -> XPSPool
             positions  -- Possible positions for the wheel -> [str]
 ;
         Raises:
@@ -34,6 +48,8 @@ class DewarWheel(InstrumentComponent):
         self.home_pos    = 0
         self.current_pos = 0
         self.positions   = positions
+        self.origin      = None
+        self.offsets     = self._load_calibration()
 
         self.initialize()
         #self.home()
@@ -47,6 +63,23 @@ class DewarWheel(InstrumentComponent):
 
         return self.positions[self.current_pos]
 
+    def index(self, position):
+        """Returns the number of a position given by name or number.
+
+        Raises:
+            InstrumentError
+        """
+        if isinstance(position, basestring):
+            names = [name.lower() for name in self.positions]
+            if position.lower() not in names:
+                raise InstrumentError('The ' + self.name + ' has no position'
+                                      ' named ' + position)
+            return names.index(position.lower())
+        if not 0 <= position < len(self.positions):
+            raise InstrumentError('The ' + self.name + ' has no position %s'
+                                  % position)
+        return position
+
     @logCall(msg='Moving Dewar Wheel.')
     def move(self, selected_pos):
         """Moves the wheel to a selected position.
@@ -62,10 +95,16 @@ class DewarWheel(InstrumentComponent):
         """
         try:
             with self.lock:
-                self.current_pos = np.NewportWheelMove(self.controller, 
-                                                   self.name, self.sockets[0],
-                                                   self.current_pos, 
-                                                   selected_pos)
+                with self.sockets.socket() as socket:
+                    if self.absolute:
+                        self.current_pos = np.NewportWheelMoveAbsolute(
+                            self.controller, self.name, socket, self.origin,
+                            self.offsets, self.current_pos, selected_pos)
+                    else:
+                        self.current_pos = np.NewportWheelMove(
+                            self.controller, self.name, socket,
+                            self.current_pos, selected_pos)
+                        self._locate(socket)
                 return self.current_pos
 
         except Exception as e:
@@ -88,9 +127,10 @@ class DewarWheel(InstrumentComponent):
         """
         try:
             with self.lock:
-                np.NewportWheelHome(self.controller, 
-                                                   self.name, self.sockets[0])
-                self.current_pos = 0
+                with self.sockets.socket() as socket:
+                    np.NewportWheelHome(self.controller, self.name, socket)
+                    self.current_pos = 0
+                    self._locate(socket)
 
         except Exception as e:
             raise InstrumentError('An error occured during a homing of'
@@ -110,7 +150,8 @@ class DewarWheel(InstrumentComponent):
             None
         """
         try:
-            np.NewportKill(self.controller, self.name, self.sockets[1])
+            with self.sockets.emergency() as socket:
+                np.NewportKill(self.controller, self.name, socket)
 
         except Exception as e:
             raise InstrumentError('An error occured during a kill sequence of'
@@ -131,10 +172,80 @@ class DewarWheel(InstrumentComponent):
         """
         try:
             with self.lock:
-                np.NewportInitialize(self.controller, self.name,
-                                     self.sockets[0], self.home_pos)
+                with self.sockets.socket() as socket:
+                    np.NewportInitialize(self.controller, self.name,
+                                         socket, self.home_pos)
+                # The group has been referenced again.
+                self.origin = None
         #TODO: We shouldn't have a catchall here!
         except Exception as e:
             raise InstrumentError('An error occured during initialization of'
                                   ' the' + self.name + '\n The following '
                                   ' error was raised...\n %s' % repr(e))
+
+    @logCall(msg='Calibrating Dewar Wheel.')
+    def calibrate(self):
+        """Homes the wheel and records the encoder position of every
+        position during one turn, see NewportWheelCalibrate. The result is
+        stored in the calibration file.
+
+        Arguments:
+            None
+
+        Raises:
+            InstrumentError
+
+        Returns:
+            None
+        """
+        try:
+            with self.lock:
+                with self.sockets.socket() as socket:
+                    offsets = np.NewportWheelCalibrate(self.controller,
+                                                       self.name, socket)
+                    self.current_pos = 0
+                    self.offsets     = offsets
+                    self._locate(socket)
+                self._save_calibration()
+
+        except Exception as e:
+            raise InstrumentError('An error occured during a calibration of'
+                                  ' the' + self.name + '\n The following '
+                                  ' error was raised...\n %s' % repr(e))
+
+    @property
+    def absolute(self):
+        """Whether moves go straight to the calibrated encoder positions."""
+        return (np.motors[self.name].positioning == 'encoder'
+                and self.offsets is not None and self.origin is not None)
+
+    def _locate(self, socket):
+        # On a known position, the encoder position of the home position
+        # follows from the calibration.
+        if self.offsets is not None:
+            encoder = np.NewportWheelEncoder(self.controller, self.name,
+                                             socket)
+            self.origin = encoder - self.offsets[self.current_pos]
+
+    def _calibration_file(self):
+        return np.cfg['general'].get('wheel calibration',
+                                     'wheelcalibration.ini')
+
+    def _load_calibration(self):
+        """Returns the stored offsets of the wheel, or None if it has not
+        been calibrated with its current number of slots."""
+        with _calibration_lock:
+            calibration = ConfigObj(infile=self._calibration_file())
+        if self.name not in calibration:
+            return None
+        offsets = [float(x) for x in calibration[self.name]['offsets']]
+        if len(offsets) != np.motors[self.name].slots + 1:
+            return None
+        return offsets
+
+    def _save_calibration(self):
+        with _calibration_lock:
+            calibration = ConfigObj(infile=self._calibration_file())
+            calibration[self.name] = {'offsets' : [repr(x) for x in
+                                                   self.offsets]}
+            calibration.write()
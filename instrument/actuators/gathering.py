@@ -0,0 +1,200 @@
+"""
+.. module:: gathering
+   :platform: Unix
+   :synopsis: Controller-side motion traces from the XPS gathering buffer.
+
+The XPS can sample positioner quantities at up to its servo rate into its
+own memory. Recording a trace there and pulling it back in bulk replaces
+polling GroupPositionCurrentGet over the network:
+
+    gathering = Gathering(controller, sockets, 'kmirror', rate=1000.0)
+    with gathering.recording():
+        ...                          # move or track
+    trace = gathering.trace
+    trace.time, trace.position, trace.following_error
+
+Only one gathering can run on the controller at a time.
+"""
+
+from contextlib import contextmanager
+import threading
+
+import numpy as np
+
+from newport import cfg, XPSErrorHandler
+from instrument.component import InstrumentError
+
+# Servo loop rate of the XPS-C8 in Hz. Gathering rates are divisors of it.
+SERVO_RATE = 10000.0
+
+# Gathering memory of the controller, in samples summed over all types.
+MAX_SAMPLES = 1000000
+
+# Lines requested per GatheringDataMultipleLinesGet call. Keeps each reply
+# well inside the controller's reply buffer.
+LINES_PER_READ = 500
+
+DEFAULT_QUANTITIES = ('CurrentPosition', 'CurrentVelocity', 'FollowingError')
+
+_controller_lock = threading.Lock()
+
+
+class MotionTrace(object):
+    """Samples of one gathering, one column per quantity.
+
+    Attributes:
+        positioner -- XPS positioner name -> str
+        quantities -- Gathered quantities, in column order -> (str)
+        rate       -- Sampling rate in Hz -> float
+        data       -- Samples, shape (samples, quantities) -> ndarray
+    """
+
+    def __init__(self, positioner, quantities, rate, data):
+        self.positioner = positioner
+        self.quantities = tuple(quantities)
+        self.rate       = rate
+        self.data       = data
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, quantity):
+        """Column of a quantity, e.g. trace['CurrentPosition']."""
+        return self.data[:, self.quantities.index(quantity)]
+
+    @property
+    def time(self):
+        """Seconds since the first sample."""
+        return np.arange(len(self)) / self.rate
+
+    @property
+    def position(self):
+        return self['CurrentPosition']
+
+    @property
+    def velocity(self):
+        return self['CurrentVelocity']
+
+    @property
+    def following_error(self):
+        return self['FollowingError']
+
+
+def decode_lines(text, columns):
+    """Decodes GatheringDataMultipleLinesGet text (';' separated fields,
+    one line per sample) into an array of shape (lines, columns)."""
+    values = np.fromstring(text.strip().replace('\n', ';'), sep=';')
+    return values.reshape(-1, columns)
+
+
+class Gathering(object):
+    """Configures, runs and reads back a gathering for one motor.
+
+    Attributes:
+        controller -- XPS controller -> xps
+        sockets    -- Pool of Newport sockets -> XPSPool
+        motor      -- Motor name, for config file purposes -> str
+        quantities -- Positioner quantities to gather -> (str)
+        rate       -- Requested sampling rate in Hz, rounded to a divisor
+                      of the servo rate -> float
+        points     -- Samples to gather before the controller stops on its
+                      own. Defaults to as many as the memory holds.
+        trace      -- MotionTrace of the last completed gathering.
+    """
+
+    def __init__(self, controller, sockets, motor,
+                 quantities=DEFAULT_QUANTITIES, rate=1000.0, points=None):
+        self.controller = controller
+        self.sockets    = sockets
+        self.motor      = motor
+        self.quantities = tuple(quantities)
+        self.divisor    = max(1, int(round(SERVO_RATE / rate)))
+        self.rate       = SERVO_RATE / self.divisor
+        max_points      = MAX_SAMPLES // len(self.quantities)
+        self.points     = min(points or max_points, max_points)
+        self.trace      = None
+        self._running   = False
+
+    @property
+    def positioner(self):
+        return cfg[self.motor]['positioner']
+
+    def start(self):
+        """Configures the gathering and starts it on the controller.
+
+        Raises:
+            InstrumentError -- if another gathering is running or the
+                               controller refuses the configuration.
+        """
+        if not _controller_lock.acquire(False):
+            raise InstrumentError('A gathering is already running on the'
+                                  ' Newport controller!')
+        try:
+            types = ['%s.%s' % (self.positioner, quantity)
+                     for quantity in self.quantities]
+            with self.sockets.socket() as socket:
+                config = self.controller.GatheringConfigurationSet(socket,
+                                                                   types)
+                if config[0] != 0:
+                    XPSErrorHandler(self.controller, socket, config[0],
+                                    'GatheringConfigurationSet')
+                run = self.controller.GatheringRun(socket, self.points,
+                                                   self.divisor)
+                if run[0] != 0:
+                    XPSErrorHandler(self.controller, socket, run[0],
+                                    'GatheringRun')
+        except:
+            _controller_lock.release()
+            raise
+        self._running = True
+
+    def stop(self):
+        """Stops the gathering, reads every gathered sample back and stores
+        it as self.trace.
+
+        Returns:
+            MotionTrace
+        """
+        if not self._running:
+            return self.trace
+        try:
+            with self.sockets.socket() as socket:
+                stop = self.controller.GatheringStop(socket)
+                # -22 : the gathering had already filled and stopped itself.
+                if stop[0] != 0 and stop[0] != -22:
+                    XPSErrorHandler(self.controller, socket, stop[0],
+                                    'GatheringStop')
+                self.trace = MotionTrace(self.positioner, self.quantities,
+                                         self.rate, self._read(socket))
+        finally:
+            self._running = False
+            _controller_lock.release()
+        return self.trace
+
+    @contextmanager
+    def recording(self):
+        """Context manager gathering for the duration of the block."""
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def _read(self, socket):
+        current = self.controller.GatheringCurrentNumberGet(socket)
+        if current[0] != 0:
+            XPSErrorHandler(self.controller, socket, current[0],
+                            'GatheringCurrentNumberGet')
+        total  = current[1]
+        chunks = []
+        for index in range(0, total, LINES_PER_READ):
+            lines = min(LINES_PER_READ, total - index)
+            reply = self.controller.GatheringDataMultipleLinesGet(socket,
+                                                                  index, lines)
+            if reply[0] != 0:
+                XPSErrorHandler(self.controller, socket, reply[0],
+                                'GatheringDataMultipleLinesGet')
+            chunks.append(decode_lines(reply[1], len(self.quantities)))
+        if not chunks:
+            return np.empty((0, len(self.quantities)))
+        return np.concatenate(chunks)
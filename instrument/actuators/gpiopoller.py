@@ -0,0 +1,274 @@
+"""
+.. module:: gpiopoller
+   :platform: Unix
+   :synopsis: Shared reader of the Newport GPIO4.DI switch word.
+
+Every dewar wheel search, the FPA homing and the limit watchdogs used to
+read GPIO4.DI on their own socket, every 100 ms or faster, so a setup
+moving four wheels sent four streams of the same request. GPIOPoller reads
+the word once for everybody, at a fixed rate, on a pooled socket, while
+anybody is waiting on it or subscribed to it:
+
+    gpio = GPIOPoller(controller, sockets, switches(cfg), rate=20.0)
+    gpio.start()
+    gpio.active('mask.position')            # last state of a switch
+    gpio.wait('mask.position', timeout=5)   # until it is active
+    token = gpio.subscribe('array.upper', listener, edge=True)
+    gpio.unsubscribe(token)
+
+Switches are named "section.switch" after the home, position, upper and
+lower subsections of nessisettings.ini, or given directly as a Switch or a
+(bit, active value) tuple. Listeners are called from the poller thread as
+listener(switch, active, time) when a switch changes, so they have to be
+quick. Every read is timestamped with the time its reply came back. A read
+that fails is retried on the next period; waiters only get the error once
+max_failures reads in a row have failed.
+"""
+
+import logging
+import threading
+import time
+
+from instrument.component import InstrumentError
+
+import newport as np
+from motorconfig import SWITCHES, Switch, compile_motors
+
+
+def switches(cfg):
+    """Dictionary of every switch of the motor sections of cfg,
+    "section.switch" -> Switch."""
+    named = {}
+    for name, motor in compile_motors(cfg).items():
+        for switch in SWITCHES:
+            if getattr(motor, switch) is not None:
+                named[name + '.' + switch] = getattr(motor, switch)
+    return named
+
+
+class _Subscription(object):
+
+    __slots__ = ('switch', 'compiled', 'listener', 'edge', 'state')
+
+    def __init__(self, switch, compiled, listener, edge):
+        self.switch   = switch
+        self.compiled = compiled
+        self.listener = listener
+        self.edge     = edge
+        self.state    = None
+
+
+class GPIOPoller(object):
+    """Reads GPIO4.DI at a fixed rate and tells subscribers about switch
+    changes.
+
+    Attributes:
+        controller -- XPS controller -> xps
+        sockets    -- Pool of Newport sockets -> XPSPool
+        names      -- Switches known by name -> {str: Switch}
+        rate       -- Reads a second -> float
+        max_failures -- Failed reads in a row raised to waiters -> int
+        word       -- Last word read, None before the first read -> int
+        time       -- time.time() of the last read -> float
+    """
+
+    def __init__(self, controller, sockets, names=None, rate=20.0,
+                 max_failures=5):
+        self.controller = controller
+        self.sockets    = sockets
+        self.names      = names or {}
+        self.rate       = rate
+        self.max_failures = max_failures
+        self.word       = None
+        self.time       = 0.0
+        self._error     = None
+        self._failures  = 0
+        self._cond      = threading.Condition()
+        self._subscriptions = []
+        self._waiting   = 0
+        self._stop      = threading.Event()
+        self._thread    = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(name='GPIOPoller',
+                                            target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def read(self, since=None, timeout=None):
+        """Returns (word, time) of the first read made after since (a
+        time.time() value), waiting for it if needed. Without since the
+        last read is returned, or the first one if there was none yet.
+
+        Raises:
+            InstrumentError -- if the poller is not running, the word could
+                               not be read or timeout expired.
+        """
+        if since is None:
+            since = 0.0
+        if timeout is None:
+            timeout = (10.0 + self.max_failures) / self.rate + \
+                      self.sockets.timeout
+        deadline = time.time() + timeout
+        with self._cond:
+            while self.time <= since:
+                remaining = deadline - time.time()
+                if self._error is not None:
+                    raise self._error
+                if not self.running:
+                    raise InstrumentError('GPIO4.DI poller is not running.')
+                if remaining <= 0:
+                    raise InstrumentError('No GPIO4.DI read within %.1f s.'
+                                          % timeout)
+                self._wait(remaining)
+            return self.word, self.time
+
+    def active(self, switch, since=None):
+        """Whether switch is active in the word read by read(since), by
+        default a word at most one period old."""
+        if since is None:
+            since = time.time() - 1.0 / self.rate
+        return self._switch(switch).test(self.read(since)[0])
+
+    def wait(self, switch, active=True, timeout=None):
+        """Waits until switch is active (or inactive) in a word read after
+        the call. Returns whether it is, False if timeout expired.
+
+        Raises:
+            InstrumentError -- if the word can no longer be read.
+        """
+        switch   = self._switch(switch)
+        deadline = None if timeout is None else time.time() + timeout
+        since = time.time()
+        with self._cond:
+            while True:
+                if self.time > since and switch.test(self.word) == active:
+                    return True
+                if self._error is not None:
+                    raise self._error
+                if not self.running:
+                    raise InstrumentError('GPIO4.DI poller is not running.')
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Woken by every read, the wait bound only guards against a
+                # stalled poller.
+                self._wait(remaining if remaining is not None
+                           else 10.0 / self.rate)
+
+    def subscribe(self, switch, listener, edge=None):
+        """Calls listener(switch, active, time) when switch changes; only
+        when it becomes active if edge is True, inactive if edge is False.
+        Changes are counted from the first read after the call. Returns a
+        token for unsubscribe."""
+        subscription = _Subscription(switch, self._switch(switch), listener,
+                                     edge)
+        with self._cond:
+            self._subscriptions.append(subscription)
+            self._cond.notify_all()
+        return subscription
+
+    def unsubscribe(self, token):
+        with self._cond:
+            if token in self._subscriptions:
+                self._subscriptions.remove(token)
+
+    def _wait(self, timeout):
+        # Called with _cond held. The poller thread sleeps while nobody
+        # waits, so it is woken up.
+        self._waiting += 1
+        self._cond.notify_all()
+        try:
+            self._cond.wait(timeout)
+        finally:
+            self._waiting -= 1
+
+    def _switch(self, switch):
+        if isinstance(switch, Switch):
+            return switch
+        if isinstance(switch, tuple):
+            return Switch(*switch)
+        try:
+            return self.names[switch]
+        except KeyError:
+            raise InstrumentError('Unknown GPIO4.DI switch %r.' % (switch,))
+
+    def _run(self):
+        period = 1.0 / self.rate
+        next_read = time.time()
+        while not self._stop.is_set():
+            with self._cond:
+                if not (self._waiting or self._subscriptions):
+                    while not (self._waiting or self._subscriptions or
+                               self._stop.is_set()):
+                        self._cond.wait()
+                    next_read = time.time()
+            if self._stop.is_set():
+                break
+            self._poll()
+            next_read += period
+            delay = next_read - time.time()
+            if delay < 0:
+                # Late, the controller was slow to answer: skip the missed
+                # reads instead of bursting.
+                next_read = time.time()
+                delay = 0
+            self._stop.wait(delay)
+
+    def _poll(self):
+        try:
+            with self.sockets.socket(timeout=1.0 / self.rate) as socket:
+                value = self.controller.GPIODigitalGet(socket, 'GPIO4.DI')
+                if value[0] != 0:
+                    np.XPSErrorHandler(self.controller, socket, value[0],
+                                       'GPIODigitalGet')
+        except InstrumentError as e:
+            # A busy pool or a single bad read is retried; the error is only
+            # raised to the waiters once the reads keep failing.
+            with self._cond:
+                self._failures += 1
+                if self._failures < self.max_failures:
+                    logging.debug('GPIO4.DI poller, read %d failed: %s'
+                                  % (self._failures, e))
+                    return
+                if self._error is None:
+                    logging.warning('GPIO4.DI poller: %s' % e)
+                self._error = e
+                self._cond.notify_all()
+            return
+        now = time.time()
+        with self._cond:
+            self.word   = value[1]
+            self.time   = now
+            self._error = None
+            self._failures = 0
+            self._cond.notify_all()
+            changes = []
+            for subscription in self._subscriptions:
+                state = subscription.compiled.test(value[1])
+                if state != subscription.state:
+                    if subscription.state is not None and \
+                       subscription.edge in (None, state):
+                        changes.append((subscription, state))
+                    subscription.state = state
+        for subscription, state in changes:
+            try:
+                subscription.listener(subscription.switch, state, now)
+            except Exception:
+                logging.exception('GPIO4.DI listener of %s failed.'
+                                  % (subscription.switch,))
@@ -0,0 +1,212 @@
+"""
+.. module:: jogtracker
+   :platform: Unix
+   :synopsis: Closed-loop K-mirror tracking with jog velocities.
+
+NewportKmirrorTracking sends the field rotation rate every second but never
+looks at where the K-mirror is, so over a long exposure the position error
+is the sum of every rate error. JogTracker predicts the K-mirror angle like
+PVTTracker and closes the loop on the measured position:
+
+    tracker = JogTracker(controller, sockets, 'kmirror', telescope, t_angle,
+                         rate=1.0, kp=0.5, ki=0.05, deadband=0.0005)
+    tracker.run(track_event)        # returns once track_event is set
+    tracker.stats.rms               # position error, degrees
+
+Each tick the jog velocity is the predicted rate of the angle (feed
+forward) plus kp times the error plus ki times its integral, the error
+being the predicted minus the measured angle. The new velocity is only sent
+when it differs from the last one sent by more than deadband, so a steady
+track costs one position read a tick. The pointing is read from the
+telescope every telescope_period seconds, the angles are computed locally
+in between (see astrometry).
+"""
+
+import collections
+import logging
+import math
+import time
+
+import numpy as np
+
+from newport import motors, XPSErrorHandler
+from pvt import kmirror_angles
+
+
+class TrackingStats(object):
+    """Position error of the ticks of a tracking session.
+
+    Attributes:
+        ticks   -- Number of ticks -> int
+        updates -- Number of velocities sent -> int
+        mean    -- Mean error, degrees -> float
+        rms     -- Root mean square error, degrees -> float
+        peak    -- Largest absolute error, degrees -> float
+        history -- (time, error, velocity, sent) of the last ticks -> deque
+    """
+
+    __slots__ = ('ticks', 'updates', 'peak', 'history', '_sum', '_sumsq')
+
+    def __init__(self, history=3600):
+        self.ticks   = 0
+        self.updates = 0
+        self.peak    = 0.0
+        self.history = collections.deque(maxlen=history)
+        self._sum    = 0.0
+        self._sumsq  = 0.0
+
+    def add(self, when, error, velocity, sent):
+        self.ticks   += 1
+        self.updates += int(sent)
+        self.peak     = max(self.peak, abs(error))
+        self._sum    += error
+        self._sumsq  += error*error
+        self.history.append((when, error, velocity, sent))
+
+    @property
+    def mean(self):
+        return self._sum / self.ticks if self.ticks else 0.0
+
+    @property
+    def rms(self):
+        return math.sqrt(self._sumsq / self.ticks) if self.ticks else 0.0
+
+    def summary(self):
+        return {'ticks' : self.ticks, 'updates' : self.updates,
+                'mean' : self.mean, 'rms' : self.rms, 'peak' : self.peak}
+
+
+class JogTracker(object):
+    """Tracks the K-mirror with jog velocities corrected by its measured
+    position.
+
+    Attributes:
+        controller -- XPS controller -> xps
+        sockets    -- Pool of Newport sockets -> XPSPool
+        motor      -- Motor name, for config file purposes -> str
+        telescope  -- Source of the pointing ephemeris -> Telescope
+        t_angle    -- User angle to hold -> float
+        rate       -- Ticks a second -> float
+        kp         -- Proportional gain, degrees/s per degree -> float
+        ki         -- Integral gain, degrees/s per degree second -> float
+        deadband   -- Smallest velocity change sent, degrees/s -> float
+        max_velocity     -- Largest velocity sent, degrees/s -> float
+        telescope_period -- Seconds between telescope reads -> float
+        stats      -- Error statistics of the session -> TrackingStats
+    """
+
+    # Jog acceleration, as used by NewportKmirrorRotate.
+    acceleration = 400
+
+    def __init__(self, controller, sockets, motor, telescope, t_angle,
+                 rate=1.0, kp=0.5, ki=0.05, deadband=0.0005,
+                 max_velocity=2.0, telescope_period=30.0):
+        self.controller = controller
+        self.sockets    = sockets
+        self.motor      = motor
+        self.telescope  = telescope
+        self.t_angle    = t_angle
+        self.rate       = rate
+        self.kp         = kp
+        self.ki         = ki
+        self.deadband   = deadband
+        self.max_velocity     = max_velocity
+        self.telescope_period = telescope_period
+        self.stats      = TrackingStats()
+        self._target    = None
+
+    @property
+    def group(self):
+        return motors[self.motor].group
+
+    def predict(self, when):
+        """Predicted angle and rate of the K-mirror at when (a time.time()
+        value), in degrees and degrees/s. The angle is taken modulo 180
+        nearest the previous prediction, so it stays continuous."""
+        ephemeris = self.telescope.ephemeris(self.telescope_period)
+        step = 0.5
+        angles = kmirror_angles(
+            ephemeris.at(when + np.array([-step, 0.0, step])).ha,
+            ephemeris.dec_at(when), self.t_angle,
+            motors[self.motor].direction, ephemeris.latitude)
+        angle = angles[1]
+        if self._target is not None:
+            angle += 180.0*round((self._target - angle) / 180.0)
+        self._target = angle
+        return angle, (angles[2] - angles[0]) / (2*step)
+
+    def run(self, track_event):
+        """Tracks until track_event is set. The K-mirror is first moved to
+        the predicted angle nearest its position.
+
+        Raises:
+            InstrumentError -- if a controller command fails.
+        """
+        period   = 1.0 / self.rate
+        integral = 0.0
+        # The integral alone never asks for more than half the velocity
+        # range, so it cannot wind up while the velocity is clipped.
+        windup   = 0.5*self.max_velocity / self.ki if self.ki else 0.0
+        sent     = None
+        try:
+            with self.sockets.socket() as socket:
+                self._target = self._position(socket)
+                self._start(socket)
+                last = time.time()
+                next_tick = last + period
+                while not track_event.wait(max(next_tick - time.time(), 0)):
+                    next_tick += period
+                    position = self._position(socket)
+                    now      = time.time()
+                    target, feed = self.predict(now)
+                    error    = target - position
+                    integral = min(max(integral + error*(now - last),
+                                       -windup), windup)
+                    last     = now
+                    velocity = feed + self.kp*error + self.ki*integral
+                    velocity = min(max(velocity, -self.max_velocity),
+                                   self.max_velocity)
+                    update   = sent is None or \
+                               abs(velocity - sent) > self.deadband
+                    if update:
+                        jog = self.controller.GroupJogParametersSet(
+                            socket, self.group, [velocity],
+                            [self.acceleration])
+                        # -22: the jog mode was left by a stop.
+                        if jog[0] == -22 and track_event.is_set():
+                            break
+                        elif jog[0] != 0:
+                            XPSErrorHandler(self.controller, socket, jog[0],
+                                            "GroupJogParametersSet")
+                        sent = velocity
+                    self.stats.add(now, error, velocity, update)
+        finally:
+            track_event.set()
+        logging.info("K-mirror closed loop tracking ended: %d ticks, %d"
+                     " velocity updates, error rms %.4f, peak %.4f degrees."
+                     % (self.stats.ticks, self.stats.updates, self.stats.rms,
+                        self.stats.peak))
+
+    def _start(self, socket):
+        """Moves to the predicted angle and enables the jog mode."""
+        mode = self.controller.GroupJogModeDisable(socket, self.group)
+        if mode[0] != 0 and mode[0] != -22:
+            XPSErrorHandler(self.controller, socket, mode[0],
+                            "GroupJogModeDisable")
+        move = self.controller.GroupMoveAbsolute(
+            socket, self.group, [float(self.predict(time.time())[0])])
+        if move[0] != 0:
+            XPSErrorHandler(self.controller, socket, move[0],
+                            "GroupMoveAbsolute")
+        mode = self.controller.GroupJogModeEnable(socket, self.group)
+        if mode[0] != 0 and mode[0] != -22:
+            XPSErrorHandler(self.controller, socket, mode[0],
+                            "GroupJogModeEnable")
+
+    def _position(self, socket):
+        position = self.controller.GroupPositionCurrentGet(socket,
+                                                           self.group, 1)
+        if position[0] != 0:
+            XPSErrorHandler(self.controller, socket, position[0],
+                            "GroupPositionCurrentGet")
+        return position[1]
@@ -1,6 +1,11 @@
 from threadtools import run_async
 import math
+import time
 import instrument.actuators.newport as np
+from instrument.actuators.gathering import Gathering
+from instrument.actuators.jogtracker import JogTracker
+from instrument.actuators.pvt import PVTTracker
+from instrument.actuators.statuscache import StatusCache
 from instrument.component import InstrumentComponent, InstrumentError, logCall
 
 
@@ -15,13 +20,15 @@ class KMirror(InstrumentComponent):
         track
     """
 
-    def __init__(self, instrument, controller, sockets):
+    def __init__(self, instrument, controller, sockets, status=None):
         """Connects to, initializes, and homes a specified wheel in the dewar. 
 
         Arguments:
             instrument -- Copy of the NESSI instrument
             controller -- XPS instance to use for control 
-            sockets    -- List of integers representing TCP sockets
+            sockets    -- Pool of Newport sockets (XPSPool)
+            status     -- Shared motor status cache (StatusCache). A private
+                          one is made if not given.
 
         Raises:
              InstrumentError
@@ -35,9 +42,12 @@ class KMirror(InstrumentComponent):
         self.motor = 'kmirror'
         self.controller = controller
         self.sockets = sockets
+        self.status = status or StatusCache(controller, sockets)
         self.home_pos = 0
         self.current_pos = 0
         self.track_status = False
+        self.trace = None
+        self.tracker = None
 
         self.initialize()
 
@@ -56,8 +66,10 @@ class KMirror(InstrumentComponent):
         try:
             with self.lock:
                 self.track_status = False
-                np.NewportInitialize(self.controller, self.motor,
-                                     self.sockets[0], self.home_pos)
+                with self.sockets.socket() as socket:
+                    np.NewportInitialize(self.controller, self.motor,
+                                         socket, self.home_pos)
+                self.status.invalidate(self.motor)
                 self.current_pos = 0
 
         except InstrumentError as e:
@@ -79,7 +91,9 @@ class KMirror(InstrumentComponent):
         """
         try:
             self.track_status = False
-            np.NewportKill(self.controller, self.motor, self.sockets[1])
+            with self.sockets.emergency() as socket:
+                np.NewportKill(self.controller, self.motor, socket)
+            self.status.invalidate(self.motor)
 
         except InstrumentError as e:
             raise InstrumentError('An error occured during a kill sequence of'
@@ -88,13 +102,19 @@ class KMirror(InstrumentComponent):
 
     @property
     def positionAngle(self):
-        return np.NewportStatusGet(self.controller, self.sockets[1], 
-                                   self.motor)[0]
+        """Position of the K-mirror, at most status.ttl seconds old."""
+        return self.getPositionAngle()
+
+    def getPositionAngle(self, fresh=False):
+        """Position of the K-mirror, read from the controller if fresh or
+        if the cached status has expired."""
+        return self.status.get(self.motor, fresh)[0]
 
     def userAngleToPositionAngle(self, userAngle):
         if self.instrument.telescope:
-            parallactic_angle = self.instrument.telescope.parallactic_angle
-            altitude      = self.instrument.telescope.altitude
+            sky = self.instrument.telescope.ephemeris().at(time.time())
+            parallactic_angle = float(sky.parallactic)
+            altitude      = float(sky.altitude)
             tmode         = int(self.instrument.cfg['kmirror']['direction'])
             positionAngle = 0.5 * ((userAngle - parallactic_angle) 
                                  - tmode * (altitude))
@@ -119,8 +139,10 @@ class KMirror(InstrumentComponent):
         """
         try:
             with self.lock:
-                np.NewportKmirrorMove(self.controller, self.sockets[0], 
-                                   self.motor, position)
+                with self.sockets.socket() as socket:
+                    np.NewportKmirrorMove(self.controller, socket, 
+                                          self.motor, position)
+                self.status.invalidate(self.motor)
                 self.current_pos = self.positionAngle
 
         except InstrumentError as e:
@@ -170,7 +192,7 @@ class KMirror(InstrumentComponent):
         Returns:
             None
         """
-        self.move(offset + self.positionAngle)
+        self.move(offset + self.getPositionAngle(fresh=True))
 
     @logCall(msg='Homeing the Kmirror.')
     def home(self):
@@ -201,7 +223,9 @@ class KMirror(InstrumentComponent):
         """
         try:
             self.track_status = False
-            np.NewportStop(self.controller, self.sockets[2], self.motor)
+            with self.sockets.socket() as socket:
+                np.NewportStop(self.controller, socket, self.motor)
+            self.status.invalidate(self.motor)
         
         except InstrumentError as e:
             raise InstrumentError('An error occured during a stop sequence of'
@@ -209,13 +233,22 @@ class KMirror(InstrumentComponent):
                                   ' error was raised...\n %s' % repr(e))    
     @logCall(msg='Tracking KMirror')
     @run_async(daemon=True)
-    def track(self, t_angle, track_event):
+    def track(self, t_angle, track_event, trace_rate=None, mode=None):
         """Starts the K-Mirror tracking loop.
             
         Arguments:
             t_angle -- A user defined value specific to the tracking target.
             track_event --- threading.Event object to signal when tracking
                             is finished.
+            trace_rate -- If given, position, velocity and following error
+                          are gathered on the controller at this rate [Hz]
+                          for the session and left in self.trace.
+            mode -- 'jog' to update a jog velocity every second,
+                    'closed' to correct the jog velocity by the measured
+                    position (see jogtracker.JogTracker), 'pvt' to run
+                    predicted PVT trajectories (see pvt.PVTTracker).
+                    Defaults to the 'tracking' key of the kmirror config.
+                    The tracker is left in self.tracker.
 
         Raises:
             InstrumentError
@@ -224,8 +257,43 @@ class KMirror(InstrumentComponent):
             None
         """
         try:
-            np.NewportKmirrorTracking(self, self.controller, self.sockets[0],
-                                      self.motor, t_angle, track_event)        
+            if trace_rate:
+                gathering = Gathering(self.controller, self.sockets,
+                                      self.motor, rate=trace_rate)
+                gathering.start()
+            settings = np.motors[self.motor]
+            if mode is None:
+                mode = settings.tracking
+            self.tracker = None
+            try:
+                if mode in ('pvt', 'closed') and \
+                   not self.instrument.telescope:
+                    raise InstrumentError('%s tracking needs the telescope!'
+                                          % mode)
+                if mode == 'pvt':
+                    self.tracker = PVTTracker(self.controller, self.sockets,
+                                              self.motor,
+                                              self.instrument.telescope,
+                                              t_angle)
+                    self.tracker.run(track_event)
+                elif mode == 'closed':
+                    self.tracker = JogTracker(self.controller, self.sockets,
+                                              self.motor,
+                                              self.instrument.telescope,
+                                              t_angle, settings.track_rate,
+                                              settings.track_kp,
+                                              settings.track_ki,
+                                              settings.track_deadband)
+                    self.tracker.run(track_event)
+                else:
+                    with self.sockets.socket() as socket:
+                        np.NewportKmirrorTracking(self, self.controller,
+                                                  socket, self.motor, 
+                                                  t_angle, track_event)
+            finally:
+                self.status.invalidate(self.motor)
+                if trace_rate:
+                    self.trace = gathering.stop()
         except InstrumentError as e:
             raise InstrumentError('An error occured during a stop sequence of'
                                   ' the K-Mirror.\n The following '
@@ -245,8 +313,10 @@ class KMirror(InstrumentComponent):
         """
         try:
             with self.lock:
-                np.NewportKmirrorRotate(self.controller, self.sockets[0], 
-                                   self.motor, vel)
+                with self.sockets.socket() as socket:
+                    np.NewportKmirrorRotate(self.controller, socket, 
+                                            self.motor, vel)
+                self.status.invalidate(self.motor)
         except InstrumentError as e:
             raise InstrumentError('An error occured during a velocity set of'
                                   ' the K-Mirror. \n The following '
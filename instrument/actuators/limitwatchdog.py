@@ -0,0 +1,199 @@
+"""
+.. module:: limitwatchdog
+   :platform: Unix
+   :synopsis: Limit switch watchdog for Newport motions.
+
+NewportFocusLimit used to poll GPIO4.DI and the velocity of the FPA as fast
+as the controller answered, on the socket the moves needed, before the
+moves could start. LimitWatchdog runs next to the motion instead:
+
+    watchdog = LimitWatchdog(controller, socket, kill_socket, 'G5',
+                             [('upper', 10, 0)], rate=20.0)
+    with watchdog:
+        ...                         # move, checking watchdog.tripped
+    if watchdog.trip is not None:
+        ...                         # {'limit': 'upper', 'time': ...}
+
+The switches are read at most rate times a second on socket. When one is
+active the group is killed with GroupKill on kill_socket, or every group
+with KillAll if that fails. With events on, the controller also aborts any
+move of the group the moment a watched switch closes, so the poll rate
+only bounds how late the trip is reported and the kill sent.
+
+Given the shared GPIOPoller, the watchdog reads nothing itself: it trips on
+the poller's switch changes and checks at its rate that the poller still
+reads the word.
+"""
+
+import logging
+import threading
+import time
+
+from instrument.component import InstrumentError
+
+from motorconfig import Switch
+
+
+class LimitWatchdog(object):
+    """Watches limit switches of a group and kills it when one is hit.
+
+    Attributes:
+        controller  -- XPS controller -> xps
+        socket      -- Socket the switches are read on -> int
+        kill_socket -- Socket reserved for the kill -> int
+        group       -- XPS group to kill -> str
+        limits      -- (name, GPIO4.DI bit, active value) of each switch to
+                       watch -> [(str, int, int)]
+        rate        -- Maximum number of reads a second -> float
+        events      -- Also arm controller events aborting the group's
+                       moves on the switches -> bool
+        gpio        -- Poller to take the switches from instead of reading
+                       them on socket -> GPIOPoller
+        tripped     -- Set once a limit was hit -> threading.Event
+        trip        -- What tripped the watchdog, None until then -> dict
+    """
+
+    def __init__(self, controller, socket, kill_socket, group, limits,
+                 rate=20.0, events=False, gpio=None):
+        self.controller  = controller
+        self.socket      = socket
+        self.kill_socket = kill_socket
+        self.group       = group
+        self.limits      = limits
+        self._switches   = [(name, Switch(bit, val))
+                            for name, bit, val in limits]
+        self.rate        = rate
+        self.events      = events
+        self.gpio        = gpio
+        self.tripped     = threading.Event()
+        self.trip        = None
+        self._listeners  = []
+        self._stop       = threading.Event()
+        self._thread     = None
+        self._event_ids  = []
+        self._tokens     = []
+        self._trip_lock  = threading.Lock()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def subscribe(self, listener):
+        """Calls listener(trip) from the watchdog thread when it trips."""
+        self._listeners.append(listener)
+
+    def start(self):
+        """Reads the switches once, arms the events and starts watching.
+        A switch already active trips the watchdog before this returns.
+        If it raises, the watchdog is stopped, with nothing left subscribed.
+
+        Raises:
+            InstrumentError -- if the switches cannot be read or the events
+                               cannot be armed.
+        """
+        try:
+            if self.gpio is not None:
+                for name, switch in self._switches:
+                    self._tokens.append(self.gpio.subscribe(
+                        switch, self._changed(name), edge=True))
+            if not self._check():
+                return self
+            if self.events:
+                self._arm()
+        except Exception:
+            self.stop()
+            raise
+        self._thread = threading.Thread(name='LimitWatchdog ' + self.group,
+                                         target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops watching and removes the events."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for token in self._tokens:
+            self.gpio.unsubscribe(token)
+        self._tokens = []
+        for event in self._event_ids:
+            self.controller.EventExtendedRemove(self.socket, event)
+        self._event_ids = []
+
+    def _run(self):
+        period = 1.0 / self.rate
+        try:
+            while not self._stop.wait(period) and self._check():
+                pass
+        except InstrumentError:
+            # The switches can no longer be read, so the motion is stopped
+            # as if a limit had been hit.
+            self._trip('unreadable', None)
+
+    def _check(self):
+        """Reads the switches, trips on an active one. Returns whether to
+        keep watching."""
+        if self.gpio is not None:
+            value = [0, self.gpio.read(since=time.time())[0]]
+        else:
+            value = self.controller.GPIODigitalGet(self.socket, 'GPIO4.DI')
+        if value[0] != 0:
+            raise InstrumentError('Limit watchdog of %s could not read'
+                                  ' GPIO4.DI (error %d).'
+                                  % (self.group, value[0]))
+        for name, switch in self._switches:
+            if switch.test(value[1]):
+                self._trip(name, value[1])
+                return False
+        return True
+
+    def _changed(self, name):
+        return lambda switch, active, when: self._trip(name, self.gpio.word)
+
+    def _arm(self):
+        for name, bit, val in self.limits:
+            edge = 'DIHighLow' if val == 0 else 'DILowHigh'
+            for command, args in (
+                ('EventExtendedConfigurationTriggerSet',
+                 (['GPIO4.DI.' + edge], [str(bit)], ['0'], ['0'], ['0'])),
+                ('EventExtendedConfigurationActionSet',
+                 ([self.group + '.MoveAbort'], ['0'], ['0'], ['0'], ['0'])),
+                ('EventExtendedStart', ())):
+                reply = getattr(self.controller, command)(self.socket, *args)
+                if reply[0] != 0:
+                    self.stop()
+                    raise InstrumentError('Limit watchdog of %s could not arm'
+                                          ' its %s event: %s error %d.'
+                                          % (self.group, name, command,
+                                             reply[0]))
+            self._event_ids.append(reply[1])
+
+    def _trip(self, name, value):
+        with self._trip_lock:
+            if self.tripped.is_set():
+                return
+            self._trip_once(name, value)
+
+    def _trip_once(self, name, value):
+        kill = self.controller.GroupKill(self.kill_socket, self.group)
+        killed = 'GroupKill'
+        if kill[0] != 0:
+            killall = self.controller.KillAll(self.kill_socket)
+            killed = 'KillAll' if killall[0] == 0 else None
+        self.trip = {'limit' : name, 'gpio' : value, 'time' : time.time(),
+                     'kill' : killed}
+        self.tripped.set()
+        if killed is None:
+            logging.error('Limit watchdog of %s tripped on the %s limit but'
+                          ' could not kill the group (error %d).'
+                          % (self.group, name, kill[0]))
+        else:
+            logging.warning('Limit watchdog of %s tripped on the %s limit,'
+                            ' group stopped by %s.'
+                            % (self.group, name, killed))
+        for listener in self._listeners:
+            listener(self.trip)
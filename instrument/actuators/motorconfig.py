@@ -0,0 +1,119 @@
+"""
+.. module:: motorconfig
+   :platform: Unix
+   :synopsis: Newport motor settings compiled from nessisettings.ini.
+
+The motion functions of newport read their settings from the ConfigObj,
+where every value is a string, so the loops watching the switches parsed
+the same bits and directions again on each iteration. compile_motors turns
+every motor section once into a Motor with typed fields and a Switch per
+GPIO4.DI switch:
+
+    motors = compile_motors(cfg)
+    mask   = motors['mask']
+    mask.direction, mask.slots              # ints
+    mask.position.test(word)                # position switch active in word
+
+A motor section is any section with a group.
+"""
+
+# GPIO4.DI switch subsections of a motor section.
+SWITCHES = ('home', 'position', 'upper', 'lower')
+
+
+class Switch(object):
+    """A GPIO4.DI switch.
+
+    Attributes:
+        bit    -- Bit of the switch in GPIO4.DI -> int
+        val    -- Value of the bit when the switch is active -> int
+        mask   -- 1 << bit -> int
+        active -- word & mask when the switch is active -> int
+    """
+
+    __slots__ = ('bit', 'val', 'mask', 'active')
+
+    def __init__(self, bit, val):
+        self.bit    = int(bit)
+        self.val    = int(val)
+        self.mask   = 1 << self.bit
+        self.active = self.mask if self.val else 0
+
+    def test(self, word):
+        """Whether the switch is active in GPIO4.DI word."""
+        return word & self.mask == self.active
+
+    def __repr__(self):
+        return 'Switch(%d, %d)' % (self.bit, self.val)
+
+
+class Motor(object):
+    """Settings of one motor section.
+
+    Attributes:
+        name        -- Section name -> str
+        label       -- Display name, the section name if there is none -> str
+        group       -- XPS group -> str
+        positioner  -- XPS positioner -> str
+        direction   -- 1 or -1 -> int
+        slots       -- Positions of a wheel, 0 for other motors -> int
+        reverse     -- A wheel may turn backward -> bool
+        backlash    -- Backlash of a wheel, signed by direction -> int
+        search      -- Wheel switch search, "poll" or "event" -> str
+        move        -- Wheel moves run by the "host" or "tcl" -> str
+        positioning -- Wheel positioning, "count" or "encoder" -> str
+        tracking    -- K-mirror tracking, "jog", "closed" or "pvt" -> str
+        track_rate, track_kp, track_ki, track_deadband -- Closed loop
+                       tracking ticks a second, gains and deadband -> float
+        watchdog_rate   -- Limit watchdog reads a second -> float
+        watchdog_events -- Limit watchdog arms controller events -> bool
+        home, position, upper, lower -- Switches, None if absent -> Switch
+    """
+
+    __slots__ = ('name', 'label', 'group', 'positioner', 'direction', 'slots',
+                 'reverse', 'backlash', 'search', 'move', 'positioning',
+                 'tracking', 'track_rate', 'track_kp', 'track_ki',
+                 'track_deadband', 'watchdog_rate', 'watchdog_events') + \
+                SWITCHES
+
+    def __init__(self, name, section):
+        self.name        = name
+        self.label       = section.get('name', name)
+        self.group       = section['group']
+        self.positioner  = section.get('positioner', self.group + '.P1')
+        self.direction   = int(section.get('direction', 1))
+        self.slots       = int(section.get('slots', 0))
+        self.reverse     = int(section.get('reverse', 0)) == 1
+        self.backlash    = self.direction*int(section.get('backlash', 0))
+        self.search      = section.get('search', 'poll')
+        self.move        = section.get('move', 'host')
+        self.positioning = section.get('positioning', 'count')
+        self.tracking    = section.get('tracking', 'jog')
+        self.track_rate     = float(section.get('track rate', 1.0))
+        self.track_kp       = float(section.get('track kp', 0.5))
+        self.track_ki       = float(section.get('track ki', 0.05))
+        self.track_deadband = float(section.get('track deadband', 0.0005))
+        self.watchdog_rate   = float(section.get('watchdog rate', 20))
+        self.watchdog_events = int(section.get('watchdog events', 0)) == 1
+        for switch in SWITCHES:
+            if switch in section:
+                setattr(self, switch, Switch(section[switch]['bit'],
+                                             section[switch]['val']))
+            else:
+                setattr(self, switch, None)
+
+    def __repr__(self):
+        return 'Motor(%r, group=%r)' % (self.name, self.group)
+
+
+def compile_motors(cfg, motors=None):
+    """Dictionary of a Motor per motor section of cfg. Given motors, a
+    previous result, it is updated in place so holders of it see the new
+    settings."""
+    compiled = dict((name, Motor(name, cfg[name])) for name in cfg.sections
+                    if 'group' in cfg[name])
+    if motors is None:
+        return compiled
+    motors.clear()
+    motors.update(compiled)
+    return motors
@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 
 from configobj import ConfigObj
+import ftplib
 import math
+import os
 import time
 from time import clock
 import threading
@@ -11,11 +13,42 @@ from wx.lib.pubsub import Publisher
 import XPS_C8_drivers as xps
 from threadtools import run_async, timeout, TimeoutError
 from instrument.component import InstrumentError
+from limitwatchdog import LimitWatchdog
+from motorconfig import compile_motors
 
 
 cfg = ConfigObj(infile="nessisettings.ini")
+# Typed settings of every motor section of cfg, see NewportCompileConfig.
+motors = compile_motors(cfg)
 fpa_limit_flag = threading.Event()
 
+# Shared GPIO4.DI poller (gpiopoller.GPIOPoller) installed by the instrument.
+# While it runs the switch watching loops wait on it instead of polling the 
+# controller on their own socket.
+gpio = None
+
+# Distance of the fast moves between dewar wheel positions.
+WHEEL_GAP = 340
+
+# TCL scripts run on the controller, and where the controller keeps them.
+TCL_DIR          = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "tcl")
+TCL_REMOTE_DIR   = "/Admin/Public/Scripts"
+TCL_WHEEL_SCRIPT = "nessiwheel.tcl"
+
+def NewportCompileConfig():
+    """Compiles the motor sections of cfg again, in place, after cfg was 
+    changed or reloaded.  The motion functions take their settings from 
+    motors, which is compiled once when this module is loaded.
+
+        Arguments: None.
+
+        Returns: None.
+
+        Raises: None.
+    """
+    compile_motors(cfg, motors)
+
 def XPSErrorHandler(controller, socket, code, name):
     """This is a general error handling function for the newport controller 
     functions. First the function checks for errors in communicating with the 
@@ -88,13 +121,17 @@ def NewportWheelHome(controller, wheel, socket):
             InstrumentError:    This is raised if the wheel fails to home.
     """
     # Config-file based variables.
-    group     = cfg[wheel]["group"]
-    speed     = int(cfg[wheel]["direction"])*30
-    wheel_gap = int(cfg[wheel]["direction"])*340
-    homeval   = int(cfg[wheel]["home"]["val"])
-    homebit   = int(cfg[wheel]["home"]["bit"])
-    posval    = int(cfg[wheel]["position"]["val"])
-    posbit    = int(cfg[wheel]["position"]["bit"])  
+    motor     = motors[wheel]
+    group     = motor.group
+    speed     = motor.direction*30
+    wheel_gap = motor.direction*WHEEL_GAP
+    home      = motor.home
+    switch    = motor.position
+
+    # The whole search can be run on the controller instead.
+    if motor.move == "tcl":
+        wheeltcl(controller, socket, wheel, 0, True)
+        return
 
     # Start of the algorithm.  If the wheel is not at a position it goes to one. 
     value = controller.GPIODigitalGet(socket, "GPIO4.DI")
@@ -106,22 +143,8 @@ def NewportWheelHome(controller, wheel, socket):
     # This portion initiates a slow move forward to find the next position if it
     # is not already at one.  If it is then it passes to the next part of the 
     # function.
-    elif int(format(value[1], "016b")[::-1][posbit]) != posval:
-        Gset = controller.GroupSpinParametersSet(socket, group, speed, 800)
-        while True:
-            time.sleep(.1)
-            value = controller.GPIODigitalGet(socket, "GPIO4.DI") 
-            if value[0] != 0:
-                XPSErrorHandler(controller, socket, value[0], 
-                                "GPIODigitalGet")
-            elif int(format(value[1], "016b")[::-1][posbit]) == posval:
-                stop=controller.GroupSpinModeStop(socket, group, 1200)
-                if stop[0] != 0:
-                    XPSErrorHandler(controller, socket, stop[0],
-                                    "GroupSpinModeStop")
-                break
-            else:
-                pass
+    elif not switch.test(value[1]):
+        wheelsearch(controller, socket, wheel, group, speed, switch)
     else:
         pass
 
@@ -132,7 +155,7 @@ def NewportWheelHome(controller, wheel, socket):
     if value[0] != 0:
         XPSErrorHandler(controller, socket, value[0], 
                         "GPIODigitalGet")
-    elif int(format(value[1], "016b")[::-1][homebit]) == homeval:
+    elif home.test(value[1]):
         return
     else:
         pass
@@ -151,30 +174,8 @@ def NewportWheelHome(controller, wheel, socket):
             if GMove[0] != 0:
                 XPSErrorHandler(controller, socket, GMove[0], 
                                 "GroupMoveRelative")
-        # Starting slow motion to the next position.
-        Gset = controller.GroupSpinParametersSet(socket, group, speed, 
-                                                 800)
-        # Checking if the motion command was sent correctly.
-        # If so then the GPIO checking begins.
-        if Gset[0] != 0:
-            XPSErrorHandler(controller ,socket, Gset[0],
-                            "GroupSpinParametersSet")
-        else:
-            # The while loop checks for a position switch to open.
-            while True:
-                time.sleep(.1)
-                value = controller.GPIODigitalGet(socket, "GPIO4.DI")
-                if value[0] != 0:
-                    XPSErrorHandler(controller, socket, value[0],
-                                    "GPIODigitalGet")
-                elif int(format(value[1], "016b")[::-1][posbit]) == posval:
-                    stop=controller.GroupSpinModeStop(socket, group, 1200)
-                    if stop[0] != 0:
-                        XPSErrorHandler(controller, socket, stop[0],
-                                        "GroupSpinModeStop")
-                    break
-                else:
-                    pass
+        # Slow motion to the next position switch.
+        wheelsearch(controller, socket, wheel, group, speed, switch)
         # Once at a position, the home switch is checked to see if it is the 
         # home position.  If so then the function returns, otherwise this 
         # iteration of the loop passes.
@@ -182,7 +183,7 @@ def NewportWheelHome(controller, wheel, socket):
         if value[0] != 0:
             XPSErrorHandler(controller, socket, value[0], 
                             "GPIODigitalGet")
-        elif int(format(value[1], "016b")[::-1][homebit]) == homeval:
+        elif home.test(value[1]):
             return
         else:
             pass
@@ -191,7 +192,7 @@ def NewportWheelHome(controller, wheel, socket):
     if value[0] != 0:
         XPSErrorHandler(controller, socket, value[0], 
                             "GPIODigitalGet")
-    elif int(format(value[1], "016b")[::-1][homebit]) == homeval:
+    elif home.test(value[1]):
         return
     else:
         message = "Error: Homing of " + str(wheel) + \
@@ -206,6 +207,11 @@ def NewportWheelMove(controller, wheel, socket, current, position):
     then the wheel should be homed first.  This function does not have a
     Timeout and can run indefinitely if there are problems with the switches.
 
+    With "reverse = 1" in the wheel's config section the wheel turns backward
+    when that is shorter (see wheelplan).  A backward move ends by backing 
+    off "backlash" past the position and approaching it forward again, so 
+    the wheel stops on the same side of the switch as after a forward move.
+
         Arguments: controller, name, socket, current, position.
 
             controller: [xps]   Which instance of the XPS controller to use.
@@ -224,21 +230,26 @@ def NewportWheelMove(controller, wheel, socket, current, position):
         Raises: None
     """
     # Initializing config-file specific variables.
-    group     = cfg[wheel]["group"]
-    speed     = int(cfg[wheel]["direction"])*30
-    wheel_gap = int(cfg[wheel]["direction"])*340
-    val       = int(cfg[wheel]["position"]["val"])
-    bit       = int(cfg[wheel]["position"]["bit"])
+    motor     = motors[wheel]
+    group     = motor.group
+    speed     = motor.direction*30
+    wheel_gap = motor.direction*WHEEL_GAP
+    switch    = motor.position
+    slots     = motor.slots
+    backlash  = motor.backlash
     # diff is how many positions away from current the target position is.
-    diff      = (int(cfg[wheel]["slots"]) - current + position) % \
-                int(cfg[wheel]["slots"])
+    diff      = (slots - current + position) % slots
 
     # First there is a check to see if the motor is already at the current 
     # position. This check is only a check of inputs.  It does not check to see
     # if the motor is in a position.  If a motor has been moved by hand or if a
     # previous move had failed then this check could still pass despite being
     # wrong.
-    if current != position:
+    if current != position and motor.move == "tcl":
+        wheeltcl(controller, socket, wheel, diff, False)
+        return position
+
+    elif current != position:
         # If the motor passes the theoretical check then the function checks to 
         # see if the motor is on a switch. If it is not for some reason then it 
         # moves forward slowly until it finds a switch and sets the movement 
@@ -247,57 +258,31 @@ def NewportWheelMove(controller, wheel, socket, current, position):
         value = controller.GPIODigitalGet(socket, "GPIO4.DI")
         if value[0] != 0:
             XPSErrorHandler(controller, socket, value[0], "GPIODigitalGet")
-        elif int(format(value[1], "016b")[::-1][bit]) != val:
+        elif not switch.test(value[1]):
             logging.info("Slow motion due to previous switch passed.")
-            Gset = controller.GroupSpinParametersSet(socket, group, speed,
-                                                     800)
-            while True:
-                time.sleep(.1)
-                value = controller.GPIODigitalGet(socket, "GPIO4.DI")
-                if value[0] != 0:
-                    XPSErrorHandler(controller, socket, value[0], 
-                                    "GPIODigitalGet")
-                elif int(format(value[1], "016b")[::-1][bit]) == val:
-                    stop=controller.GroupSpinModeStop(socket, group, 1200)
-                    if stop[0] != 0:
-                        XPSErrorHandler(controller, socket, stop[0],
-                                        "GroupSpinModeStop")
-                    diff = diff - 1
-                    break
-                else:
-                    pass
+            wheelsearch(controller, socket, wheel, group, speed, switch)
+            diff = diff - 1
         else:
             pass
 
-        # This loop moves the wheel forward one position each iteration and runs
-        # until it reaches the specified position.
-        for i in range(diff):
-            # This loop moves the motor close to the next position quickly.
-            for j in range(2):
-                GMove = controller.GroupMoveRelative(socket, group, [wheel_gap])
+        # The shorter way round, if the wheel may turn backward.
+        steps = wheelplan(slots, diff, motor.reverse)
+        if steps < 0:
+            logging.info("Moving " + wheel + " backward " + str(-steps) + 
+                         " positions.")
+            wheelsteps(controller, socket, wheel, group, -steps, -wheel_gap,
+                       -speed, switch)
+            # The backlash is taken up by approaching the position forward.
+            if backlash != 0:
+                GMove = controller.GroupMoveRelative(socket, group, 
+                                                     [-backlash])
                 if GMove[0] != 0:
                     XPSErrorHandler(controller, socket, GMove[0], 
                                     "GroupMoveRelative")
-            # Starting slow motion.
-            Gset = controller.GroupSpinParametersSet(socket, group, speed,
-                                                     800)
-            # Checking if the motion command was sent correctly.
-            # If so then the GPIO checking begins.
-            if Gset[0] != 0:
-                XPSErrorHandler(controller ,socket, Gset[0],
-                                "GroupSpinParametersSet")
-            else:
-                logging.info("Slow due to position search.")
-                try:
-                    wheelcheck(controller, socket, bit, val, group)
-                except TimeoutError:
-                    stop=controller.GroupSpinModeStop(socket, group, 1200)
-                    if stop[0] != 0:
-                        XPSErrorHandler(controller, socket, stop[0],
-                                                        "GroupSpinModeStop")
-                    message = wheel + " wheel failed to find a position and"+\
-                    " may now be out of sync.  Home wheel and try again."
-                    raise InstrumentError(message)
+                wheelsearch(controller, socket, wheel, group, speed, switch)
+        else:
+            wheelsteps(controller, socket, wheel, group, steps, wheel_gap,
+                       speed, switch)
             
         return position
     
@@ -305,31 +290,432 @@ def NewportWheelMove(controller, wheel, socket, current, position):
         return position
                 
 
+def NewportWheelCalibrate(controller, wheel, socket):
+    """This function homes a dewar wheel, then turns it once round position
+    by position, recording the encoder position of every position switch.
+    The result is used by NewportWheelMoveAbsolute.
+
+        Arguments: controller, wheel, socket.
+
+            controller: [xps]   Which instance of the XPS controller to use.
+            wheel:      [str]   The name of the wheel.  This is for config
+                                file purposes.
+            socket:     [int]   Which socket to use to communicate with the XPS 
+                                controller.
+
+        Returns: offsets.
+
+            offsets:    [list]  Encoder position of each position relative to
+                                the home position, followed by the length of 
+                                a whole turn (slots + 1 values, the first 0).
+
+        Raises: InstrumentError.
+
+            InstrumentError:    This is raised if the wheel is not back home
+                                after a whole turn.
+    """
+    motor     = motors[wheel]
+    group     = motor.group
+    speed     = motor.direction*30
+    wheel_gap = motor.direction*WHEEL_GAP
+
+    NewportWheelHome(controller, wheel, socket)
+    origin  = NewportWheelEncoder(controller, wheel, socket)
+    offsets = [0.0]
+    for i in range(motor.slots):
+        wheelsteps(controller, socket, wheel, group, 1, wheel_gap, speed, 
+                   motor.position)
+        offsets.append(NewportWheelEncoder(controller, wheel, socket) - 
+                       origin)
+
+    value = controller.GPIODigitalGet(socket, "GPIO4.DI")
+    if value[0] != 0:
+        XPSErrorHandler(controller, socket, value[0], "GPIODigitalGet")
+    elif not motor.home.test(value[1]):
+        message = "Error: Calibration of " + str(wheel) + " failed, the" + \
+                  " home switch was not found after a whole turn."
+        raise InstrumentError(message)
+    return offsets
+
+
+def NewportWheelEncoder(controller, wheel, socket):
+    """Returns the encoder position of a wheel's group.
+
+        Raises: InstrumentError.
+    """
+    position = controller.GroupPositionCurrentGet(socket, motors[wheel].group,
+                                                  1)
+    if position[0] != 0:
+        XPSErrorHandler(controller, socket, position[0], 
+                        "GroupPositionCurrentGet")
+    return position[1]
+
+
+def NewportWheelMoveAbsolute(controller, wheel, socket, origin, offsets, 
+                             current, position):
+    """This function moves a calibrated dewar wheel to a selected position
+    with one GroupMoveAbsolute to the encoder position recorded for it by 
+    NewportWheelCalibrate, instead of searching for every switch on the way.
+    The direction is chosen like in NewportWheelMove, and a backward move 
+    first goes "backlash" past the position.  Once there the position switch 
+    is checked; if it is not closed the switch is searched for slowly, 
+    which must not take the wheel further than half a position.
+
+        Arguments: controller, wheel, socket, origin, offsets, current, 
+                   position.
+
+            controller: [xps]   Which instance of the XPS controller to use.
+            wheel:      [str]   The name of the wheel.  This is for config
+                                file purposes.
+            socket:     [int]   Which socket to use to communicate with the XPS 
+                                controller.
+            origin:     [float] Encoder position of the home position, read 
+                                after the last home.
+            offsets:    [list]  Result of NewportWheelCalibrate.
+            current:    [int]   What position the motor is currently at.
+            position:   [int]   What position the motor should move to.
+
+        Returns: position.
+
+        Raises: InstrumentError.
+
+            InstrumentError:    This is raised if the position switch is not
+                                found near the recorded position.
+    """
+    motor     = motors[wheel]
+    group     = motor.group
+    speed     = motor.direction*30
+    switch    = motor.position
+    slots     = motor.slots
+    backlash  = motor.backlash
+    turn      = offsets[slots]
+
+    if current == position:
+        return position
+
+    # The recorded position of current on the turn the wheel is on, then the
+    # way to the target as chosen by wheelplan.
+    encoder = NewportWheelEncoder(controller, wheel, socket)
+    start   = origin + offsets[current] + \
+              turn*round((encoder - origin - offsets[current]) / turn)
+    steps   = wheelplan(slots, (slots - current + position) % slots, 
+                        motor.reverse)
+    target  = start + offsets[position] - offsets[current]
+    if steps > 0 and (target - start)*turn < 0:
+        target += turn
+    elif steps < 0 and (target - start)*turn > 0:
+        target -= turn
+
+    moves = [target]
+    if steps < 0 and backlash != 0:
+        moves.insert(0, target - backlash)
+    for move in moves:
+        GMove = controller.GroupMoveAbsolute(socket, group, [move])
+        if GMove[0] != 0:
+            XPSErrorHandler(controller, socket, GMove[0], "GroupMoveAbsolute")
+
+    # Switch confirmation.
+    value = controller.GPIODigitalGet(socket, "GPIO4.DI")
+    if value[0] != 0:
+        XPSErrorHandler(controller, socket, value[0], "GPIODigitalGet")
+    elif not switch.test(value[1]):
+        logging.warning(wheel + " position switch open at the calibrated" + 
+                        " position, searching.")
+        wheelsearch(controller, socket, wheel, group, speed, switch)
+        error = NewportWheelEncoder(controller, wheel, socket) - target
+        if abs(error) > abs(turn) / slots / 2:
+            message = wheel + " wheel found its position switch " + \
+                      str(error) + " away from the calibrated position." + \
+                      "  Home or calibrate wheel and try again."
+            raise InstrumentError(message)
+    return position
+
+
+def wheelplan(slots, diff, reverse):
+    """Number of positions to move to go diff positions forward on a wheel
+    of slots positions: diff, or diff - slots (negative, backward) if the 
+    wheel may turn backward and that is fewer positions.  Half way round 
+    the wheel moves forward.
+
+        Arguments: slots, diff, reverse.
+
+            slots:      [int]   Number of positions on the wheel.
+            diff:       [int]   Positions to go forward, 0 to slots - 1.
+            reverse:    [bool]  Whether the wheel may turn backward.
+
+        Returns: steps.
+
+            steps:      [int]   Signed number of positions to move.
+    """
+    if reverse and slots - diff < diff:
+        return diff - slots
+    return diff
+
+
+def wheelsteps(controller, socket, wheel, group, count, wheel_gap, speed, 
+               switch):
+    """Moves a wheel count positions, each with two fast moves of wheel_gap 
+    and a slow search at speed for switch.  The direction is the sign of 
+    wheel_gap and speed.
+
+        Raises: InstrumentError.
+
+            InstrumentError:    This is raised if a position is not found.
+    """
+    # This loop moves the wheel one position each iteration and runs until it
+    # reaches the specified position.
+    for i in range(count):
+        # This loop moves the motor close to the next position quickly.
+        for j in range(2):
+            GMove = controller.GroupMoveRelative(socket, group, [wheel_gap])
+            if GMove[0] != 0:
+                XPSErrorHandler(controller, socket, GMove[0], 
+                                "GroupMoveRelative")
+        # Slow motion to the next position switch.
+        logging.info("Slow due to position search.")
+        try:
+            wheelsearch(controller, socket, wheel, group, speed, switch)
+        except TimeoutError:
+            stop=controller.GroupSpinModeStop(socket, group, 1200)
+            if stop[0] != 0:
+                XPSErrorHandler(controller, socket, stop[0],
+                                                "GroupSpinModeStop")
+            message = wheel + " wheel failed to find a position and"+\
+            " may now be out of sync.  Home wheel and try again."
+            raise InstrumentError(message)
+
+
+def wheelsearch(controller, socket, wheel, group, speed, switch):
+    """Moves a wheel slowly at speed until its position switch is active, 
+    then stops it.  How the switch is watched is chosen by the "search"
+    key of the wheel's config section:
+
+        poll:  The wheel spins while the host polls GPIO4.DI every 100 ms 
+               and sends a stop once the switch is seen (the default).
+        event: The controller stops the wheel itself on the switch edge and
+               the host only waits for the move to finish.
+
+        Arguments: controller, socket, wheel, group, speed, switch.
+
+            controller: [xps]   Which instance of the XPS controller to use.
+            socket:     [int]   Which socket to use to communicate with the XPS 
+                                controller.
+            wheel:      [str]   The name of the wheel.  This is for config
+                                file purposes.
+            group:      [str]   The XPS group of the wheel.
+            speed:      [float] Signed search speed.
+            switch:     [Switch] The wheel's position switch.
+
+        Returns: None.
+
+        Raises: InstrumentError.
+    """
+    if motors[wheel].search == "event":
+        wheelevent(controller, socket, wheel, group, speed, switch)
+    else:
+        Gset = controller.GroupSpinParametersSet(socket, group, speed, 800)
+        if Gset[0] != 0:
+            XPSErrorHandler(controller ,socket, Gset[0],
+                            "GroupSpinParametersSet")
+        wheelcheck(controller, socket, switch, group)
+
+
+def wheelevent(controller, socket, wheel, group, speed, switch):
+    """Event driven slot search.  An extended event is armed on the edge of
+    the position switch with a MoveAbort action on the wheel's group, then 
+    the wheel is moved slowly forward by up to one slot.  The controller 
+    aborts the move the moment the switch closes, so the stop does not wait
+    on a poll or a network round trip.  See wheelsearch.
+
+        Raises: InstrumentError.
+
+            InstrumentError:    This is raised if the switch is not found 
+                                within one slot.
+    """
+    positioner = motors[wheel].positioner
+    edge = "DIHighLow" if switch.val == 0 else "DILowHigh"
+    direction = 1 if speed > 0 else -1
+
+    trigger = controller.EventExtendedConfigurationTriggerSet(
+        socket, ["GPIO4.DI." + edge], [str(switch.bit)], ["0"], ["0"], 
+        ["0"])
+    if trigger[0] != 0:
+        XPSErrorHandler(controller, socket, trigger[0],
+                        "EventExtendedConfigurationTriggerSet")
+    action = controller.EventExtendedConfigurationActionSet(
+        socket, [group + ".MoveAbort"], ["0"], ["0"], ["0"], ["0"])
+    if action[0] != 0:
+        XPSErrorHandler(controller, socket, action[0],
+                        "EventExtendedConfigurationActionSet")
+
+    # The move profile is slowed down for the search and restored after.
+    profile = controller.PositionerSGammaParametersGet(socket, positioner)
+    if profile[0] != 0:
+        XPSErrorHandler(controller, socket, profile[0],
+                        "PositionerSGammaParametersGet")
+    event = controller.EventExtendedStart(socket)
+    if event[0] != 0:
+        XPSErrorHandler(controller, socket, event[0], "EventExtendedStart")
+    try:
+        Gset = controller.PositionerSGammaParametersSet(socket, positioner,
+                                                        abs(speed),
+                                                        *profile[2:])
+        if Gset[0] != 0:
+            XPSErrorHandler(controller, socket, Gset[0],
+                            "PositionerSGammaParametersSet")
+        GMove = controller.GroupMoveRelative(socket, group, 
+                                             [direction*WHEEL_GAP])
+    finally:
+        controller.EventExtendedRemove(socket, event[1])
+        controller.PositionerSGammaParametersSet(socket, positioner,
+                                                 *profile[1:])
+    # -27 is "move aborted": the event fired on the switch.
+    if GMove[0] == 0:
+        message = wheel + " wheel did not reach a position switch within" + \
+                  " one slot.  Home wheel and try again."
+        raise InstrumentError(message)
+    elif GMove[0] != -27:
+        XPSErrorHandler(controller, socket, GMove[0], "GroupMoveRelative")
+
+
+def wheeltcl(controller, socket, wheel, count, home):
+    """Runs a whole wheel move on the controller with the nessiwheel.tcl
+    script, selected by "move = tcl" in the wheel's config section.  The 
+    script follows the same algorithm as NewportWheelMove and 
+    NewportWheelHome but polls the position switch locally, so the host 
+    only waits for the final result.  The script must have been uploaded 
+    with NewportUploadScripts.
+
+        Arguments: controller, socket, wheel, count, home.
+
+            controller: [xps]   Which instance of the XPS controller to use.
+            socket:     [int]   Which socket to use to communicate with the XPS 
+                                controller.
+            wheel:      [str]   The name of the wheel.  This is for config
+                                file purposes.
+            count:      [int]   How many positions to move forward, which 
+                                the script may turn into fewer backward
+                                like wheelplan.
+            home:       [bool]  Move until the home switch closes instead.
+
+        Returns: moved.
+
+            moved:      [int]   How many positions the wheel moved.
+
+        Raises: InstrumentError.
+    """
+    motor = motors[wheel]
+    params = [motor.group, motor.position.bit, motor.position.val,
+              motor.home.bit, motor.home.val, motor.direction*WHEEL_GAP,
+              motor.direction*30, motor.slots, count, int(home),
+              int(motor.reverse), motor.backlash]
+    reply = controller.TCLScriptExecuteAndWait(socket, TCL_WHEEL_SCRIPT, wheel,
+                                               ",".join(map(str, params)))
+    if reply[0] != 0:
+        XPSErrorHandler(controller, socket, reply[0],
+                        "TCLScriptExecuteAndWait")
+    status, command, moved = reply[1].split(",")
+    if int(status) == 1:
+        message = "Error: Homing of " + str(wheel) + \
+                  " failed.  Retry or check switches."
+        raise InstrumentError(message)
+    elif int(status) == 2:
+        message = "Error: " + str(wheel) + " did not reach its position" + \
+                  " switch in time (" + command + " in " + \
+                  TCL_WHEEL_SCRIPT + ").  Retry or check switches."
+        raise InstrumentError(message)
+    elif int(status) != 0:
+        XPSErrorHandler(controller, socket, int(status),
+                        command + " (" + TCL_WHEEL_SCRIPT + ")")
+    return int(moved)
+
+
+def NewportUploadScripts(host, user, password):
+    """Uploads the TCL scripts of the tcl directory to the controller over 
+    FTP, replacing older copies.  Only needed when a wheel is configured 
+    with "move = tcl".
+
+        Arguments: host, user, password.
+
+            host:       [str]   Controller IP.
+            user:       [str]   Controller FTP user.
+            password:   [str]   Password of user.
+
+        Returns: None.
+
+        Raises: InstrumentError.
+    """
+    scripts = [name for name in sorted(os.listdir(TCL_DIR)) 
+               if name.endswith(".tcl")]
+    files = [(name, open(os.path.join(TCL_DIR, name), "rb")) 
+             for name in scripts]
+    try:
+        NewportUploadFiles(host, user, password, TCL_REMOTE_DIR, files)
+    finally:
+        for name, script in files:
+            script.close()
+
+
+def NewportUploadFiles(host, user, password, directory, files):
+    """Stores files in a directory of the controller over FTP, replacing 
+    older copies.
+
+        Arguments: host, user, password, directory, files.
+
+            host:       [str]   Controller IP.
+            user:       [str]   Controller FTP user.
+            password:   [str]   Password of user.
+            directory:  [str]   Controller directory, e.g. TCL_REMOTE_DIR.
+            files:      [list]  (name, file object) pairs to store.
+
+        Returns: None.
+
+        Raises: InstrumentError.
+    """
+    try:
+        ftp = ftplib.FTP(host, user, password, timeout=10)
+        try:
+            ftp.cwd(directory)
+            for name, data in files:
+                ftp.storbinary("STOR " + name, data)
+        finally:
+            ftp.close()
+    except ftplib.all_errors as e:
+        raise InstrumentError("Files could not be uploaded to " + host +
+                              directory + " : " + str(e))
+
+
 #@timeout(20)
-def wheelcheck(controller, socket, bit, val, group):
+def wheelcheck(controller, socket, switch, group):
 # This loop monitors the position switch to stop the motor when 
 # it reaches the switch.
     ##MAX_SEARCH_TIME = 20
     ##init_time = time.time()
     ##tmp = 0
-    while True:
-        time.sleep(.1)
-        value = controller.GPIODigitalGet(socket, "GPIO4.DI")
-        if value[0] != 0:
-            XPSErrorHandler(controller, socket, value[0],
-                                        "GPIODigitalGet")
-        elif int(format(value[1], "016b")[::-1][bit]) == val:
-            stop=controller.GroupSpinModeStop(socket, group, 1200)
-            if stop[0] != 0:
-                XPSErrorHandler(controller, socket, stop[0],
-                                            "GroupSpinModeStop")
-            break
+    try:
+        if gpio is not None and gpio.running:
+            gpio.wait(switch)
         else:
-            pass
-        ##tmp = time.time() - init_time
-        ##if(tmp >= MAX_SEARCH_TIME):
-        ##    raise TimeoutError()
-        ##print tmp
+            while True:
+                time.sleep(.1)
+                value = controller.GPIODigitalGet(socket, "GPIO4.DI")
+                if value[0] != 0:
+                    XPSErrorHandler(controller, socket, value[0],
+                                                "GPIODigitalGet")
+                elif switch.test(value[1]):
+                    break
+                else:
+                    pass
+                ##tmp = time.time() - init_time
+                ##if(tmp >= MAX_SEARCH_TIME):
+                ##    raise TimeoutError()
+                ##print tmp
+    finally:
+        # The wheel is spinning: stop it even if the switch could not be
+        # read.
+        stop=controller.GroupSpinModeStop(socket, group, 1200)
+    if stop[0] != 0:
+        XPSErrorHandler(controller, socket, stop[0], "GroupSpinModeStop")
 
 
 def NewportInitialize(controller, motor, socket, home_pos):
@@ -352,19 +738,19 @@ def NewportInitialize(controller, motor, socket, home_pos):
     """
     # This function kills any motors that are still active from previous 
     # motions.
-    GKill = controller.GroupKill(socket, cfg[motor]["group"])   
+    GKill = controller.GroupKill(socket, motors[motor].group)   
     if GKill[0] != 0:
         XPSErrorHandler(controller, socket, GKill[0], "GroupKill")
 
     # This function initializes the motor so it can be moved.
-    GInit = controller.GroupInitialize(socket, cfg[motor]["group"])
+    GInit = controller.GroupInitialize(socket, motors[motor].group)
     if GInit[0] != 0:
         XPSErrorHandler(controller, socket, GInit[0], "GroupInitialize")
 
     # This function homes the motor and then moves the motor to a home position
     # defined by the user.
     GHomeSearch = controller.GroupHomeSearchAndRelativeMove(socket, 
-                                                            cfg[motor]["group"],
+                                                            motors[motor].group,
                                                             [home_pos])
     if GHomeSearch[0] != 0:
         XPSErrorHandler(controller, socket, GHomeSearch[0], 
@@ -390,7 +776,7 @@ def NewportKmirrorMove(controller, socket, motor, position):
     # This checks to see if the motor is in a continuous rotation state and if 
     # it is then the function disables continuous rotation. 
 
-    Gmode = controller.GroupJogModeDisable(socket, cfg[motor]["group"])
+    Gmode = controller.GroupJogModeDisable(socket, motors[motor].group)
     if Gmode[0] != 0 and Gmode[0] != -22:
         XPSErrorHandler(controller, socket, Gmode[0], "GroupJogModeEnable")
 
@@ -398,13 +784,13 @@ def NewportKmirrorMove(controller, socket, motor, position):
     # If the parameters are set correctly then an absolute move is made to the 
     # position of choice.
     Gset = controller.PositionerSGammaParametersSet(socket,
-                                                    cfg[motor]["positioner"], 
+                                                    motors[motor].positioner, 
                                                     10 , 200, .005, .05)
     if Gset[0] != 0:
         XPSErrorHandler(controller, socket, Gset[0],
                         "PositionerSGammaParametersSet")
     else:
-        GMove = controller.GroupMoveAbsolute(socket, cfg[motor]["group"], 
+        GMove = controller.GroupMoveAbsolute(socket, motors[motor].group, 
                                              [float(position)])
         if GMove[0] != 0:
             XPSErrorHandler(controller, socket, GMove[0], "GroupMoveAbsolute")
@@ -433,15 +819,15 @@ def NewportKmirrorRotate(controller, socket, motor, speed):
     """
     # This checks if the motor is in a continuous rotation state and if not 
     # enables that state.
-    Gmode = controller.GroupJogModeEnable(socket, cfg[motor]["group"])
+    Gmode = controller.GroupJogModeEnable(socket, motors[motor].group)
     if Gmode[0] != 0 and Gmode[0] != -22:
         XPSErrorHandler(controller, socket, Gmode[0], "GroupJogModeEnable")
     else:
         pass
     # This sets the rotation rate for the motor. 
     # The motor will rotate until it is stopped or it hits a limit switch.
-    velocity = speed*cfg[motor]["direction"]
-    GJog = controller.GroupJogParametersSet(socket, cfg[motor]["group"],
+    velocity = speed*motors[motor].direction
+    GJog = controller.GroupJogParametersSet(socket, motors[motor].group,
                                             [velocity],[400])
     if GJog[0] != 0:
         XPSErrorHandler(controller, socket, GJog[0], "GroupJogParametersSet")
@@ -469,17 +855,17 @@ def NewportStatusGet(controller, socket, motor):
     """
     # Initializing the empty list.
     info = []
-    # Retrieving the position of the motor.
-    position = controller.GroupPositionCurrentGet(socket, cfg[motor]["group"], 
-                                                  1)
+    # Retrieving the position and the rest of the information in one round
+    # trip.
+    batch = controller.Batch(socket)
+    batch.add("GroupPositionCurrentGet", motors[motor].group, 1)
+    batch.add("PositionerSGammaParametersGet", motors[motor].positioner)
+    position, profile = batch.execute()
     if position[0] != 0:
         XPSErrorHandler(controller, socket, position[0],
                         "GroupPositionCurrentGet")
     else:
         info.append(position[1])
-    # Getting the rest of the information.
-    profile = controller.PositionerSGammaParametersGet(socket, 
-                                                       cfg[motor]["positioner"])
     if profile[0] != 0:
         XPSErrorHandler(controller, socket, profile[0],
                         "PositionerSGammaParametersGet")
@@ -511,7 +897,7 @@ def NewportStop(controller, socket, motor):
     # and disables jogging. 
     if motor == "kmirror":
         # Stopping.
-        GStop = controller.GroupJogParametersSet(socket, cfg[motor]["group"], 
+        GStop = controller.GroupJogParametersSet(socket, motors[motor].group, 
                                                  [0],[200])
         if GStop[0] != 0:
             XPSErrorHandler(controller, socket, GStop[0], 
@@ -519,7 +905,7 @@ def NewportStop(controller, socket, motor):
         else: 
             pass 
         # Disabling jogging.
-        JDisable = controller.GroupJogModeDisable(socket, cfg[motor]["group"])
+        JDisable = controller.GroupJogModeDisable(socket, motors[motor].group)
         if JDisable[0] != 0:
             XPSErrorHandler(controller, socket, JDisable[0],
                             "GroupJogModeDisable")
@@ -528,7 +914,7 @@ def NewportStop(controller, socket, motor):
     # The case for the other motors.  Only a stop command is required.     
     else:
         # Stopping.
-        GStop = controller.GroupSpinParametersSet(socket, cfg[motor]["group"],
+        GStop = controller.GroupSpinParametersSet(socket, motors[motor].group,
                                                   0, 800)
         if GStop[0] != 0:
             XPSErrorHandler(controller, socket, GStop[0], 
@@ -536,85 +922,60 @@ def NewportStop(controller, socket, motor):
         else:
             pass
 
-@run_async
-def NewportFocusLimit(controller, socket, motor):
-    """This function is an asynchronus function that monitors the switches for 
-    the FPA.  If the FPA reaches one of its limits then the motor is stopped 
-    immediately.  If a polite stop fails then a kill all command is sent. 
-    
-        Arguments: controller, socket, motor.
+def NewportFocusWatchdog(controller, socket, kill_socket, motor, direction):
+    """Returns a LimitWatchdog, not started, for the limit switch the FPA 
+    moves towards.  The watchdog reads the switches on socket at most 
+    "watchdog rate" times a second, and with "watchdog events = 1" also 
+    arms controller events aborting the move on the switch.  Both keys are
+    in the motor's config section.
+
+        Arguments: controller, socket, kill_socket, motor, direction.
     
             controller: [xps]   Which instance of the XPS controller to use.
-            socket:     [int]   Which socket to use to communicate with the XPS
-                                controller.
+            socket:     [int]   Which socket to read the switches on.
+            kill_socket:[int]   Which socket to send the kill on.  It should 
+                                not be used by anything else meanwhile.
             motor:      [str]   Which Motor is being controlled.  This is for 
                                 config file purposes.
-    
-        Returns: None.
+            direction:  [+-1]   Which direction the FPA moves, 1 towards the 
+                                upper limit, -1 towards the lower one, 0 to 
+                                watch both.
 
-        Raises: None.
+        Returns: watchdog.
 
-    """
-    # Setting config-file variables.
-    bitup = cfg[motor]["upper"]["bit"]
-    bitdown = cfg[motor]["lower"]["bit"]
-    valup = cfg[motor]["upper"]["val"]
-    valdown = cfg[motor]["lower"]["val"]
-    stop = False
-    limit = False
-
-    # This while loop runs until the motor is stopped by a different function or
-    # it runs into a limit switch. 
-    while stop == False:
-        # Polling the controller for motor info.
-        value = controller.GPIODigitalGet(socket, "GPIO4.DI")
-        velocity = controller.GroupVelocityCurrentGet(socket, 
-                                                      cfg[motor]["group"])
-        
-        # If either of the polls fails then the loop and the motor are stopped.
-        if value[0] != 0 or velocity[0] != 0:
-            fpa_limit_flag.clear()
-            limit = True
-            stop = True
-            if value[0] != 0:
-                XPSErrorHandler(controller, socket, value[0], "GPIODigitalGet")
-            else:
-                XPSErrorHandler(controller, socket, velocity[0], 
-                                "GroupVelocityCurrentGet")
-
-        # Checking if either of the switches are reached.
-        elif int(format(value[1], "016b")[::-1][bitup]) == valup or \
-             int(format(value[1], "016b")[::-1][bitdown]) == valdown:
-            fpa_limit_flag.clear()
-            limit = True
-            stop = True
-
-        # Checking if the motor was stopped.
-        elif fpa_limit_flag.is_set() == False:
-            stop = True
-
-        else:
-            pass 
+            watchdog:   [LimitWatchdog]
 
-    if limit == True:
-        # Stopping the motor politely.
-        kill = controller.GroupKill(socket, cfg[motor]['group'])
-        if kill[0] != 0:
-            # Stopping the motor impolitely.
-            killall = controller.KillAll(socket)
-            if killall[0] != 0:
-                XPSErrorHandler(controller, socket, killall[0], "KillAll")
-            XPSErrorHandler(controller, socket, kill[0], "GroupKill")
+        Raises: None.
+    """
+    settings = motors[motor]
+    limits = []
+    for name, side in (("upper", 1), ("lower", -1)):
+        if direction == 0 or direction == side:
+            switch = getattr(settings, name)
+            limits.append((name, switch.bit, switch.val))
+    watchdog = LimitWatchdog(controller, socket, kill_socket, 
+                             settings.group, limits, settings.watchdog_rate,
+                             settings.watchdog_events,
+                             gpio if gpio is not None and gpio.running 
+                             else None)
+    # fpa_limit_flag is cleared on a trip, as it was by NewportFocusLimit.
+    watchdog.subscribe(lambda trip: fpa_limit_flag.clear())
+    return watchdog
            
 
 def NewportFocusMove(controller, socket, motor, distance, speed, direction):
     """This function moves the FPA.  The user sets the distance speed and 
-    direction of the motion.  
+    direction of the motion.  The moves run while a watchdog (see 
+    NewportFocusWatchdog) watches the limit switch ahead, so a move away 
+    from a limit the FPA is resting on is allowed.
         Arguments: controller, socket, motor, distance, speed, direction.
 
             controller: [xps]   Which instance of the XPS controller to use.
-            socket:     [list]  A list of two sockets to use to communicate with 
-                                the XPS controller.
+            socket:     [list]  A list of three sockets to use to 
+                                communicate with the XPS controller: the 
+                                watchdog reads the switches on the first, 
+                                the moves go on the second and a limit kill
+                                goes on the third.
             motor:      [str]   Which motor is being controlled.  This is for 
                                 config file purposes.
             distance:   [float] How far to move the array (in micrometers).
@@ -627,16 +988,23 @@ def NewportFocusMove(controller, socket, motor, distance, speed, direction):
                                 case of an error this will be set to the string 
                                 'ERROR'.
     
-        Raises: None.
+        Raises: InstrumentError.
+
+            InstrumentError:    This is raised if there are fewer than three 
+                                sockets, before anything moves.
 """
+    if len(socket) < 3:
+        raise InstrumentError("NewportFocusMove needs three sockets: watchdog,"
+                              " moves and limit kill.")
     # Initializing variables of motion and setting the fpa_limit_flag to true.
     fpa_limit_flag.set()
     deg_distance = distance*.576
     velocity = speed 
-    true_direction = direction * cfg[motor]['direction']
+    true_direction = direction * motors[motor].direction
+    kill_socket = socket[2]
     # initializing the motors motion profile and checking to for success.
     SGamma = controller.PositionerSGammaParametersSet(socket[1], 
-                                                      cfg[motor]["positioner"], 
+                                                      motors[motor].positioner, 
                                                       velocity, 600, .005, .05)
     if SGamma[0] != 0:
         fpa_limit_flag.clear()
@@ -646,39 +1014,31 @@ def NewportFocusMove(controller, socket, motor, distance, speed, direction):
     # determining how many rotaions to move the motor.
     count = int(math.floor(deg_distance/360))
     remainder = true_direction * (deg_distance % 360)
-
-    # Starting the monitoring thread.
-    NewportFocusLimit(controller, socket[0], motor)
-    
-    # This loop checks to be sure the motor is allowed to move.  If so then it 
-    # rotates the motor 360 degrees in the appropriate direction and then 
-    # repeats.
-    for i in range(count):
-        # Check of motor movability.
-        if fpa_limit_flag.is_set() == False:
-            return 'ERROR'
-        
-        else:
-            # Movement.
-            GMove = controller.GroupMoveRelative(socket[1], cfg[motor]["group"], 
-                                             [true_direction * 360])
+    moves = [true_direction * 360]*count + [remainder]
+
+    # Starting the monitoring thread.  If the FPA already rests on the limit
+    # ahead the watchdog trips at once and nothing moves.
+    watchdog = NewportFocusWatchdog(controller, socket[0], kill_socket, motor,
+                                    1 if direction > 0 else -1)
+    with watchdog:
+        # Each move rotates the motor at most 360 degrees, and the next one 
+        # only starts if the watchdog has not tripped.
+        for move in moves:
+            if watchdog.tripped.is_set():
+                return 'ERROR'
+            GMove = controller.GroupMoveRelative(socket[1], 
+                                                 motors[motor].group, [move])
             if GMove[0] != 0:
-                XPSErrorHandler(controller, socket[1], Gmove[0], 
+                # The move was cut short by the watchdog.
+                if watchdog.tripped.wait(1.0 / watchdog.rate + 1):
+                    return 'ERROR'
+                fpa_limit_flag.clear()
+                XPSErrorHandler(controller, socket[1], GMove[0], 
                                 "GroupMoveRelative")
-    # A last check to determine if the motor can move.
-    if fpa_limit_flag.is_set() == False:
-        return 'ERROR'
-    
-    # Moving the motor the last fraction of a rotation.
-    else:
-        GMove = controller.GroupMoveRelative(socket[1], cfg[motor]["group"], 
-                                             [remainder])
-        if GMove[0] != 0:
-            XPSErrorHandler(controller, socket[1], Gmove[0], 
-                            "GroupMoveRelative")
+        if watchdog.tripped.is_set():
+            return 'ERROR'
 
-    # Returning the distance traveled and setting the fpa_limit_flag to false so
-    # that the limit tracking thread stops.
+    # Returning the distance traveled and setting the fpa_limit_flag to false.
     travel = distance   
     fpa_limit_flag.clear()
     return travel 
@@ -702,21 +1062,25 @@ def NewportFocusHome(controller, socket, motor):
         Raises: None.
     """
     # Initializing motor variables.
-    bitdown = cfg[motor]["lower"]["bit"]
-    valdown = cfg[motor]["lower"]["val"]
-    vel = -200*int(cfg[motor]['direction'])
-    group = cfg[motor]['group']
+    lower = motors[motor].lower
+    vel = -200*motors[motor].direction
+    group = motors[motor].group
     
     # Starting motion. 
-    Gset = controller.GroupSpinParametersSet(socket, cfg[motor]["group"], 
+    Gset = controller.GroupSpinParametersSet(socket, motors[motor].group, 
                                              vel, 200)
     if Gset[0] != 0:
         XPSErrorHandler(controller ,socket, Gset[0], "GroupSpinParametersSet")
     else:
         # This loop watches for the limit switch to be activated.
+        # It waits on the shared poller while there is one.
         while True:
+            if gpio is not None and gpio.running:
+                if gpio.wait(lower, True, 1):
+                    break
+                continue
             value = controller.GPIODigitalGet(socket, "GPIO4.DI")
-            if int(format(value[1], "016b")[::-1][bitdown]) == valdown:
+            if lower.test(value[1]):
                 break
             else:
                 time.sleep(.1)
@@ -754,7 +1118,7 @@ user stops it in the NESSI GUI.
     track_event:[threading.Event] Event to signal end of tracking.
 
 """
-    Gmode = controller.GroupJogModeEnable(socket, cfg[motor]["group"])
+    Gmode = controller.GroupJogModeEnable(socket, motors[motor].group)
     if Gmode[0] != 0 and Gmode[0] != -22:
         XPSErrorHandler(controller, socket, Gmode[0], "GroupJogModeEnable")
     phi = math.radians(33.984861)
@@ -769,19 +1133,19 @@ user stops it in the NESSI GUI.
             track_event.set()
             time.sleep(1)
         else:
-            angle = .5*(t_angle - PA - int(cfg[motor]["direction"])*H)
+            angle = .5*(t_angle - PA - motors[motor].direction*H)
             vel = ((-.262)*(.5)*180*math.cos(phi)*math.cos(A))/\
                   (math.cos(H)*3600*math.pi)
             delta = vel - parent.vel
             parent.vel = parent.vel + delta
-            velocity = parent.vel*int(cfg[motor]["direction"])
-            GJog = controller.GroupJogParametersSet(socket, cfg[motor]["group"],
+            velocity = parent.vel*motors[motor].direction
+            GJog = controller.GroupJogParametersSet(socket, motors[motor].group,
                                                     [velocity],[200])
             if GJog[0] != 0:
                 XPSErrorHandler(controller, socket, GJog[0],
                                 "GroupJogParametersSet")
             position = controller.GroupPositionCurrentGet(socket, 
-                                                          cfg[motor]["group"],
+                                                          motors[motor].group,
                                                           1)
             if position[0] != 0:
                 XPSErrorHandler(controller, socket, position[0],
@@ -792,7 +1156,7 @@ user stops it in the NESSI GUI.
 
 def NewportKill(controller, motor, socket):
     try:
-        kill = controller.GroupKill(socket, cfg[motor]['group'])
+        kill = controller.GroupKill(socket, motors[motor].group)
         if kill[0] != 0:
             XPSErrorHandler(controller, socket, kill[0], "GroupKill")
     
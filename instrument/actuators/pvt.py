@@ -0,0 +1,209 @@
+"""
+.. module:: pvt
+   :platform: Unix
+   :synopsis: K-mirror tracking with controller PVT trajectories.
+
+The jog tracking loop re-sends a velocity every second, so the K-mirror
+follows a staircase of constant velocities and the host talks to the TCS
+and the controller continuously. PVTTracker instead predicts the K-mirror
+angle for the next few minutes from the hour angle and declination, and
+hands it to the controller as a MultipleAxesPVT trajectory:
+
+    tracker = PVTTracker(controller, sockets, 'kmirror', telescope, t_angle)
+    tracker.run(track_event)        # returns once track_event is set
+
+Each chunk is written as a trajectory file (one "duration, displacement,
+end velocity" line per segment), uploaded to the controller, checked with
+MultipleAxesPVTVerification and run with MultipleAxesPVTExecution, which
+interpolates position cubically between the knots. The next chunk is
+prepared when the previous one ends. The pointing is read from the
+telescope at most once per chunk.
+
+The K-mirror group has to be defined as a MultipleAxes group on the
+controller for it to accept PVT trajectories.
+"""
+
+import StringIO
+import logging
+import threading
+import time
+
+import numpy as np
+
+from instrument.telescope import astrometry
+from newport import cfg, XPSErrorHandler, NewportUploadFiles
+
+# Latitude of the telescope in degrees, as in telescope.Telescope.
+LATITUDE = astrometry.LATITUDE
+
+# Controller directory holding trajectory files.
+TRAJECTORY_DIR = "/Admin/Public/Trajectories"
+
+# Trajectory files alternate between these names.
+TRAJECTORY_FILES = ("nessi_kmirror0.trj", "nessi_kmirror1.trj")
+
+
+def kmirror_angles(ha, dec, t_angle, direction, latitude=LATITUDE):
+    """K-mirror position angles, in degrees, for arrays of hour angles ha
+    and a declination dec (degrees). Same relation as
+    KMirror.userAngleToPositionAngle, with the parallactic angle and
+    altitude computed by astrometry. The parallactic angle is unwrapped, so
+    the result is continuous."""
+    altitude    = astrometry.altitude(ha, dec, latitude)
+    parallactic = np.degrees(np.unwrap(np.radians(
+        astrometry.parallactic_angle(ha, dec, latitude))))
+    return 0.5*((t_angle - parallactic) - direction*altitude)
+
+
+def trajectory(start, angles, step):
+    """Trajectory file text moving from position start through angles,
+    which are sampled every step seconds beginning one step after the
+    trajectory starts. The K-mirror starts and ends the chunk at rest;
+    in between the velocity at each knot is the slope of the angles."""
+    knots = np.concatenate(([start], angles))
+    velocities = np.gradient(knots, step)
+    velocities[0] = velocities[-1] = 0.0
+    lines = ["%.4f, %.6f, %.6f" % (step, knots[i + 1] - knots[i],
+                                   velocities[i + 1])
+             for i in range(len(angles))]
+    return "\n".join(lines) + "\n"
+
+
+class PVTTracker(object):
+    """Tracks the K-mirror with chunks of PVT trajectory.
+
+    Attributes:
+        controller -- XPS controller -> xps
+        sockets    -- Pool of Newport sockets -> XPSPool
+        motor      -- Motor name, for config file purposes -> str
+        telescope  -- Source of the pointing ephemeris -> Telescope
+        t_angle    -- User angle to hold -> float
+        chunk      -- Seconds of trajectory per chunk -> float
+        step       -- Seconds between knots -> float
+        lead       -- Seconds allowed to upload and verify a chunk before
+                      it starts -> float
+    """
+
+    def __init__(self, controller, sockets, motor, telescope, t_angle,
+                 chunk=300.0, step=5.0, lead=1.0):
+        self.controller = controller
+        self.sockets    = sockets
+        self.motor      = motor
+        self.telescope  = telescope
+        self.t_angle    = t_angle
+        self.chunk      = chunk
+        self.step       = step
+        self.lead       = lead
+        self._executing = threading.Event()
+
+    @property
+    def group(self):
+        return cfg[self.motor]["group"]
+
+    def upload(self, name, text):
+        """Stores a trajectory file on the controller."""
+        NewportUploadFiles(self.sockets.host, cfg["general"]["xps user"],
+                           cfg["general"]["xps password"], TRAJECTORY_DIR,
+                           [(name, StringIO.StringIO(text))])
+
+    def angles(self, start_time):
+        """Predicted angles at the knots of a chunk starting at start_time
+        (a time.time() value)."""
+        ephemeris = self.telescope.ephemeris(self.chunk)
+        knots = start_time + self.step*np.arange(
+            1, int(round(self.chunk / self.step)) + 1)
+        return kmirror_angles(ephemeris.at(knots).ha,
+                              ephemeris.dec_at(start_time), self.t_angle,
+                              int(cfg[self.motor]["direction"]),
+                              ephemeris.latitude)
+
+    def run(self, track_event):
+        """Runs chunk after chunk until track_event is set, which aborts
+        the chunk being executed.
+
+        Raises:
+            InstrumentError -- if the controller rejects a trajectory.
+        """
+        watcher = threading.Thread(name="PVTTrackerStop",
+                                   target=self._abort_on, args=(track_event,))
+        watcher.daemon = True
+        watcher.start()
+
+        with self.sockets.socket() as socket:
+            mode = self.controller.GroupJogModeDisable(socket, self.group)
+            if mode[0] != 0 and mode[0] != -22:
+                XPSErrorHandler(self.controller, socket, mode[0],
+                                "GroupJogModeDisable")
+            # The first chunk starts at rest, so the K-mirror is brought to
+            # the tracked angle with a plain move first.
+            angles, position = self._nearest(socket, self.angles(time.time()))
+            move = self.controller.GroupMoveAbsolute(socket, self.group,
+                                                     [float(angles[0])])
+            if move[0] != 0:
+                XPSErrorHandler(self.controller, socket, move[0],
+                                "GroupMoveAbsolute")
+
+        chunks = 0
+        try:
+            while not track_event.is_set():
+                name = TRAJECTORY_FILES[chunks % len(TRAJECTORY_FILES)]
+                with self.sockets.socket() as socket:
+                    self._prepare(socket, name)
+                    self._executing.set()
+                    try:
+                        if track_event.is_set():
+                            break
+                        run = self.controller.MultipleAxesPVTExecution(
+                            socket, self.group, name, 1)
+                    finally:
+                        self._executing.clear()
+                    # -27 : aborted by stop() through _abort_on.
+                    if run[0] == -27 and track_event.is_set():
+                        break
+                    elif run[0] != 0:
+                        XPSErrorHandler(self.controller, socket, run[0],
+                                        "MultipleAxesPVTExecution")
+                chunks += 1
+        finally:
+            track_event.set()
+        logging.info("K-mirror PVT tracking ended after %d chunks." % chunks)
+
+    def _prepare(self, socket, name):
+        """Builds, uploads and verifies the next chunk, then waits for its
+        start time."""
+        start = time.time() + self.lead
+        angles, position = self._nearest(socket, self.angles(start))
+        self.upload(name, trajectory(position, angles, self.step))
+
+        verify = self.controller.MultipleAxesPVTVerification(socket,
+                                                             self.group, name)
+        if verify[0] != 0:
+            XPSErrorHandler(self.controller, socket, verify[0],
+                            "MultipleAxesPVTVerification")
+        delay = start - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            logging.warning("K-mirror PVT chunk started %.2f s late."
+                            % -delay)
+
+    def _nearest(self, socket, angles):
+        """Shifts angles by the multiple of 180 degrees (the K-mirror angle
+        is only defined modulo 180) nearest the current position. Returns
+        the angles and the position."""
+        position = self.controller.GroupPositionCurrentGet(socket, self.group,
+                                                           1)
+        if position[0] != 0:
+            XPSErrorHandler(self.controller, socket, position[0],
+                            "GroupPositionCurrentGet")
+        angles = angles + 180.0*np.round((position[1] - angles[0]) / 180.0)
+        return angles, position[1]
+
+    def _abort_on(self, track_event):
+        # An abort sent just before the execution starts is refused, so it
+        # is repeated until the execution has returned.
+        track_event.wait()
+        while self._executing.is_set():
+            with self.sockets.emergency() as socket:
+                self.controller.GroupMoveAbort(socket, self.group)
+            time.sleep(0.1)
@@ -0,0 +1,120 @@
+"""
+.. module:: statuscache
+   :platform: Unix
+   :synopsis: Shared cache of Newport motor status.
+
+NewportStatusGet is asked for the same motor by the GUI timers, by every
+keywords build and by the motor's own methods. StatusCache keeps the last
+status of each motor for ttl seconds:
+
+    status = StatusCache(controller, sockets, ttl=1.0)
+    status.get('kmirror')               # [position, velocity, ...]
+    status.get('kmirror', fresh=True)   # always asks the controller
+    status.invalidate('kmirror')        # after commanding a motion
+
+Readers that miss the cache at the same time share one controller request.
+A request that was in flight when its motor was invalidated still answers
+the readers waiting on it but is not kept.
+"""
+
+import threading
+import time
+
+import newport as np
+
+
+class _Request(object):
+    """One NewportStatusGet in flight, shared by the readers waiting on
+    it."""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done  = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class _Entry(object):
+    """Cached status of one motor."""
+
+    __slots__ = ('value', 'time', 'request', 'generation')
+
+    def __init__(self):
+        self.value      = None
+        self.time       = 0.0
+        self.request    = None
+        self.generation = 0
+
+
+class StatusCache(object):
+    """Time limited cache of NewportStatusGet, per motor.
+
+    Attributes:
+        controller -- XPS controller -> xps
+        sockets    -- Pool of Newport sockets -> XPSPool
+        ttl        -- Seconds a status is served from the cache -> float
+    """
+
+    def __init__(self, controller, sockets, ttl=1.0):
+        self.controller = controller
+        self.sockets    = sockets
+        self.ttl        = ttl
+        self._lock      = threading.Lock()
+        self._entries   = {}
+
+    def get(self, motor, fresh=False):
+        """Returns the NewportStatusGet list of motor, from the cache when
+        it is younger than ttl and fresh is False.
+
+        Raises:
+            InstrumentError -- if the controller request fails.
+        """
+        with self._lock:
+            entry = self._entries.get(motor)
+            if entry is None:
+                entry = self._entries[motor] = _Entry()
+            if not fresh and entry.value is not None and \
+               time.time() - entry.time < self.ttl:
+                return entry.value
+            request = None if fresh else entry.request
+            owner   = request is None
+            if owner:
+                request = _Request()
+                if not fresh:
+                    entry.request = request
+            generation = entry.generation
+
+        if owner:
+            self._fetch(motor, entry, request, generation)
+        else:
+            request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.value
+
+    def invalidate(self, motor=None):
+        """Drops the cached status of motor, or of every motor."""
+        with self._lock:
+            motors = self._entries.keys() if motor is None else [motor]
+            for name in motors:
+                entry = self._entries.get(name)
+                if entry is not None:
+                    entry.value      = None
+                    entry.request    = None
+                    entry.generation += 1
+
+    def _fetch(self, motor, entry, request, generation):
+        try:
+            with self.sockets.socket() as socket:
+                request.value = np.NewportStatusGet(self.controller, socket,
+                                                    motor)
+        except Exception as e:
+            request.error = e
+        with self._lock:
+            if entry.request is request:
+                entry.request = None
+            if request.error is None and entry.generation == generation:
+                entry.value = request.value
+                entry.time  = time.time()
+        request.done.set()
@@ -0,0 +1,128 @@
+# nessiwheel.tcl
+#
+# Dewar wheel moves run on the XPS controller.  The same slot by slot
+# algorithm as NewportWheelMove and NewportWheelHome in newport.py, but the
+# position switch is polled locally every 10 ms instead of over the network.
+#
+# Uploaded to /Admin/Public/Scripts by newport.NewportUploadScripts and run
+# with TCLScriptExecuteAndWait.  Input parameters, in order:
+#
+#   group     XPS group of the wheel
+#   posbit    GPIO4.DI bit of the position switch
+#   posval    Value of posbit on a position
+#   homebit   GPIO4.DI bit of the home switch
+#   homeval   Value of homebit on the home position
+#   gap       Signed length of each of the two fast moves between positions
+#   speed     Signed speed of the slow switch search
+#   slots     Number of positions on the wheel
+#   count     Positions to move forward (move) or ignored (home)
+#   home      1 to move until the home switch closes, 0 to move count
+#             positions
+#   reverse   1 to move backward instead when that is shorter (count moves
+#             only), as newport.wheelplan
+#   backlash  Signed distance backed off past the position at the end of a
+#             backward move, before approaching it forward; 0 for none
+#
+# Result: "status,command,moved"
+#
+#   status    0 on success, the XPS error code of the command that failed,
+#             1 if the home switch was not found within slots positions, or
+#             2 if the position switch was not found within SearchTimeOut ms
+#   command   Name of the command that failed, empty on success
+#   moved     Positions moved before the script ended
+
+set TimeOut 20
+set Poll    10
+set SearchTimeOut 20000
+
+foreach {group posbit posval homebit homeval gap speed slots count home \
+         reverse backlash} $tcl_argv break
+
+set code [catch "OpenConnection $TimeOut SocketID"]
+if {$code != 0} {
+    return "$code,OpenConnection,0"
+}
+
+# Runs an XPS command, ending the script with its error code on failure.
+proc xps {name args} {
+    global SocketID moved
+    set code [catch "$name $SocketID $args"]
+    if {$code != 0} {
+        error "$code,$name,$moved"
+    }
+}
+
+# 1 if GPIO4.DI bit reads val.
+proc switch_is {bit val} {
+    global SocketID moved
+    set code [catch "GPIODigitalGet $SocketID GPIO4.DI word"]
+    if {$code != 0} {
+        error "$code,GPIODigitalGet,$moved"
+    }
+    return [expr {(($word >> $bit) & 1) == $val}]
+}
+
+# Spins the wheel slowly until its position switch closes, then stops it.
+proc search {} {
+    global group posbit posval speed Poll SearchTimeOut moved
+    xps GroupSpinParametersSet $group $speed 800
+    set waited 0
+    while {![switch_is $posbit $posval]} {
+        if {$waited >= $SearchTimeOut} {
+            xps GroupSpinModeStop $group 1200
+            error "2,GPIODigitalGet,$moved"
+        }
+        after $Poll
+        incr waited $Poll
+    }
+    xps GroupSpinModeStop $group 1200
+}
+
+# Moves to the next position: two fast moves, then the slow search.
+proc next_position {} {
+    global group gap moved
+    xps GroupMoveRelative $group $gap
+    xps GroupMoveRelative $group $gap
+    search
+    incr moved
+}
+
+set moved 0
+set code [catch {
+    # A wheel left between positions is first brought onto the next one.
+    if {![switch_is $posbit $posval]} {
+        search
+        incr count -1
+    }
+    if {$home} {
+        set found [switch_is $homebit $homeval]
+        for {set i 0} {!$found && $i < $slots} {incr i} {
+            next_position
+            set found [switch_is $homebit $homeval]
+        }
+        if {!$found} {
+            error "1,,$moved"
+        }
+    } elseif {$reverse && $slots - $count < $count} {
+        set gap   [expr {-$gap}]
+        set speed [expr {-$speed}]
+        for {set i $count} {$i < $slots} {incr i} {
+            next_position
+        }
+        set speed [expr {-$speed}]
+        if {$backlash != 0} {
+            xps GroupMoveRelative $group [expr {-$backlash}]
+            search
+        }
+    } else {
+        for {set i 0} {$i < $count} {incr i} {
+            next_position
+        }
+    }
+} result]
+
+catch "TCP_CloseSocket $SocketID"
+if {$code != 0} {
+    return $result
+}
+return "0,,$moved"
@@ -36,7 +36,7 @@ class ThorlabsController(InstrumentComponent):
                                   ' access a non-existent Thorlabs '
                                   'controller!')
         self.__port = ThorlabsController._ports[port]
-        self._name  = self.__port[3:].upper()
+        self._name  = self.__port[len('/dev/tty'):].upper()
         
         try:
             self.ser = serial.Serial(port=self.__port, baudrate=115200,
@@ -130,7 +130,7 @@ class ThorlabsController(InstrumentComponent):
         with self.lock:
             try:
                 self.ser.write(tx)
-                return self._read_exit_status()
+                status = self._read_exit_status()
             except SerialException:
                 self.ser.close()
                 raise InstrumentError('Writing to Thorlab controller timed'
@@ -140,7 +140,8 @@ class ThorlabsController(InstrumentComponent):
 
         position = self.position
 
-        self.instrument.keywords[self._name] = position
+        self.instrument.set_keyword(self._name, position)
+        return status
                      
 
     @property
@@ -214,7 +215,7 @@ class ThorlabsController(InstrumentComponent):
         with self.lock:
             try:
                 self.ser.write(tx)
-                return self._read_exit_status()
+                status = self._read_exit_status()
             except SerialTimeoutException:
                 self.ser.close()
                 raise InstrumentError('Writing to Thorlab controller timed'
@@ -224,7 +225,8 @@ class ThorlabsController(InstrumentComponent):
 
         position = self.position
 
-        self.instrument.keywords[self._name] = position
+        self.instrument.set_keyword(self._name, position)
+        return status
 
     @logCall(msg='Moving Thorlabs')
     def move_absolute(self, position):
@@ -258,13 +260,15 @@ class ThorlabsController(InstrumentComponent):
         with self.lock:
             try:
                 self.ser.write(tx)
-                return self._read_exit_status()
+                status = self._read_exit_status()
             except SerialTimeoutException:
                 self.ser.close()
                 raise InstrumentError('Writing to Thorlab controller timed'
                                       ' out. Has it been powered off or '
                                       'disconnected?\n Closed connection to'
                                       ' Thorlab controller...')
+
         position = self.position
 
-        self.instrument.keywords[self._name] = position
+        self.instrument.set_keyword(self._name, position)
+        return status
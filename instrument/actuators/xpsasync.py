@@ -0,0 +1,344 @@
+"""
+.. module:: xpsasync
+   :platform: Unix
+   :synopsis: Non-blocking, pipelined client for the Newport XPS controller.
+
+The blocking XPS class ties up a thread and a socket for every command in
+flight. AsyncXPS keeps a small set of non-blocking connections serviced by a
+single I/O thread. Every XPS command is available under its usual name,
+without the socketId argument, and returns an XPSFuture immediately:
+
+    client = AsyncXPS('10.90.20.1', 5001)
+    client.open()
+    position = client.GroupPositionCurrentGet('M', 1)
+    gpio     = client.GPIODigitalGet('GPIO4.DI')
+    position.result(), gpio.result()    # [0, 12.5], [0, 1021]
+
+Commands are pipelined: they are written as soon as they are submitted and
+replies are matched to them in order, so many commands can be in flight on
+each connection at once. Results have the shape the blocking XPS method of
+the same name returns. A command that cannot be built from its arguments
+fails with [-3, ''] (wrong parameters), a reply that cannot be decoded
+with its error code and the raw reply, or [-2, ''] without one.
+"""
+
+import collections
+import errno
+import logging
+import os
+import select
+import socket
+import threading
+import time
+
+import XPS_C8_drivers as xps
+
+
+class XPSFuture(object):
+    """Pending result of a command submitted to an AsyncXPS."""
+
+    def __init__(self, name, method, args):
+        self.name      = name
+        self.method    = method
+        self.args      = args
+        self.command   = None
+        self.deadline  = None
+        self._event    = threading.Event()
+        self._lock     = threading.Lock()
+        self._result   = None
+        self._callbacks = []
+
+    def done(self):
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """Waits for and returns the result list of the command.
+
+        Returns [-2, ''] (TCP timeout) if timeout seconds pass first.
+        """
+        if not self._event.wait(timeout):
+            return [-2, '']
+        return self._result
+
+    def add_done_callback(self, fn):
+        """Calls fn(future) once the result is set. fn is run on the I/O
+        thread, so it should not block."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _set_result(self, result):
+        with self._lock:
+            self._result = result
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception:
+                logging.exception('XPS future callback failed for %s'
+                                  % self.name)
+
+
+class _Connection(object):
+    """One non-blocking connection and its pipeline of pending commands.
+    Unless block, the connection is only started; it is connected once
+    writable (see finish_connect)."""
+
+    def __init__(self, address, timeout, block=True):
+        if block:
+            self.sock = socket.create_connection(address, timeout)
+            self.connected = True
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setblocking(0)
+            error = self.sock.connect_ex(address)
+            if error not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                self.sock.close()
+                raise socket.error(error, os.strerror(error))
+            self.connected = error == 0
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.setblocking(0)
+        self.inbuf   = ''
+        self.outbuf  = ''
+        self.pending = collections.deque()
+
+    def finish_connect(self):
+        """Completes a connection started without block.
+
+        Raises:
+            socket.error -- if the connection failed.
+        """
+        error = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error:
+            raise socket.error(error, os.strerror(error))
+        self.connected = True
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def close(self):
+        try:
+            self.sock.close()
+        except socket.error:
+            pass
+
+
+class AsyncXPS(object):
+    """Pipelined XPS client running on one I/O thread.
+
+    Attributes
+    ----------
+    address : (str, int)
+        Controller host and port.
+    connections : int
+        Number of connections to keep open.
+    timeout : float
+        Seconds a command may wait for its reply before it is failed with
+        [-2, ''] and its connection is reopened.
+    """
+
+    # Seconds between checks for expired commands
+    POLL = 0.05
+    # Seconds between attempts to replace a dropped connection
+    RETRY = 1.0
+
+    def __init__(self, host, port, connections=2, timeout=5.0):
+        self.address     = (host, port)
+        self.connections = connections
+        self.timeout     = timeout
+
+        self._conns    = []
+        self._incoming = collections.deque()
+        self._capture  = xps._XPSCommandCapture()
+        self._builder  = xps._XPSCommandCapture()
+        self._build_lock = threading.Lock()
+        self._retry_at = 0.0
+        self._closed   = True
+        self._thread   = None
+        self._wake_r, self._wake_w = os.pipe()
+
+    def open(self):
+        """Opens the connections and starts the I/O thread.
+
+        Returns the number of connections that could be opened.
+        """
+        for i in range(self.connections - len(self._conns)):
+            try:
+                self._conns.append(_Connection(self.address, self.timeout))
+            except socket.error as e:
+                logging.error('XPS async connection to %s:%d failed: %s'
+                              % (self.address + (e,)))
+        if self._closed:
+            self._closed = False
+            self._thread = threading.Thread(name='AsyncXPS', target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+        return len(self._conns)
+
+    def close(self):
+        """Stops the I/O thread and closes the connections. Commands still
+        pending are failed with [-108, '']."""
+        self._closed = True
+        self._wake()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, name, *args):
+        """Submits the XPS command name with args (socketId omitted) and
+        returns its XPSFuture."""
+        future = XPSFuture(name, getattr(xps._XPSCommandCapture, name), args)
+        if self._closed:
+            future._set_result([-108, ''])
+            return future
+        # Built here, so bad arguments fail this command only, not the I/O
+        # thread.
+        try:
+            with self._build_lock:
+                future.command = self._builder.build(future.method, args)
+        except Exception as e:
+            logging.error('XPS async %s%r not sent: %s' % (name, args, e))
+            future._set_result([-3, ''])
+            return future
+        self._incoming.append(future)
+        self._wake()
+        return future
+
+    def __getattr__(self, name):
+        if name.startswith('_') or not hasattr(xps.XPS, name):
+            raise AttributeError(name)
+        def command(*args):
+            return self.submit(name, *args)
+        command.__name__ = name
+        return command
+
+    # I/O thread
+    ################################################################
+    def _wake(self):
+        os.write(self._wake_w, 'x')
+
+    def _run(self):
+        while not self._closed:
+            self._reconnect()
+            self._dispatch()
+            writers = [c for c in self._conns if c.outbuf or not c.connected]
+            try:
+                readable, writable, _ = select.select(
+                    [self._wake_r] + self._conns, writers, [], self.POLL)
+            except select.error:
+                continue
+            if self._wake_r in readable:
+                os.read(self._wake_r, 4096)
+            # A connection dropped while writing is skipped when reading.
+            for conn in writable:
+                if conn in self._conns:
+                    self._write(conn)
+            for conn in readable:
+                if conn is not self._wake_r and conn in self._conns:
+                    self._read(conn)
+            self._expire()
+
+        for conn in self._conns:
+            self._fail(conn, [-108, ''])
+            conn.close()
+        self._conns = []
+        while self._incoming:
+            self._incoming.popleft()._set_result([-108, ''])
+
+    def _dispatch(self):
+        """Moves submitted commands onto the least loaded connection."""
+        while self._incoming:
+            future = self._incoming.popleft()
+            if not self._conns:
+                future._set_result([-108, ''])
+                continue
+            conn = min(self._conns, key=lambda c: len(c.pending))
+            future.deadline = time.time() + self.timeout
+            conn.outbuf += future.command
+            conn.pending.append(future)
+
+    def _write(self, conn):
+        try:
+            if not conn.connected:
+                conn.finish_connect()
+                if not conn.outbuf:
+                    return
+            sent = conn.sock.send(conn.outbuf)
+            conn.outbuf = conn.outbuf[sent:]
+        except socket.error as e:
+            self._drop(conn, [-108, ''], e)
+
+    def _read(self, conn):
+        try:
+            data = conn.sock.recv(4096)
+        except socket.error as e:
+            self._drop(conn, [-108, ''], e)
+            return
+        if not data:
+            self._drop(conn, [-108, ''], 'closed by controller')
+            return
+        conn.inbuf += data
+        end = conn.inbuf.find(',EndOfAPI')
+        while end != -1:
+            reply, conn.inbuf = conn.inbuf[:end], conn.inbuf[end + 9:]
+            future = conn.pending.popleft()
+            future._set_result(self._decode(future, reply))
+            end = conn.inbuf.find(',EndOfAPI')
+
+    def _decode(self, future, reply):
+        """Result of future for reply. A reply that cannot be decoded fails
+        this command only."""
+        i = reply.find(',')
+        try:
+            code = int(reply[0:i])
+        except ValueError:
+            logging.error('XPS async %s: malformed reply %r'
+                          % (future.name, reply))
+            return [-2, '']
+        try:
+            return self._capture.decode(future.method, future.args,
+                                        [code, reply[i+1:]])
+        except Exception as e:
+            logging.error('XPS async %s: reply %r not decoded: %s'
+                          % (future.name, reply, e))
+            return [code, reply[i+1:]]
+
+    def _expire(self):
+        now = time.time()
+        for conn in list(self._conns):
+            if conn.pending and conn.pending[0].deadline < now:
+                # The reply stream can no longer be matched to commands.
+                self._drop(conn, [-2, ''], 'reply timed out')
+
+    def _fail(self, conn, result):
+        while conn.pending:
+            conn.pending.popleft()._set_result(result)
+
+    def _drop(self, conn, result, reason):
+        """Fails the pending commands of conn and closes it; _reconnect
+        replaces it."""
+        if conn not in self._conns:
+            return
+        logging.error('XPS async connection dropped: %s' % (reason,))
+        self._fail(conn, result)
+        conn.close()
+        self._conns.remove(conn)
+
+    def _reconnect(self):
+        """Starts connections in place of the dropped ones, at most every
+        RETRY seconds. The connect completes in the select loop, so the
+        other connections are not held up."""
+        if len(self._conns) >= self.connections or \
+           time.time() < self._retry_at:
+            return
+        self._retry_at = time.time() + self.RETRY
+        for i in range(self.connections - len(self._conns)):
+            try:
+                self._conns.append(_Connection(self.address, self.timeout,
+                                               block=False))
+            except socket.error as e:
+                logging.error('XPS async reconnect failed: %s' % (e,))
+                return
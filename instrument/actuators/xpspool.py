@@ -0,0 +1,232 @@
+"""
+.. module:: xpspool
+   :platform: Unix
+   :synopsis: Managed pool of Newport XPS sockets.
+
+Components check a socket out for the duration of an operation instead of
+owning a fixed slice of sockets:
+
+    with pool.socket() as socket:
+        np.NewportWheelMove(controller, 'mask', socket, current, position)
+
+A socket is only ever used by one caller at a time. The pool opens sockets
+lazily up to its maximum size, checks idle sockets before handing them out
+and reconnects sockets that report a TCP timeout (-2) or a closed
+connection (-108). One extra socket is reserved for emergency commands
+(kills) and is never checked out by anything else.
+"""
+
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+from instrument.component import InstrumentError
+
+# XPS error codes that mean the socket itself is unusable.
+CONNECTION_ERRORS = (-2, -108)
+
+
+class _PooledSocket(object):
+    """A socket id owned by the pool."""
+
+    __slots__ = ('id', 'lock', 'last_used')
+
+    def __init__(self, socket_id):
+        self.id        = socket_id
+        self.lock      = threading.Lock()
+        self.last_used = time.time()
+
+
+class XPSPool(object):
+    """Pool of sockets to one XPS controller.
+
+    Attributes
+    ----------
+    controller : xps Object
+        XPS controller the sockets belong to.
+    host : str
+        Controller IP.
+    port : int
+        Controller port.
+    maxsize : int
+        Maximum number of sockets checked out at once, not counting the
+        reserved emergency socket.
+    timeout : float
+        Socket timeout handed to TCP_ConnectToServer.
+    idle_check : float
+        A socket idle for longer than this many seconds is health checked
+        before it is checked out.
+    """
+
+    def __init__(self, controller, host, port, maxsize=16, timeout=1,
+                 idle_check=30.0):
+        self.controller = controller
+        self.host       = host
+        self.port       = port
+        self.maxsize    = maxsize
+        self.timeout    = timeout
+        self.idle_check = idle_check
+
+        self._cond      = threading.Condition()
+        self._idle      = []
+        self._count     = 0
+        self._reserved  = None
+
+    def open(self, size=1):
+        """Opens the reserved emergency socket and up to size pooled
+        sockets. The connections are made in parallel, each bounded by
+        timeout, and the first one to succeed becomes the reserved socket.
+        Connections that fail are left to be opened on demand later.
+
+        Returns:
+            The number of usable sockets obtained, reserved included.
+
+        Raises:
+            InstrumentError -- if no socket at all could be opened.
+        """
+        wanted  = min(size, self.maxsize - self._count)
+        wanted += 1 if self._reserved is None else 0
+        opened  = []
+
+        def connect():
+            try:
+                opened.append(self._connect())
+            except InstrumentError:
+                pass
+
+        threads = [threading.Thread(name='XPSPoolConnect', target=connect)
+                   for i in range(wanted)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if not opened and self._reserved is None:
+            raise InstrumentError('No Newport socket could be opened to'
+                                  ' %s:%d!' % (self.host, self.port))
+        if len(opened) < wanted:
+            logging.warning('Only %d of %d Newport sockets opened; the'
+                            ' instrument will run degraded.'
+                            % (len(opened), wanted))
+
+        if self._reserved is None:
+            self._reserved = _PooledSocket(opened.pop(0))
+        with self._cond:
+            self._idle.extend([_PooledSocket(i) for i in opened])
+            self._count += len(opened)
+            self._cond.notify_all()
+        return len(opened) + 1
+
+    def close(self):
+        """Closes every socket that is not checked out, and the reserved
+        socket."""
+        with self._cond:
+            for pooled in self._idle:
+                self.controller.TCP_CloseSocket(pooled.id)
+            self._count -= len(self._idle)
+            self._idle = []
+        if self._reserved is not None:
+            with self._reserved.lock:
+                self.controller.TCP_CloseSocket(self._reserved.id)
+            self._reserved = None
+
+    @property
+    def size(self):
+        """Number of pooled sockets currently open."""
+        return self._count
+
+    def checkout(self, timeout=None):
+        """Returns a pooled socket for exclusive use, opening a new one if
+        none is idle and the pool is not full.
+
+        Raises:
+            InstrumentError -- if no socket could be obtained.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while not self._idle and self._count >= self.maxsize:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise InstrumentError('No Newport socket became available'
+                                          ' within %s s!' % timeout)
+                self._cond.wait(remaining)
+            if self._idle:
+                pooled = self._idle.pop()
+            else:
+                self._count += 1
+                pooled = None
+
+        try:
+            if pooled is None:
+                pooled = _PooledSocket(self._connect())
+            elif time.time() - pooled.last_used > self.idle_check:
+                self._check(pooled)
+        except InstrumentError:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+
+        pooled.lock.acquire()
+        return pooled
+
+    def checkin(self, pooled, broken=False):
+        """Returns a socket to the pool. A broken socket is health checked
+        and reconnected if needed."""
+        pooled.last_used = time.time()
+        pooled.lock.release()
+        if broken:
+            try:
+                self._check(pooled)
+            except InstrumentError:
+                with self._cond:
+                    self._count -= 1
+                    self._cond.notify()
+                return
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def socket(self, timeout=None):
+        """Context manager yielding a checked out socket id."""
+        pooled = self.checkout(timeout)
+        try:
+            yield pooled.id
+        except:
+            self.checkin(pooled, broken=True)
+            raise
+        else:
+            self.checkin(pooled)
+
+    @contextmanager
+    def emergency(self):
+        """Context manager yielding the reserved emergency socket id."""
+        if self._reserved is None:
+            raise InstrumentError('Newport emergency socket is not open!')
+        with self._reserved.lock:
+            try:
+                yield self._reserved.id
+            except:
+                self._check(self._reserved)
+                raise
+
+    def _check(self, pooled):
+        """Reconnects pooled if the controller no longer answers on it."""
+        error = self.controller.ElapsedTimeGet(pooled.id)[0]
+        if error in CONNECTION_ERRORS:
+            logging.info('Newport socket %d failed a health check (%d);'
+                         ' reconnecting.' % (pooled.id, error))
+            self.controller.TCP_CloseSocket(pooled.id)
+            pooled.id = self._connect()
+        pooled.last_used = time.time()
+
+    def _connect(self):
+        socket_id = self.controller.TCP_ConnectToServer(self.host, self.port,
+                                                        self.timeout)
+        if socket_id == -1:
+            raise InstrumentError('Newport socket connection to %s:%d could'
+                                  ' not be opened!' % (self.host, self.port))
+        return socket_id
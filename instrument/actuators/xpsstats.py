@@ -0,0 +1,166 @@
+"""
+.. module:: xpsstats
+   :platform: Unix
+   :synopsis: Latency statistics of Newport XPS commands.
+
+When enabled on the XPS driver, every command sent is timed from send to
+reply and counted per command name and per socket:
+
+    statistics = controller.StatisticsEnable()
+    ...
+    statistics.summary()['commands']['GPIODigitalGet']['p95']
+    logging.info(statistics.report())
+
+Latencies go into log spaced histograms, so recording costs a dictionary
+lookup and a few additions and percentiles are accurate to a bucket width
+(about 12%). StatisticsLogger writes the report to the log periodically.
+"""
+
+import bisect
+import logging
+import threading
+import time
+
+# Histogram bucket edges in seconds: 20 per decade from 10 us to 100 s.
+# The last bucket also holds everything slower.
+BUCKETS_PER_DECADE = 20
+BUCKET_EDGES = [10 ** (-5 + i / float(BUCKETS_PER_DECADE))
+                for i in range(7*BUCKETS_PER_DECADE + 1)]
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram(object):
+    """Call count, bytes and latency histogram of one command or socket."""
+
+    __slots__ = ('calls', 'sent', 'received', 'total', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.calls    = 0
+        self.sent     = 0
+        self.received = 0
+        self.total    = 0.0
+        self.maximum  = 0.0
+        self.buckets  = [0] * len(BUCKET_EDGES)
+
+    def add(self, seconds, sent, received):
+        self.calls    += 1
+        self.sent     += sent
+        self.received += received
+        self.total    += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+        i = bisect.bisect_left(BUCKET_EDGES, seconds)
+        self.buckets[min(i, len(BUCKET_EDGES) - 1)] += 1
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th percentile latency, in
+        seconds, capped at the slowest call seen."""
+        if not self.calls:
+            return 0.0
+        rank = q / 100.0 * self.calls
+        seen = 0
+        for edge, count in zip(BUCKET_EDGES, self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(edge, self.maximum)
+        return self.maximum
+
+    def summary(self):
+        summary = {
+            'calls'    : self.calls,
+            'sent'     : self.sent,
+            'received' : self.received,
+            'total'    : self.total,
+            'mean'     : self.total / self.calls if self.calls else 0.0,
+            'max'      : self.maximum,
+            }
+        for q in PERCENTILES:
+            summary['p%d' % q] = self.percentile(q)
+        return summary
+
+
+class XPSStatistics(object):
+    """Latency histograms of XPS commands, by command name and by socket.
+
+    Attributes:
+        started -- Time the statistics were last reset -> float
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._commands = {}
+            self._sockets  = {}
+            self.started   = time.time()
+
+    def record(self, socketId, name, sent, received, seconds):
+        """Adds one command round trip."""
+        with self._lock:
+            command = self._commands.get(name)
+            if command is None:
+                command = self._commands[name] = LatencyHistogram()
+            command.add(seconds, sent, received)
+            sock = self._sockets.get(socketId)
+            if sock is None:
+                sock = self._sockets[socketId] = LatencyHistogram()
+            sock.add(seconds, sent, received)
+
+    def summary(self):
+        """Returns {'commands': {name: summary}, 'sockets': {id: summary},
+        'elapsed': seconds}, see LatencyHistogram.summary."""
+        with self._lock:
+            return {
+                'commands' : dict((name, h.summary())
+                                  for name, h in self._commands.items()),
+                'sockets'  : dict((sock, h.summary())
+                                  for sock, h in self._sockets.items()),
+                'elapsed'  : time.time() - self.started,
+                }
+
+    def report(self):
+        """Formats the summary as a table, slowest total time first."""
+        summary = self.summary()
+        header  = '%-40s %7s %9s %8s %8s %8s %8s' % (
+            '', 'calls', 'total s', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms')
+        lines = ['XPS command latency over the last %.0f s'
+                 % summary['elapsed'], header]
+        for title, table in (('command', summary['commands']),
+                             ('socket', summary['sockets'])):
+            rows = sorted(table.items(), key=lambda row: -row[1]['total'])
+            for key, row in rows:
+                lines.append('%-40s %7d %9.3f %8.2f %8.2f %8.2f %8.2f' % (
+                    '%s %s' % (title, key), row['calls'], row['total'],
+                    row['p50']*1e3, row['p95']*1e3, row['p99']*1e3,
+                    row['max']*1e3))
+        return '\n'.join(lines)
+
+
+class StatisticsLogger(object):
+    """Logs the report of an XPSStatistics every period seconds until
+    stopped, optionally resetting the statistics after each report."""
+
+    def __init__(self, statistics, period=600.0, reset=False):
+        self.statistics = statistics
+        self.period     = period
+        self.reset      = reset
+        self._stop      = threading.Event()
+        self._thread    = threading.Thread(name='XPSStatisticsLogger',
+                                           target=self._run)
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.period):
+            logging.info(self.statistics.report())
+            if self.reset:
+                self.statistics.reset()
@@ -11,6 +11,8 @@ import logging
 import math
 import sys
 import os
+import threading
+import time
 #os.environ["NUMERIX"] = "numarray" # make pyfits use numarray
 
 from configobj import ConfigObj
@@ -20,14 +22,21 @@ import pyfits
 import pywcs
 import PyGuide
 
+from   actuators            import newport
 from   actuators.dewarwheel import DewarWheel
+from   actuators.gpiopoller import GPIOPoller, switches
 from   actuators.kmirror    import KMirror
+from   actuators.newport    import NewportUploadScripts
+from   actuators.statuscache import StatusCache
 from   actuators.thorlabs   import ThorlabsController
 import actuators.XPS_C8_drivers as xps
+from   actuators.xpspool    import XPSPool
+from   actuators.xpsstats   import StatisticsLogger
 from   component            import InstrumentError, KillAllError
+from   keywordcache         import KeywordCache
 from   sensors.lakeshore    import LakeshoreController
 from   sensors.flicam       import FLICam
-from   threadtools          import timeout, TimeoutError
+from   threadtools          import timeout
 from   telescope.telescope  import Telescope
 
 class Instrument(object):
@@ -48,8 +57,20 @@ class Instrument(object):
         Configuration object.
     newport : xps Object
         Newport XPS controller.
-    open_sockets : [int]
-        List of open Newport Sockets.
+    sockets : XPSPool
+        Pool of Newport sockets.
+    status : StatusCache
+        Newport motor status shared by the components, cached for the
+        'status ttl' of the general config section.
+    gpio : GPIOPoller
+        Shared reader of the Newport switches, polling at the 'gpio rate'
+        of the general config section (None if it is 0).
+    xps_statistics : StatisticsLogger
+        Periodic log of Newport command latencies, if enabled by the
+        'xps statistics' period of the general config section.
+    keyword_cache : KeywordCache
+        FITS keywords, each source refreshed in the background at the
+        period of the keywords config section.
     kmirror : KMirror Object
         Kmirro interface.
     mask_wheel : DewarWheel
@@ -72,6 +93,8 @@ class Instrument(object):
     -------
     update_telescope_data()
         Reads in the telescope position, updates ra and dec.
+    def setup(mask, filter1, filter2, grism, kmirror, focus)
+        Moves several axes to an optical configuration at once.
     def kill_all(msg=None)
         Safely disconnects all instrument components
     def move_telescope(ra, dec)
@@ -79,7 +102,7 @@ class Instrument(object):
      
     """
 
-    _sockets = 40
+    _initial_sockets = 2
 
     def __init__(self, cfg):
         """Initialize the NESSI instrument.
@@ -98,7 +121,10 @@ class Instrument(object):
         ################################################################
         #Newport things
         self.newport       = None
-        self.open_sockets  = None
+        self.sockets       = None
+        self.status        = None
+        self.gpio          = None
+        self.xps_statistics = None
         self.kmirror       = None        
         self.mask_wheel    = None
         self.filter1_wheel = None
@@ -117,6 +143,10 @@ class Instrument(object):
         ################################################################
         self.telescope = None
 
+        #FITS keywords, refreshed in the background
+        ################################################################
+        self.keyword_cache = None
+
         #Init components
         ################################################################
         self._init_components()
@@ -129,6 +159,8 @@ class Instrument(object):
             raise InstrumentError('Unable to connect to telescope!')
 
     def closeTelescope(self):
+        if self.keyword_cache is not None:
+            self.keyword_cache.stop()
         if isinstance(self.telescope, Telescope):
             self.telescope._indi.quit()
 
@@ -148,30 +180,56 @@ class Instrument(object):
         newport_good = False    #Flag for if the newport was initialized
 
         self.newport = xps.XPS()
-        self.open_sockets=[]
+        self.sockets = XPSPool(self.newport, '10.90.20.1', 5001,
+                               maxsize=int(self.cfg['general']['sockets']))
+        self.status  = StatusCache(self.newport, self.sockets,
+                                   float(self.cfg['general']['status ttl']))
+        period = float(self.cfg['general'].get('xps statistics', 0))
+        if period > 0:
+            self.xps_statistics = StatisticsLogger(
+                self.newport.StatisticsEnable(), period).start()
         logging.debug('Newport initialized!')
 
-        #Fill Sockets
+        #Open Sockets
         ################################################################
         try:
-            self._fill_socket_list()
-            logging.debug('Sockets filled!')
+            opened = self._open_sockets()
+            logging.debug('%d Newport sockets opened!' % opened)
             newport_good = True
-        except TimeoutError:
-            logging.debug('Newport Sockets timed out!')
-            sys.exc_clear()
         except InstrumentError:
             logging.debug('Newport errored out initializing sockets!')
             sys.exc_clear()
 
 
 
+        #Upload the controller side wheel moves, if any wheel uses them
+        ################################################################
+        wheels = ('mask', 'filter1', 'filter2', 'grism')
+        if newport_good and any(self.cfg[wheel].get('move', 'host') == 'tcl'
+                                for wheel in wheels):
+            try:
+                NewportUploadScripts(self.sockets.host,
+                                     self.cfg['general']['xps user'],
+                                     self.cfg['general']['xps password'])
+                logging.debug('Newport TCL scripts uploaded!')
+            except InstrumentError:
+                sys.exc_clear()
+
+        #Share one reader of the switches between the motions
+        ################################################################
+        rate = float(self.cfg['general'].get('gpio rate', 0))
+        if newport_good and rate > 0:
+            self.gpio = GPIOPoller(self.newport, self.sockets,
+                                   switches(self.cfg), rate).start()
+            newport.gpio = self.gpio
+            logging.debug('GPIO poller started at %g Hz!' % rate)
+
         if newport_good:
             #Kmirror
             ################
             try:
                 self.kmirror        = KMirror(self, self.newport, 
-                                             self.open_sockets[20:])
+                                              self.sockets, self.status)
                 logging.debug('K-Mirror initialized!')
             except InstrumentError:
                 sys.exc_clear()
@@ -181,7 +239,7 @@ class Instrument(object):
             #################
             try:
                 self.mask_wheel    = DewarWheel(self, 'mask',
-                                                self.open_sockets[0:4],
+                                                self.sockets,
                                                 self.cfg['mask']['pos'])
                 logging.debug('Mask wheel initialized!')
             except InstrumentError:
@@ -191,7 +249,7 @@ class Instrument(object):
             ################
             try:
                 self.filter1_wheel = DewarWheel(self, 'filter1',
-                                                self.open_sockets[5:9],
+                                                self.sockets,
                                                 self.cfg['filter1']['pos'])
                 logging.debug('Filter1 wheel initialized!')
             except InstrumentError:
@@ -201,7 +259,7 @@ class Instrument(object):
             ################
             try:
                 self.filter2_wheel = DewarWheel(self, 'filter2',
-                                                self.open_sockets[10:14],
+                                                self.sockets,
                                                 self.cfg['filter2']['pos'])
                 logging.debug('Filter2 wheel initialized!')
             except InstrumentError:
@@ -211,7 +269,7 @@ class Instrument(object):
             ################
             try:
                 self.grism_wheel   = DewarWheel(self, 'grism',
-                                                self.open_sockets[15:19],
+                                                self.sockets,
                                                 self.cfg['grism']['pos'])
                 logging.debug('Grism wheel initialized!')
             except InstrumentError:
@@ -250,76 +308,118 @@ class Instrument(object):
         except InstrumentError:
             sys.exc_clear()
 
+        #Refresh the keywords of the components found
+        ################################################################
+        self.keyword_cache = self._build_keyword_cache().start()
 
 
-    @property
-    def keywords(self):
-        #Define keywords
-        ################################################################
+
+    def _build_keyword_cache(self):
+        """KeywordCache of the FITS keywords of the components found.
+        Keywords of missing components are None."""
+        periods = self.cfg.get('keywords', {})
+        def period(source, default):
+            return float(periods.get(source, default))
+
+        cache = KeywordCache()
         #TODO: Be sure to be getting decimal degrees
-        keywords = {
+        cache.constant({
             "OBSERVER" : "Observer",    #TODO: Get from somewhere
             "INST"     : "NESSI",       
             "TELESCOP" : "MRO 2.4m",    #TODO:Get from indi?
             "FILENAME" : "default",     #TODO:Do these later?
             "IMGTYPE"  : "imgtyp",      
-            "RA"       : 
-            self.telescope.ra if self.telescope else None,
-            "DEC"      : 
-            self.telescope.dec if self.telescope else None,
-            "AIRMASS"  : 
-            self.telescope.airmass if self.telescope else None,
-            "TELALT"   : 
-            self.telescope.altitude if self.telescope else None,
-            "TELAZ"    : 
-            self.telescope.azimuth if self.telescope else None,
             "TELFOCUS" : "TCS down",    #TODO:Where is?
-            "PA"       : 
-            self.telescope.parallactic_angle if self.telescope else None,
-            "JD"       : 
-            self.telescope.julian_date if self.telescope else None,
             "GDATE"    : "TCS down",    #TODO:Generate
             #"WINDVEL"  : self.telescope.wind_speed,
             #"WINDGUST" : self.telescope.wind_gust,
             #"WINDDIR"  : self.telescope.wind_direction,
-            "AGR"      : 0.0,           #focus position ???
+            "AGR"      : 0.0,           #focus position, set on moves
             "REI34"    : 0.0,           #focus position (Dewar focus)
-            "MASK"     : 
-            self.mask_wheel.position if self.mask_wheel else None,
-            "FILTER1"  : 
-            self.filter1_wheel.position if self.filter1_wheel else None,
-            "FILTER2"  : 
-            self.filter2_wheel.position if self.filter2_wheel else None,
-            "GRISM"    : 
-            self.grism_wheel.position if self.grism_wheel else None,
             "EXP"      : 0.0,           #??????????
-            "CAMTEMP"  : 
-            self.guide_cam.getTemperature() if self.guide_cam else None,
             "CTYPE1"   : "RA---TAN",    #?????????
             "CTYPE2"   : "DEC--TAN",    #?????????
             #The following two values are for the guide cam. They
-            #are overwritten in main.py KeywordTCPHandler for the
-            #H2RG
+            #are overwritten in the H2RG variant, see keywordsH2RG.
             "CRPIX1"   : 528.0,         # ref point pixel x
             "CRPIX2"   : 513.5,         # ref point pixel y
             "CDELT1"   : 0.000119444444,# deg per pixel x
             "CDELT2"   : 0.000119444444,# deg per pixel y
             "CRVAL1"   : 0.0,           #?????????
             "CRVAL2"   : 0.0,           #?????????
-            "CROTA2"   :                #Image rotation value
-            self.kmirror.positionAngle * 2 + 180 if self.kmirror else None
-            }
-        
-        return keywords
+            })
+        cache.variant('H2RG', {
+            "CRPIX1"   : 1024.0,
+            "CRPIX2"   : 1024.0,
+            "CDELT1"   : 0.000147222222,
+            "CDELT2"   : 0.000147222222,
+            })
+
+        #Pointing from the TCS; alt/az, PA, airmass and JD are computed
+        #from it, as often as they change.
+        pointing = period('telescope', 5.0)
+        if self.telescope:
+            def telescope():
+                return {"RA" : self.telescope.ra, "DEC" : self.telescope.dec}
+            def sky():
+                sky = self.telescope.ephemeris(pointing).at(time.time())
+                return {"AIRMASS" : float(sky.airmass),
+                        "TELALT"  : float(sky.altitude),
+                        "TELAZ"   : float(sky.azimuth),
+                        "PA"      : float(sky.parallactic),
+                        "JD"      : float(sky.jd)}
+            cache.add('telescope', telescope, ("RA", "DEC"), pointing)
+            cache.add('sky', sky, ("AIRMASS", "TELALT", "TELAZ", "PA", "JD"),
+                      period('sky', 1.0))
+        else:
+            cache.constant(dict.fromkeys(("RA", "DEC", "AIRMASS", "TELALT",
+                                          "TELAZ", "PA", "JD")))
+
+        wheels = {"MASK"    : self.mask_wheel,
+                  "FILTER1" : self.filter1_wheel,
+                  "FILTER2" : self.filter2_wheel,
+                  "GRISM"   : self.grism_wheel}
+        def positions():
+            return dict((key, wheel.position) for key, wheel in wheels.items()
+                        if wheel)
+        cache.add('wheels', positions,
+                  [key for key in wheels if wheels[key]], period('wheels', 1.0))
+        cache.constant(dict.fromkeys(key for key in wheels if not wheels[key]))
+
+        if self.guide_cam:
+            cache.add('camera',
+                      lambda: {"CAMTEMP" : self.guide_cam.getTemperature()},
+                      ("CAMTEMP",), period('camera', 10.0))
+        else:
+            cache.constant({"CAMTEMP" : None})
+
+        #Image rotation value
+        if self.kmirror:
+            cache.add('kmirror', lambda: {
+                "CROTA2" : self.kmirror.positionAngle * 2 + 180},
+                      ("CROTA2",), period('kmirror', 1.0))
+        else:
+            cache.constant({"CROTA2" : None})
+
+        return cache
+
+    @property
+    def keywords(self):
+        """Latest snapshot of the FITS keywords, for the guide cam. It is
+        read only and never waits on hardware; see KeywordCache for the age
+        of each value."""
+        return self.keyword_cache.snapshot()
 
     @property
     def keywordsH2RG(self):
-        keywords = self.keywords
-        keywords['CRPIX1'] = 1024.0
-        keywords['CRPIX2'] = 1024.0
-        keywords['CDELT1'] = 0.000147222222
-        keywords['CDELT2'] = 0.000147222222
-        return keywords
+        """keywords with the H2RG reference pixel and scale."""
+        return self.keyword_cache.snapshot('H2RG')
+
+    def set_keyword(self, key, value):
+        """Sets a keyword changed by the instrument, such as a focus
+        position after a move."""
+        if self.keyword_cache is not None:
+            self.keyword_cache.set(key, value)
 
 
     @property
@@ -349,21 +449,88 @@ class Instrument(object):
         dictionary['Telescope'] = self.telescope
         return dictionary
         
-    @timeout(10)
-    def _fill_socket_list(self):
-        for i in range(40):
-            socket = self.newport.TCP_ConnectToServer(
-                '10.90.20.1',5001,1)
-            if socket is not -1:
-                self.open_sockets.append(socket)
-            else:
-                raise InstrumentError('Newport socket connection not opened'
-                                      ' at position %d!' % i)
+    def setup(self, mask=None, filter1=None, filter2=None, grism=None,
+              kmirror=None, focus=None):
+        """Moves the instrument to an optical configuration. The wheels,
+        the K-mirror and the focus are independent, so every requested
+        motion runs in its own thread and the whole setup takes about as
+        long as the slowest one. Axes left as None are not moved.
+
+        Arguments:
+            mask    -- Mask wheel position, name or number -> str or int
+            filter1 -- Filter 1 wheel position -> str or int
+            filter2 -- Filter 2 wheel position -> str or int
+            grism   -- Grism wheel position -> str or int
+            kmirror -- K-mirror position angle -> float
+            focus   -- REI 3/4 focus position in microns -> float
+
+        Returns:
+            Dictionary of the requested axes, each mapped to None if it
+            reached its position or to the InstrumentError it raised.
+        """
+        def wheel(component, position):
+            return lambda: component.move(component.index(position))
+
+        axes = [
+            ('mask',    self.mask_wheel,    mask,    wheel),
+            ('filter1', self.filter1_wheel, filter1, wheel),
+            ('filter2', self.filter2_wheel, filter2, wheel),
+            ('grism',   self.grism_wheel,   grism,   wheel),
+            ('kmirror', self.kmirror,       kmirror,
+             lambda component, angle: lambda: component.move(angle)),
+            ('focus',   self.REI34_focus,   focus,
+             lambda component, microns:
+                 lambda: component.move_absolute(microns)),
+            ]
+
+        errors  = {}
+        threads = []
+        for name, component, target, motion in axes:
+            if target is None:
+                continue
+            errors[name] = None
+            if component is None:
+                errors[name] = InstrumentError('Unable to set up the ' + name
+                                               + ', it is not initialized.')
+                continue
+            thread = threading.Thread(name='setup ' + name,
+                                      target=self._setup_axis,
+                                      args=(name, motion(component, target),
+                                            errors))
+            thread.daemon = True
+            threads.append(thread)
+
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logging.info('Instrument setup of %s done in %.1f s, %d failed.'
+                     % (', '.join(sorted(errors)), time.time() - start,
+                        len([e for e in errors.values() if e is not None])))
+        return errors
+
+    def _setup_axis(self, name, motion, errors):
+        try:
+            motion()
+        except InstrumentError as e:
+            errors[name] = e
+        except Exception as e:
+            errors[name] = InstrumentError('Setup of the %s failed: %r'
+                                           % (name, e))
+
+    def _open_sockets(self):
+        """Opens the reserved emergency socket and the first few pooled
+        sockets in parallel, each connect bounded by the pool timeout. The
+        pool opens more on demand. Returns the number of sockets opened."""
+        return self.sockets.open(self._initial_sockets)
     
     @timeout(10)
     def _close_sockets(self):
-        for i in range(len(self.open_sockets)):
-            self.newport.TCP_CloseSocket(self.open_sockets[i])            
+        if self.gpio is not None:
+            newport.gpio = None
+            self.gpio.stop()
+        self.sockets.close()
         
 
     def kill_all(self, msg=None):
@@ -0,0 +1,267 @@
+"""
+.. module:: keywordcache
+   :platform: Unix
+   :synopsis: FITS keywords refreshed in the background, served as
+              immutable snapshots.
+
+Instrument.keywords used to read the telescope, the guide camera
+temperature and the K-mirror position each time it was asked, so a FITS
+header waited behind the camera lock or a slow TCS. KeywordCache refreshes
+every source of keywords in its own thread, at its own period, and
+publishes a new Snapshot after each refresh that changes a value:
+
+    cache = KeywordCache()
+    cache.constant({'INST' : 'NESSI'})
+    cache.add('telescope', read_pointing, ('RA', 'DEC'), period=5.0)
+    cache.variant('H2RG', {'CRPIX1' : 1024.0})
+    cache.start()
+    keywords = cache.snapshot()           # no I/O, never waits on hardware
+    keywords['RA'], keywords.age('RA'), keywords.stale('RA')
+    cache.snapshot('H2RG')                # same values, with the overrides
+    cache.set('AGR', 1250.0)              # pushed by the owner of the value
+    keywords = cache.wait(keywords.version, timeout=1.0)  # the next one
+
+A source is a function returning a dictionary of its keywords. Every value
+is timestamped with the time its source answered. It is stale once older
+than the max_age of its source, three periods by default, or while its
+source never answered, in which case it is None. A source that fails keeps
+its last values, which go stale. Constants and pushed values never do.
+
+A new version of the snapshots is only published when a value changes,
+which wakes the threads in wait(). A refresh that finds the same values
+publishes snapshots of the same version with the new timestamps, quietly.
+A published snapshot never changes.
+"""
+
+import collections
+import logging
+import threading
+import time
+
+
+class Snapshot(collections.Mapping):
+    """Keywords at one instant. Read only; dict(snapshot) for a copy.
+
+    Attributes:
+        time    -- time.time() the snapshot was published -> float
+        version -- Number of the values of the snapshot, shared by its
+                   variants and by the snapshots that only renew their
+                   timestamps -> int
+    """
+
+    def __init__(self, values, times, max_ages, when, version=0):
+        self._values   = values
+        self._times    = times
+        self._max_ages = max_ages
+        self.time      = when
+        self.version   = version
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return repr(self._values)
+
+    def updated(self, key):
+        """time.time() key was read, None if it never was."""
+        return self._times[key]
+
+    def age(self, key, now=None):
+        """Seconds since key was read, None if it never was."""
+        if self._times[key] is None:
+            return None
+        return (time.time() if now is None else now) - self._times[key]
+
+    def stale(self, key, now=None):
+        """Whether key was never read or is older than its max_age now."""
+        if self._max_ages[key] is None:
+            return False
+        age = self.age(key, now)
+        return age is None or age > self._max_ages[key]
+
+    def stale_keys(self, now=None):
+        """Sorted list of the stale keywords."""
+        now = time.time() if now is None else now
+        return sorted(key for key in self._values if self.stale(key, now))
+
+
+class _Source(object):
+
+    __slots__ = ('name', 'fetch', 'keys', 'period', 'max_age', 'failing',
+                 'thread')
+
+    def __init__(self, name, fetch, keys, period, max_age):
+        self.name    = name
+        self.fetch   = fetch
+        self.keys    = tuple(keys)
+        self.period  = period
+        self.max_age = max_age
+        self.failing = False
+        self.thread  = None
+
+
+class KeywordCache(object):
+    """Keywords of several sources, each refreshed by its own thread.
+
+    Attributes:
+        sources -- Refreshed sources, by name -> {str: _Source}
+        version -- Version of the latest snapshot -> int
+    """
+
+    def __init__(self):
+        self.sources   = {}
+        self._values   = {}
+        self._times    = {}
+        self._max_ages = {}
+        self._variants = {}
+        self._lock     = threading.Lock()
+        self._published = threading.Condition(self._lock)
+        self._stop     = threading.Event()
+        self.version   = 0
+        self._snapshots = {None : Snapshot({}, {}, {}, time.time())}
+
+    @property
+    def running(self):
+        return any(source.thread is not None and source.thread.is_alive()
+                   for source in self.sources.values())
+
+    def add(self, name, fetch, keys, period, max_age=None):
+        """Refreshes keys with fetch() every period seconds once started.
+        fetch returns a dictionary of keys; its values are stale after
+        max_age seconds, by default 3 periods."""
+        if max_age is None:
+            max_age = 3.0*period
+        source = _Source(name, fetch, keys, period, max_age)
+        with self._lock:
+            self.sources[name] = source
+            for key in source.keys:
+                self._values.setdefault(key, None)
+                self._times.setdefault(key, None)
+                self._max_ages[key] = max_age
+            self._publish()
+        return source
+
+    def constant(self, values):
+        """Keywords that never change, nor go stale."""
+        self._update(values, time.time(), None)
+
+    def set(self, key, value):
+        """Sets key from its owner, for values that change only when the
+        instrument changes them. Pushed values never go stale."""
+        self._update({key : value}, time.time(), None)
+
+    def variant(self, name, overrides):
+        """Publishes snapshot(name) along with each snapshot, the same
+        keywords with overrides replacing theirs."""
+        with self._lock:
+            self._variants[name] = dict(overrides)
+            self._publish()
+
+    def snapshot(self, variant=None):
+        """Latest Snapshot, or that of a variant. Never blocks."""
+        return self._snapshots[variant]
+
+    def wait(self, version, timeout=None, variant=None):
+        """Waits until a snapshot newer than version is published, or
+        wake() is called, and returns the latest one, or that of a variant.
+        On timeout the current snapshot is returned, whatever its version.
+        A timed wait polls in Python 2, so long lived waiters should rather
+        rely on wake() to stop."""
+        with self._published:
+            if self.version == version:
+                self._published.wait(timeout)
+            return self._snapshots[variant]
+
+    def wake(self):
+        """Wakes the threads in wait() without publishing anything."""
+        with self._published:
+            self._published.notify_all()
+
+    def start(self):
+        self._stop.clear()
+        for source in self.sources.values():
+            if source.thread is None or not source.thread.is_alive():
+                source.thread = threading.Thread(
+                    name='Keywords %s' % source.name, target=self._run,
+                    args=(source,))
+                source.thread.daemon = True
+                source.thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Stops the refresh threads. A thread stuck in a hardware read is
+        not waited for more than timeout; it is a daemon."""
+        self._stop.set()
+        for source in self.sources.values():
+            if source.thread is not None:
+                source.thread.join(timeout)
+                source.thread = None
+
+    def refresh(self, name):
+        """Refreshes one source now, in the calling thread. Returns
+        whether it answered."""
+        source = self.sources[name]
+        try:
+            values = source.fetch()
+        except Exception as e:
+            if not source.failing:
+                logging.warning('Keywords of %s not refreshed: %s'
+                                % (name, e))
+            source.failing = True
+            return False
+        if source.failing:
+            logging.info('Keywords of %s refreshed again.' % name)
+        source.failing = False
+        self._update(dict((key, values.get(key)) for key in source.keys),
+                     time.time(), source.max_age)
+        return True
+
+    def _run(self, source):
+        while not self._stop.is_set():
+            start = time.time()
+            self.refresh(source.name)
+            self._stop.wait(max(source.period - (time.time() - start), 0))
+
+    def _update(self, values, when, max_age):
+        with self._lock:
+            changed = False
+            for key, value in values.items():
+                if key not in self._values or self._values[key] != value or \
+                   self._max_ages[key] != max_age:
+                    changed = True
+                self._values[key]   = value
+                self._times[key]    = when
+                self._max_ages[key] = max_age
+            self._publish(changed)
+
+    def _publish(self, changed=True):
+        # Called with _lock held. Readers only ever see complete
+        # snapshots: the dictionary of them is replaced at once. Unless
+        # a value changed, the version stays and no waiter is woken.
+        if changed:
+            self.version += 1
+        now      = time.time()
+        times    = dict(self._times)
+        max_ages = dict(self._max_ages)
+        snapshots = {None : Snapshot(dict(self._values), times, max_ages,
+                                     now, self.version)}
+        for name, overrides in self._variants.items():
+            values = dict(self._values)
+            values.update(overrides)
+            variant_times = dict(times)
+            variant_ages  = dict(max_ages)
+            for key in overrides:
+                if variant_times.get(key) is None:
+                    variant_times[key] = now
+                variant_ages[key] = None
+            snapshots[name] = Snapshot(values, variant_times, variant_ages,
+                                       now, self.version)
+        self._snapshots = snapshots
+        if changed:
+            self._published.notify_all()
@@ -0,0 +1,232 @@
+"""
+.. module:: keywordfile
+   :platform: Unix
+   :synopsis: FITS keyword snapshots in a memory mapped file, for the
+              acquisition software.
+
+OWL used to get the FITS keywords by sending SIGPOLL to NESSI, which built
+them inside the signal handler and wrote them to a FIFO. KeywordFile
+instead writes every snapshot of a KeywordCache to a memory mapped file as
+soon as it is published, and KeywordReader reads the latest one from it in
+microseconds, without signalling NESSI:
+
+    writer = KeywordFile('/dev/shm/nessi-keywords', cache).start()
+    writer.stop()
+
+    reader = KeywordReader('/dev/shm/nessi-keywords')
+    sequence, version, when, keywords = reader.read()
+    reader.sequence                     # changes with every snapshot
+
+KeywordReader uses the standard library only, so it may be copied next to
+the acquisition software. The layout, little endian:
+
+    offset  size
+     0       8   magic "NESSIKW1"
+     8       4   layout version, 1
+    12       4   capacity of the payload, bytes
+    16       8   sequence, odd while the snapshot is being written
+    24       8   version of the snapshot in the KeywordCache
+    32       8   time.time() the snapshot was published, double
+    40       4   length of the payload, bytes
+    64           payload, "key<TAB>value" lines as on the keyword socket
+
+It is a seqlock: the single writer makes the sequence odd, writes the
+snapshot and makes it even again. A reader reads the sequence, the
+snapshot and the sequence again, and retries if it was odd or changed.
+The sequence keeps increasing across restarts of NESSI, the version
+starts over.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+MAGIC    = 'NESSIKW1'
+LAYOUT   = 1
+HEADER   = 64
+CAPACITY = 65536
+
+_PREFIX   = struct.Struct('<8sII')
+_SEQUENCE = struct.Struct('<Q')
+_SNAPSHOT = struct.Struct('<QdI')
+_SEQUENCE_OFFSET = 16
+_SNAPSHOT_OFFSET = 24
+
+
+def encode(keywords):
+    """keywords as "key<TAB>value" lines."""
+    return ''.join('%s\t%s\n' % (key, keywords[key]) for key in keywords)
+
+
+def decode(payload):
+    """Dictionary of "key<TAB>value" lines; the values stay strings."""
+    return dict(line.split('\t', 1) for line in payload.splitlines())
+
+
+class KeywordFile(object):
+    """Writes the snapshots of a KeywordCache to a memory mapped file.
+
+    Attributes:
+        path     -- File path, best on a tmpfs such as /dev/shm -> str
+        cache    -- Source of the keywords -> KeywordCache
+        variant  -- Variant of the snapshots written, None for the plain
+                    keywords -> str
+        capacity -- Largest payload, bytes -> int
+        sequence -- Sequence of the last snapshot written -> int
+    """
+
+    def __init__(self, path, cache, variant=None, capacity=CAPACITY):
+        self.path     = path
+        self.cache    = cache
+        self.variant  = variant
+        self.capacity = capacity
+        self._stop    = threading.Event()
+        self._thread  = None
+        self._map     = None
+        self.sequence = 0
+
+    def open(self):
+        """Maps the file, created or resized as needed. A file of the same
+        layout is reused in place, so readers that mapped it before a
+        restart keep reading."""
+        size = HEADER + self.capacity
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0644)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size, mmap.MAP_SHARED,
+                                  mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+        magic, layout, capacity = _PREFIX.unpack_from(self._map, 0)
+        if (magic, layout, capacity) == (MAGIC, LAYOUT, self.capacity):
+            # Even, past any write interrupted by a crash.
+            self.sequence = (_SEQUENCE.unpack_from(
+                self._map, _SEQUENCE_OFFSET)[0] + 1) & ~1
+        else:
+            self._map[:HEADER] = '\0'*HEADER
+            self.sequence = 0
+        _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, self.sequence)
+        _PREFIX.pack_into(self._map, 0, MAGIC, LAYOUT, self.capacity)
+        return self
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def write(self, snapshot):
+        """Writes snapshot, a Snapshot of the cache.
+
+        Raises:
+            ValueError -- if its payload is larger than capacity.
+        """
+        payload = encode(snapshot)
+        if len(payload) > self.capacity:
+            raise ValueError('Keywords of %d bytes do not fit in the %d of '
+                             '%s.' % (len(payload), self.capacity,
+                                      self.path))
+        memory = self._map
+        _SEQUENCE.pack_into(memory, _SEQUENCE_OFFSET, self.sequence + 1)
+        memory[HEADER:HEADER + len(payload)] = payload
+        _SNAPSHOT.pack_into(memory, _SNAPSHOT_OFFSET, snapshot.version,
+                            snapshot.time, len(payload))
+        self.sequence += 2
+        _SEQUENCE.pack_into(memory, _SEQUENCE_OFFSET, self.sequence)
+
+    def start(self):
+        if self._map is None:
+            self.open()
+        self._stop.clear()
+        self._thread = threading.Thread(name='KeywordFile', target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.cache.wake()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.close()
+
+    def _run(self):
+        snapshot = self.cache.snapshot(self.variant)
+        while not self._stop.is_set():
+            try:
+                self.write(snapshot)
+            except ValueError as e:
+                logging.error(str(e))
+            version = snapshot.version
+            # Woken by every snapshot and by stop.
+            while snapshot.version == version and not self._stop.is_set():
+                snapshot = self.cache.wait(version, None, self.variant)
+
+
+class KeywordReader(object):
+    """Reads the snapshots written by a KeywordFile.
+
+    Attributes:
+        path    -- File path -> str
+        retries -- Reads of a snapshot being written before giving up -> int
+    """
+
+    def __init__(self, path, retries=100000):
+        self.path    = path
+        self.retries = retries
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, mmap.MAP_SHARED,
+                                  mmap.PROT_READ)
+        magic, layout, self.capacity = _PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC or layout != LAYOUT:
+            self._map.close()
+            raise IOError('%s is not a NESSI keyword file.' % path)
+
+    @property
+    def sequence(self):
+        """Sequence of the last snapshot, cheap to poll for changes."""
+        return _SEQUENCE.unpack_from(self._map, _SEQUENCE_OFFSET)[0]
+
+    def read_raw(self):
+        """(sequence, version, time, payload) of the latest snapshot.
+
+        Raises:
+            IOError -- if no snapshot was written yet, or none could be
+                       read whole in retries attempts (a writer that died
+                       while writing).
+        """
+        memory = self._map
+        for attempt in xrange(self.retries):
+            before = _SEQUENCE.unpack_from(memory, _SEQUENCE_OFFSET)[0]
+            if before & 1:
+                if attempt > 100:
+                    time.sleep(0)
+                continue
+            version, when, length = _SNAPSHOT.unpack_from(memory,
+                                                          _SNAPSHOT_OFFSET)
+            payload = memory[HEADER:HEADER + min(length, self.capacity)]
+            if _SEQUENCE.unpack_from(memory, _SEQUENCE_OFFSET)[0] == before:
+                if before == 0:
+                    raise IOError('No keywords written to %s yet.'
+                                  % self.path)
+                return before, version, when, payload
+        raise IOError('No consistent keywords in %s after %d reads.'
+                      % (self.path, self.retries))
+
+    def read(self):
+        """(sequence, version, time, keywords) of the latest snapshot,
+        keywords a dictionary of strings.
+
+        Raises:
+            IOError -- see read_raw.
+        """
+        sequence, version, when, payload = self.read_raw()
+        return sequence, version, when, decode(payload)
+
+    def close(self):
+        self._map.close()
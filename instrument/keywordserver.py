@@ -0,0 +1,252 @@
+"""
+.. module:: keywordserver
+   :platform: Unix
+   :synopsis: Threaded TCP server of the FITS keyword snapshots.
+
+The keyword socket of main.py answered one client at a time and built the
+keywords from the hardware for each of them. KeywordServer answers every
+client in its own thread from the snapshots of a KeywordCache, encoding
+each snapshot once whatever the number of clients:
+
+    server = KeywordServer(('localhost', 8989), cache, dump='H2RG')
+    server = KeywordServer(('localhost', 8990), cache)
+    server.serve_forever()      # in a thread, until server.shutdown()
+
+With dump, every connection gets the keywords of that variant as
+"key<TAB>value" lines and is closed, as the old handler did. Otherwise the
+client sends requests, one per line:
+
+    GET [text|json] [variant]
+    SUBSCRIBE [text|json] [variant] [interval]
+    QUIT
+
+The variant is a variant of the cache or "guide" for the plain keywords,
+by default the variant of default_variant. GET answers with one frame of
+the whole snapshot and waits for the next request. SUBSCRIBE answers with
+the whole snapshot, then with a frame of the keywords that changed each
+time new values are published, at most every interval seconds, until the
+client sends QUIT or closes the connection.
+
+A text frame is the "key<TAB>value" lines followed by an empty line. A
+json frame is a 4 byte big endian length followed by that many bytes of a
+JSON object:
+
+    {"version": 12, "time": 1380000000.0, "full": true,
+     "keywords": {"RA": 5.5, ...}, "stale": ["CAMTEMP"]}
+
+"full" is false for the frames of changes and "stale" lists the keywords
+stale when the frame was sent. Malformed requests are answered with a
+line starting with "ERROR".
+"""
+
+import json
+import logging
+import select
+import socket
+import SocketServer
+import struct
+import threading
+import time
+
+FORMATS = ('text', 'json')
+
+
+def encode_text(keywords):
+    """keywords as "key<TAB>value" lines."""
+    return ''.join('%s\t%s\n' % (key, keywords[key]) for key in keywords)
+
+
+def encode_json(keywords):
+    return json.dumps(dict(keywords), default=str)
+
+
+def json_frame(snapshot, keywords, full, now=None):
+    """Framed JSON object of keywords (a JSON string) of snapshot."""
+    body = '{"version": %d, "time": %r, "full": %s, "stale": %s, ' \
+           '"keywords": %s}' % (snapshot.version, snapshot.time,
+                                'true' if full else 'false',
+                                json.dumps(snapshot.stale_keys(now)),
+                                keywords)
+    return struct.pack('!I', len(body)) + body
+
+
+def read_frame(rfile, fmt):
+    """Reads one frame sent by KeywordServer from rfile, a file of the
+    socket. Returns a dictionary of the keywords (text values stay
+    strings) for text, the decoded object for json, None at the end of
+    the stream."""
+    if fmt == 'json':
+        header = rfile.read(4)
+        if len(header) < 4:
+            return None
+        return json.loads(rfile.read(struct.unpack('!I', header)[0]))
+    keywords = {}
+    while True:
+        line = rfile.readline()
+        if not line:
+            return None
+        if line == '\n':
+            return keywords
+        key, value = line.rstrip('\n').split('\t', 1)
+        keywords[key] = value
+
+
+class KeywordHandler(SocketServer.StreamRequestHandler):
+    """One client of a KeywordServer."""
+
+    def handle(self):
+        try:
+            self._handle()
+        except socket.error as e:
+            logging.debug('Keyword client %s:%d left: %s'
+                          % (self.client_address + (e,)))
+
+    def _handle(self):
+        server = self.server
+        if server.cache is None:
+            self.wfile.write('ERROR keywords are not available yet\n')
+            return
+        if server.dump is not None:
+            self.wfile.write(server.encoded(server.dump, 'text')[1])
+            return
+        while not server.stopping.is_set():
+            line = self.rfile.readline()
+            if not line:
+                return
+            request = line.split()
+            if not request:
+                continue
+            command = request[0].upper()
+            try:
+                if command == 'QUIT':
+                    return
+                elif command == 'GET':
+                    fmt, variant = self._arguments(request[1:3])
+                    self._send_full(fmt, variant)
+                elif command == 'SUBSCRIBE':
+                    fmt, variant = self._arguments(request[1:3])
+                    interval = float(request[3]) if len(request) > 3 else 0.0
+                    self._subscribe(fmt, variant, interval)
+                    return
+                else:
+                    raise ValueError('unknown request %r' % command)
+            except (ValueError, KeyError) as e:
+                self.wfile.write('ERROR %s\n' % e)
+
+    def _arguments(self, arguments):
+        fmt = arguments[0].lower() if arguments else 'text'
+        if fmt not in FORMATS:
+            raise ValueError('unknown format %r' % fmt)
+        variant = arguments[1] if len(arguments) > 1 else \
+                  self.server.default_variant
+        if variant == 'guide':
+            variant = None
+        self.server.cache.snapshot(variant)
+        return fmt, variant
+
+    def _send_full(self, fmt, variant):
+        snapshot, encoded = self.server.encoded(variant, fmt)
+        if fmt == 'json':
+            self.wfile.write(json_frame(snapshot, encoded, True))
+        else:
+            self.wfile.write(encoded + '\n')
+        return snapshot
+
+    def _subscribe(self, fmt, variant, interval):
+        cache = self.server.cache
+        sent  = self._send_full(fmt, variant)
+        stale = sent.stale_keys()
+        while not self.server.stopping.is_set():
+            if self._closed():
+                return
+            # Woken by every snapshot and by shutdown.
+            snapshot = cache.wait(sent.version, None, variant)
+            if snapshot.version == sent.version:
+                continue
+            changed = self.server.changes(variant, fmt, sent, snapshot)
+            if fmt == 'json':
+                now       = time.time()
+                now_stale = snapshot.stale_keys(now)
+                if changed is not None or now_stale != stale:
+                    self.wfile.write(json_frame(snapshot, changed or '{}',
+                                                False, now))
+                stale = now_stale
+            elif changed is not None:
+                self.wfile.write(changed + '\n')
+            sent = snapshot
+            if interval > 0:
+                self.server.stopping.wait(interval)
+
+    def _closed(self):
+        """Whether the client closed the connection or sent QUIT."""
+        if not select.select([self.connection], [], [], 0)[0]:
+            return False
+        line = self.rfile.readline()
+        return not line or line.strip().upper() == 'QUIT'
+
+
+class KeywordServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    """Threaded server of the snapshots of a KeywordCache.
+
+    Attributes:
+        cache   -- Source of the keywords, may be set after the server is
+                   started -> KeywordCache
+        dump    -- Variant dumped as text to every connection, None for
+                   the request protocol -> str
+        default_variant -- Variant of requests that name none -> str
+        stopping        -- Set by shutdown, ends the subscriptions -> Event
+    """
+
+    daemon_threads      = True
+    allow_reuse_address = True
+    request_queue_size  = 128
+
+    def __init__(self, address, cache=None, dump=None, default_variant='H2RG'):
+        SocketServer.TCPServer.__init__(self, address, KeywordHandler)
+        self.cache    = cache
+        self.dump     = dump
+        self.default_variant = default_variant
+        self.stopping = threading.Event()
+        self._encoded = {}
+        self._changes = {}
+
+    def encoded(self, variant, fmt):
+        """(snapshot, its encoding) of the latest snapshot of variant. A
+        version is encoded once, by the first client asking for it."""
+        snapshot = self.cache.snapshot(variant)
+        cached = self._encoded.get((variant, fmt))
+        if cached is not None and cached[0].version == snapshot.version:
+            return snapshot, cached[1]
+        if fmt == 'json':
+            cached = snapshot, encode_json(snapshot)
+        else:
+            cached = snapshot, encode_text(snapshot)
+        self._encoded[(variant, fmt)] = cached
+        return cached
+
+    def changes(self, variant, fmt, sent, snapshot):
+        """Encoding of the keywords of snapshot that differ from sent, None
+        if none do. Subscribers at the same version share it."""
+        key    = (variant, fmt, sent.version)
+        cached = self._changes.get(key)
+        if cached is not None and cached[0].version == snapshot.version:
+            return cached[1]
+        changed = dict((name, snapshot[name]) for name in snapshot
+                       if name not in sent or snapshot[name] != sent[name])
+        if not changed:
+            encoded = None
+        elif fmt == 'json':
+            encoded = encode_json(changed)
+        else:
+            encoded = encode_text(changed)
+        if len(self._changes) > 64:
+            self._changes.clear()
+        self._changes[key] = snapshot, encoded
+        return encoded
+
+    def shutdown(self):
+        self.stopping.set()
+        if self.cache is not None:
+            self.cache.wake()
+        SocketServer.TCPServer.shutdown(self)
+
@@ -0,0 +1,133 @@
+"""
+.. module:: astrometry
+   :platform: Unix
+   :synopsis: Local hour angle, altitude, azimuth, parallactic angle and
+              airmass for arrays of times.
+
+Reading the altitude, azimuth, parallactic angle, airmass and hour angle
+from the TCS costs one INDI request each and gives one instant. They only
+depend on the pointing and the time, so given RA/Dec once they can be
+computed here for any number of times at once:
+
+    ephemeris = Ephemeris(ra, dec)             # J2000 degrees, from the TCS
+    sky = ephemeris.at(time.time())            # now
+    sky = ephemeris.at(start + 60*np.arange(600))   # the next ten hours
+    sky.altitude, sky.azimuth, sky.parallactic, sky.airmass, sky.ha
+
+All angles are in degrees, times are time.time() values. The coordinates
+are precessed from J2000 to the date to first order; nutation, aberration
+and refraction are ignored (well below an arcminute except for refraction
+near the horizon), which is plenty for derotation and FITS keywords.
+"""
+
+import collections
+
+import numpy as np
+
+# MRO 2.4m site, degrees (east longitude).
+LATITUDE  = 33.976667
+LONGITUDE = -107.189444
+
+# Julian date of the Unix epoch and of J2000.0.
+JD_UNIX  = 2440587.5
+JD_J2000 = 2451545.0
+
+Sky = collections.namedtuple('Sky', ['time', 'jd', 'lst', 'ha', 'altitude',
+                                     'azimuth', 'parallactic', 'airmass'])
+
+
+def julian_date(times):
+    """Julian dates of time.time() values."""
+    return JD_UNIX + np.asarray(times, dtype=float) / 86400.0
+
+
+def sidereal_time(times, longitude=LONGITUDE):
+    """Local mean sidereal time of time.time() values, in degrees."""
+    d = julian_date(times) - JD_J2000
+    t = d / 36525.0
+    gmst = 280.46061837 + 360.98564736629*d + 0.000387933*t*t - \
+           t*t*t / 38710000.0
+    return np.mod(gmst + longitude, 360.0)
+
+
+def precess(ra, dec, times):
+    """J2000 ra, dec precessed to the date of times, to first order.
+    Returns (ra, dec) in degrees."""
+    years = (julian_date(times) - JD_J2000) / 365.25
+    a = np.radians(ra)
+    d = np.radians(dec)
+    # Annual precession, m = 3.075 s and n = 20.04 arcsec.
+    m = 3.075*15.0 / 3600.0
+    n = 20.04 / 3600.0
+    return (ra + years*(m + n*np.sin(a)*np.tan(d)),
+            dec + years*n*np.cos(a))
+
+
+def altitude(ha, dec, latitude=LATITUDE):
+    """Altitude of a target at hour angle ha and declination dec."""
+    h   = np.radians(ha)
+    d   = np.radians(dec)
+    phi = np.radians(latitude)
+    return np.degrees(np.arcsin(np.sin(phi)*np.sin(d) +
+                                np.cos(phi)*np.cos(d)*np.cos(h)))
+
+
+def azimuth(ha, dec, latitude=LATITUDE):
+    """Azimuth of a target, from north through east, 0 to 360."""
+    h   = np.radians(ha)
+    d   = np.radians(dec)
+    phi = np.radians(latitude)
+    return np.mod(np.degrees(np.arctan2(
+        -np.cos(d)*np.sin(h),
+        np.sin(d)*np.cos(phi) - np.cos(d)*np.cos(h)*np.sin(phi))), 360.0)
+
+
+def parallactic_angle(ha, dec, latitude=LATITUDE):
+    """Parallactic angle of a target, -180 to 180, as
+    Telescope.parallactic_angle_manual but in the right quadrant."""
+    h   = np.radians(ha)
+    d   = np.radians(dec)
+    phi = np.radians(latitude)
+    return np.degrees(np.arctan2(np.sin(h), np.tan(phi)*np.cos(d) -
+                                 np.sin(d)*np.cos(h)))
+
+
+def airmass(alt):
+    """Airmass at altitude alt (Pickering 2002), finite down to the
+    horizon."""
+    alt = np.asarray(alt, dtype=float)
+    return 1.0 / np.sin(np.radians(alt + 244.0 / (165.0 + 47.0*np.maximum(
+        alt, 0.0)**1.1)))
+
+
+class Ephemeris(object):
+    """Position of one target on the sky of the site.
+
+    Attributes:
+        ra        -- J2000 right ascension, degrees -> float
+        dec       -- J2000 declination, degrees -> float
+        latitude  -- Site latitude, degrees -> float
+        longitude -- Site east longitude, degrees -> float
+    """
+
+    def __init__(self, ra, dec, latitude=LATITUDE, longitude=LONGITUDE):
+        self.ra        = ra
+        self.dec       = dec
+        self.latitude  = latitude
+        self.longitude = longitude
+
+    def at(self, times):
+        """Sky of the target at times, a time.time() value or an array of
+        them. Every field has the shape of times."""
+        times = np.asarray(times, dtype=float)
+        ra, dec = precess(self.ra, self.dec, times)
+        lst = sidereal_time(times, self.longitude)
+        ha  = np.mod(lst - ra + 180.0, 360.0) - 180.0
+        alt = altitude(ha, dec, self.latitude)
+        return Sky(times, julian_date(times), lst, ha, alt,
+                   azimuth(ha, dec, self.latitude),
+                   parallactic_angle(ha, dec, self.latitude), airmass(alt))
+
+    def dec_at(self, times):
+        """Declination of date at times."""
+        return precess(self.ra, self.dec, times)[1]
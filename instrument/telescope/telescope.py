@@ -1,10 +1,15 @@
 from math import sin, cos, tan, atan, degrees, radians 
+import time
 
+from astrometry import Ephemeris, LONGITUDE
 from indiclient import indiclient
 
 class Telescope(object):
     """Class that will represent a telescope."""
 
+    # Degrees per unit of the RA2K element, which is in hours.
+    ra_unit = 15.0
+
     def __init__(self, host, port):
         """
         Arguments:
@@ -12,6 +17,8 @@ class Telescope(object):
             port (int) -- indiclient port
         """
         self._indi = indiclient(host, port)
+        self._ephemeris      = None
+        self._ephemeris_time = 0.0
 
     def __del__(self):
         self._indi.quit()
@@ -104,6 +111,22 @@ class Telescope(object):
         #A constant taken from MRO's wiki page
         return 33.976667
 
+    @property
+    def longitude(self):
+        return LONGITUDE
+
+    def ephemeris(self, max_age=60.0):
+        """Ephemeris of the current pointing, to compute altitude, azimuth,
+        hour angle, parallactic angle and airmass locally for any times
+        (see astrometry.Ephemeris). RA and Dec are read from the TCS again
+        once the last read is older than max_age seconds."""
+        now = time.time()
+        if self._ephemeris is None or now - self._ephemeris_time > max_age:
+            self._ephemeris = Ephemeris(self.ra_unit*self.ra, self.dec,
+                                        self.latitude, self.longitude)
+            self._ephemeris_time = now
+        return self._ephemeris
+
     @property
     def julian_date(self):
         jul = self._indi.get_element(
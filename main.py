@@ -15,7 +15,6 @@ from os import makedirs, execl
 from os.path import isdir, join
 import signal
 import sys
-import SocketServer
 import traceback
 
 from configobj import ConfigObj
@@ -27,6 +26,8 @@ from wx.lib.agw import advancedsplash
 
 from gui.gui import MainNessiFrame
 from instrument.instrument import Instrument
+from instrument.keywordfile import KeywordFile
+from instrument.keywordserver import KeywordServer
 from gui.logtab.log import wxLogHandler, EVT_WX_LOG_EVENT
 from threadtools import run_async, shutdown
 
@@ -34,6 +35,7 @@ CONFIG_PATH        = 'nessisettings.ini'
 SPLASH_BITMAP_PATH = 'media/badass.png'
 HOST               = 'localhost'
 PORT               = 8989
+KEYWORD_PORT       = 8990
 
 def main(argv=None):
     """Run the entirety of the nessi software.
@@ -66,27 +68,22 @@ def main(argv=None):
     ################################################################
     cfg = ConfigObj(CONFIG_PATH)
 
-    #Socket Server for sending keywords
+    #Socket Servers for sending keywords
     #Note this section must be beffore SIGABRT, in order for socket
     #to be in the namespace of the SIGABRT closure.
+    #PORT dumps the H2RG keywords as text to every connection,
+    #KEYWORD_PORT answers GET/SUBSCRIBE requests (see keywordserver).
+    #Both serve the keyword cache once the instrument is built.
     ################################################################
-    class KeywordTCPHandler(SocketServer.StreamRequestHandler):
-        def handle(self):
-            logging.info("Dumping keywords to stream socket...")
-
-            keywords = instrument.keywordsH2RG
-            for key in keywords:
-                self.wfile.write("%s\t%s\n" % (key, keywords[key]))
-
-            logging.info("Socket closing...")
-
-    server = SocketServer.TCPServer((HOST, PORT), KeywordTCPHandler)
+    server        = KeywordServer((HOST, PORT), dump='H2RG')
+    keywordServer = KeywordServer((HOST, KEYWORD_PORT))
 
     @run_async(daemon=True)
-    def startServer():
+    def startServer(server):
         server.serve_forever()
     
-    startServer()
+    startServer(server)
+    startServer(keywordServer)
 
 
     #SIGABRT Handler setup (signaled by a "shutdown")
@@ -103,6 +100,7 @@ def main(argv=None):
         
         app.Destroy()
         server.shutdown()
+        keywordServer.shutdown()
         try:
             instrument.closeTelescope()
         finally:
@@ -139,27 +137,23 @@ def main(argv=None):
 
     signal.signal(signal.SIGINT, sigintHandler)
 
-    #SIGPOLL Will force python to write FITS headers to a FIFO
-    #So that OWL may use it
+    #SIGPOLL used to make NESSI write the FITS headers to a FIFO for
+    #OWL, which now reads them from the keyword file (see below).
+    #Ignored, so that an old OWL does not kill NESSI.
     ################################################################
-    def sigpollHandler(signum, frame):
-        #Not that keywords will attempt to read components that
-        #may be locked. Instrument must be "idle" for this to work
-        #without delay.
-        mkfifo('fitsFifo')
-
-        fitsKeywords = instrument.keywords
-
-        f = open('fitsFifo', 'w')
-        f.write(str(fitsKeywords))
-        f.close()
-    
-    signal.signal(signal.SIGPOLL, sigpollHandler)
+    signal.signal(signal.SIGPOLL, signal.SIG_IGN)
             
 
     #Build Instrument
     ################################################################
     instrument = buildInstrument(cfg)
+    server.cache = keywordServer.cache = instrument.keyword_cache
+
+    #Keep the FITS headers in a memory mapped file so that OWL may
+    #read them at any time (see instrument.keywordfile)
+    ################################################################
+    KeywordFile(cfg['general']['keyword file'],
+                instrument.keyword_cache).start()
     
     #Make main frame
     ################################################################
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""Latency of reading the FITS keywords from another process.
+
+Compares the previous SIGPOLL + FIFO exchange, where the reader signals
+NESSI, which writes str(keywords) to a FIFO, with KeywordReader reading the
+memory mapped file of KeywordFile. The NESSI side runs in a child process.
+In the keyword file case it publishes a new snapshot every --period-ms
+milliseconds, so a share of the reads meets a write in progress. Every
+snapshot carries one counter in all its values, and a read that sees two
+counters is torn.
+
+Run from the top of the NESSI tree:
+
+    python tools/bench_keyword_file.py
+"""
+import multiprocessing
+import optparse
+import os
+import signal
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'instrument'))
+
+from keywordcache import KeywordCache
+from keywordfile import KeywordFile, KeywordReader
+
+KEYS = ['KEY%02d' % i for i in range(35)]
+
+
+def keywords(count):
+    return dict((key, '%d' % count) for key in KEYS)
+
+
+def legacy_nessi(fifo, ready):
+    """The previous sigpollHandler, with the keywords already built."""
+    def handler(signum, frame):
+        os.mkfifo(fifo)
+        f = open(fifo, 'w')
+        f.write(str(keywords(0)))
+        f.close()
+    signal.signal(signal.SIGPOLL, handler)
+    ready.set()
+    while True:
+        signal.pause()
+
+
+def legacy_read(pid, fifo):
+    os.kill(pid, signal.SIGPOLL)
+    while not os.path.exists(fifo):
+        time.sleep(0)
+    f = open(fifo)
+    data = f.read()
+    f.close()
+    os.unlink(fifo)
+    return eval(data)
+
+
+def nessi(path, period, ready, stop):
+    count = [0]
+    def source():
+        count[0] += 1
+        return keywords(count[0])
+    cache = KeywordCache()
+    cache.add('all', source, KEYS, period)
+    cache.start()
+    writer = KeywordFile(path, cache).start()
+    ready.set()
+    stop.wait()
+    writer.stop()
+    cache.stop()
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return [1e6*latencies[min(int(p*len(latencies)), len(latencies) - 1)]
+            for p in (0.5, 0.99, 1.0)]
+
+
+def main():
+    parser = optparse.OptionParser(usage='%prog [options]')
+    parser.add_option('--legacy-reads', type='int', default=500)
+    parser.add_option('--reads', type='int', default=100000)
+    parser.add_option('--period-ms', type='float', default=1.0,
+                      help='Snapshot period of the keyword file writer')
+    options, args = parser.parse_args()
+    directory = tempfile.mkdtemp()
+
+    fifo  = os.path.join(directory, 'fitsFifo')
+    ready = multiprocessing.Event()
+    child = multiprocessing.Process(target=legacy_nessi, args=(fifo, ready))
+    child.start()
+    ready.wait()
+    latencies = []
+    for i in range(options.legacy_reads):
+        start = time.time()
+        legacy_read(child.pid, fifo)
+        latencies.append(time.time() - start)
+    child.terminate()
+    child.join()
+    print '%-22s %10s %10s %10s %8s' % ('', 'p50 us', 'p99 us', 'max us',
+                                        'torn')
+    print '%-22s %10.1f %10.1f %10.1f %8s' % (
+        ('SIGPOLL + FIFO',) + tuple(percentiles(latencies)) + ('-',))
+
+    path  = os.path.join(directory, 'keywords')
+    ready = multiprocessing.Event()
+    stop  = multiprocessing.Event()
+    child = multiprocessing.Process(target=nessi, args=(
+        path, options.period_ms / 1000.0, ready, stop))
+    child.start()
+    ready.wait()
+    reader = KeywordReader(path)
+    for name, read in (('KeywordReader.read', reader.read),
+                       ('KeywordReader.read_raw', reader.read_raw)):
+        latencies, torn, sequences = [], 0, set()
+        for i in range(options.reads):
+            start = time.time()
+            snapshot = read()
+            latencies.append(time.time() - start)
+            sequences.add(snapshot[0])
+            if name == 'KeywordReader.read':
+                torn += len(set(snapshot[3].values())) != 1
+            else:
+                torn += len(set(snapshot[3].split()[1::2])) != 1
+        print '%-22s %10.1f %10.1f %10.1f %8d' % (
+            (name,) + tuple(percentiles(latencies)) + (torn,))
+    print
+    print '%d snapshots seen by %d reads, one written every %g ms' % (
+        len(sequences), options.reads, options.period_ms)
+    reader.close()
+    stop.set()
+    child.join()
+    os.unlink(path)
+    os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
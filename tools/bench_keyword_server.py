@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+"""Load benchmark of the keyword socket.
+
+Many clients at once ask for the keywords of:
+
+- legacy: the previous single threaded TCPServer, which built the
+  keywords for every connection. The hardware reads of that build are
+  stood in for by a sleep of --build-ms.
+- dump: KeywordServer in the mode of the old port, one text dump per
+  connection, from the snapshots of a KeywordCache.
+- get: KeywordServer, GET json requests on one connection per client.
+
+It then measures how long SUBSCRIBE clients take to receive each change
+of the keywords after the cache published it.
+
+Run from the top of the NESSI tree:
+
+    python tools/bench_keyword_server.py [--clients 1,10,50]
+"""
+import optparse
+import os
+import socket
+import SocketServer
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'instrument'))
+
+from keywordcache import KeywordCache
+from keywordserver import KeywordServer, read_frame
+
+# A header of the size of Instrument.keywords.
+CONSTANTS = dict(('KEY%02d' % i, 'value %d' % i) for i in range(28))
+SKY       = ('AIRMASS', 'TELALT', 'TELAZ', 'PA', 'JD')
+
+
+def build_cache(period):
+    count = [0]
+    def sky():
+        count[0] += 1
+        return dict((key, 1.0 + 0.001*count[0]) for key in SKY)
+    cache = KeywordCache()
+    cache.constant(CONSTANTS)
+    cache.constant({'RA' : 5.5, 'DEC' : 20.0})
+    cache.variant('H2RG', {'CRPIX1' : 1024.0, 'CRPIX2' : 1024.0})
+    cache.add('sky', sky, SKY, period)
+    return cache.start()
+
+
+def legacy_server(cache, build):
+    """The previous server: one client at a time, keywords built per
+    connection."""
+    class KeywordTCPHandler(SocketServer.StreamRequestHandler):
+        def handle(self):
+            time.sleep(build)
+            keywords = dict(cache.snapshot('H2RG'))
+            for key in keywords:
+                self.wfile.write("%s\t%s\n" % (key, keywords[key]))
+    class LegacyServer(SocketServer.TCPServer):
+        allow_reuse_address = True
+        def handle_error(self, request, client_address):
+            pass    # clients that gave up, counted by the clients
+    return LegacyServer(('localhost', 0), KeywordTCPHandler)
+
+
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+
+def dump_client(address, requests, latencies, errors):
+    for i in range(requests):
+        start = time.time()
+        try:
+            sock = socket.create_connection(address, 30)
+            data = ''
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+            sock.close()
+        except socket.error:
+            errors.append(1)
+            continue
+        latencies.append(time.time() - start)
+
+
+def get_client(address, requests, latencies, errors):
+    try:
+        sock = socket.create_connection(address, 30)
+    except socket.error:
+        errors.append(1)
+        return
+    rfile = sock.makefile('rb')
+    for i in range(requests):
+        start = time.time()
+        sock.sendall('GET json\n')
+        if read_frame(rfile, 'json') is None:
+            errors.append(1)
+            break
+        latencies.append(time.time() - start)
+    sock.sendall('QUIT\n')
+    rfile.close()
+    sock.close()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(int(p*len(values)), len(values) - 1)] if values else 0
+
+
+def load(address, client, clients, requests):
+    latencies, errors = [], []
+    threads = [threading.Thread(target=client, args=(address, requests,
+                                                     latencies, errors))
+               for i in range(clients)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+    return len(latencies) / elapsed, latencies, len(errors)
+
+
+def subscribers(address, count, duration):
+    """Delays between the publication of a snapshot and its reception by
+    count SUBSCRIBE json clients."""
+    delays = []
+    def subscriber():
+        sock  = socket.create_connection(address, 30)
+        rfile = sock.makefile('rb')
+        sock.sendall('SUBSCRIBE json\n')
+        read_frame(rfile, 'json')
+        end = time.time() + duration
+        while time.time() < end:
+            frame = read_frame(rfile, 'json')
+            delays.append(time.time() - frame['time'])
+        sock.sendall('QUIT\n')
+        rfile.close()
+        sock.close()
+    threads = [threading.Thread(target=subscriber) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return delays
+
+
+def main():
+    parser = optparse.OptionParser(usage='%prog [options]')
+    parser.add_option('--clients', default='1,10,50',
+                      help='Concurrent clients, comma separated')
+    parser.add_option('--requests', type='int', default=5,
+                      help='Requests per client')
+    parser.add_option('--build-ms', type='float', default=10.0,
+                      help='Hardware reads of a legacy keywords build')
+    parser.add_option('--subscribers', type='int', default=100)
+    options, args = parser.parse_args()
+
+    cache  = build_cache(0.1)
+    legacy = legacy_server(cache, options.build_ms / 1000.0)
+    dump   = KeywordServer(('localhost', 0), cache, dump='H2RG')
+    get    = KeywordServer(('localhost', 0), cache)
+    for server in (legacy, dump, get):
+        serve(server)
+
+    print '%d requests per client, legacy build %.0f ms' % (
+        options.requests, options.build_ms)
+    print '%-8s %8s %10s %10s %10s %7s' % ('server', 'clients', 'req/s',
+                                           'p50 ms', 'p99 ms', 'errors')
+    for clients in [int(c) for c in options.clients.split(',')]:
+        for name, server, client in (('legacy', legacy, dump_client),
+                                     ('dump', dump, dump_client),
+                                     ('get', get, get_client)):
+            rate, latencies, errors = load(server.server_address, client,
+                                           clients, options.requests)
+            print '%-8s %8d %10.0f %10.2f %10.2f %7d' % (
+                name, clients, rate, 1000*percentile(latencies, 0.5),
+                1000*percentile(latencies, 0.99), errors)
+
+    delays = subscribers(get.server_address, options.subscribers, 2.0)
+    print
+    print '%d subscribers, a change every 100 ms: %d frames, delay p50 ' \
+          '%.2f ms, p99 %.2f ms' % (options.subscribers, len(delays),
+                                    1000*percentile(delays, 0.5),
+                                    1000*percentile(delays, 0.99))
+
+    for server in (legacy, dump, get):
+        server.shutdown()
+    cache.stop()
+
+
+if __name__ == '__main__':
+    main()
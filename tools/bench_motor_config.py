@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""Microbenchmark of the switch test in the wheel and FPA loops.
+
+Compares reading a switch the way the loops of newport used to, with a
+bit string built per GPIO4.DI word, with the compiled Switch of
+motorconfig, for every switch of nessisettings.ini. The "setup" column
+adds the ConfigObj lookups and int() parsing each motion function did
+before its loop, which the compiled settings also remove.
+
+Run from the top of the NESSI tree:
+
+    python tools/bench_motor_config.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'instrument', 'actuators'))
+
+from configobj import ConfigObj
+
+from motorconfig import SWITCHES, compile_motors
+
+NUMBER = 100000
+
+# GPIO4.DI words as read during a wheel search.
+WORDS = [0x0000, 0x0102, 0x05ff, 0x0700]
+
+
+def legacy_setup(cfg, motor, switch):
+    """Bit and value as previously read at the start of each function."""
+    return int(cfg[motor][switch]["bit"]), int(cfg[motor][switch]["val"])
+
+
+def legacy_test(bit, val, word):
+    """The test previously inlined in the loops."""
+    return int(format(word, "016b")[::-1][bit]) == val
+
+
+def main():
+    cfg    = ConfigObj(infile="nessisettings.ini")
+    motors = compile_motors(cfg)
+    cases  = [(motor, switch) for motor in sorted(motors)
+              for switch in SWITCHES
+              if getattr(motors[motor], switch) is not None]
+
+    print 'Per GPIO4.DI word tested, setup per function call'
+    print '%-20s %12s %12s %8s %12s %12s' % ('switch', 'legacy', 'compiled',
+                                            'speedup', 'legacy setup',
+                                            'compiled')
+    for motor, name in cases:
+        bit, val = legacy_setup(cfg, motor, name)
+        switch   = getattr(motors[motor], name)
+        for word in WORDS:
+            assert legacy_test(bit, val, word) == switch.test(word)
+        legacy = timeit.timeit(
+            lambda: [legacy_test(bit, val, w) for w in WORDS],
+            number=NUMBER // len(WORDS))
+        compiled = timeit.timeit(
+            lambda: [switch.test(w) for w in WORDS],
+            number=NUMBER // len(WORDS))
+        legacy_s = timeit.timeit(lambda: legacy_setup(cfg, motor, name),
+                                 number=NUMBER)
+        compiled_s = timeit.timeit(lambda: getattr(motors[motor], name),
+                                   number=NUMBER)
+        print '%-20s %9.2f us %9.2f us %7.1fx %9.2f us %9.2f us' % (
+            motor + '.' + name, 1e6 * legacy / NUMBER,
+            1e6 * compiled / NUMBER, legacy / compiled,
+            1e6 * legacy_s / NUMBER, 1e6 * compiled_s / NUMBER)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""Startup benchmark of the XPS driver.
+
+Compares importing XPS_C8_drivers with every command written out as a
+method against the signature table version of the working tree: import
+time, resident memory added by the import, and the cost of the commands
+NESSI uses on first call. The written out driver is taken from git, by
+default from the parent of the commit that introduced the signature
+table. Every measure runs in a fresh interpreter, after a first import has
+written the .pyc files.
+
+Run from the top of the NESSI tree:
+
+    python tools/bench_xps_import.py [revision]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+TOP     = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DRIVER  = 'instrument/actuators/XPS_C8_drivers.py'
+MODULES = ('XPS_C8_drivers.py', 'xpsstats.py')
+REPEAT  = 15
+
+# Commands called by the instrument, looked up after the import.
+USED = ['GroupInitialize', 'GroupHomeSearch', 'GroupKill', 'GroupMoveAbort',
+        'GroupMoveAbsolute', 'GroupMoveRelative', 'GroupPositionCurrentGet',
+        'GroupStatusGet', 'GroupVelocityCurrentGet', 'GroupJogModeEnable',
+        'GroupJogModeDisable', 'GroupJogParametersSet', 'GroupSpinParametersSet',
+        'GroupSpinModeStop', 'GPIODigitalGet', 'PositionerSGammaParametersGet',
+        'PositionerSGammaParametersSet', 'ErrorStringGet', 'KillAll',
+        'EventExtendedConfigurationTriggerSet',
+        'EventExtendedConfigurationActionSet', 'EventExtendedStart',
+        'EventExtendedRemove', 'TCLScriptExecuteAndWait',
+        'MultipleAxesPVTVerification', 'MultipleAxesPVTExecution']
+
+# Run in the child interpreter: prints import seconds, import kB and first
+# use seconds of the driver in sys.argv[1].
+PROBE = r'''
+import os, sys, time
+def rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024.0
+sys.path.insert(0, sys.argv[1])
+before = rss()
+start = time.time()
+import XPS_C8_drivers as xps
+imported = time.time() - start
+memory = rss() - before
+start = time.time()
+for name in sys.argv[2:]:
+    getattr(xps.XPS, name)
+print imported, memory, time.time() - start
+'''
+
+
+def git(*args):
+    return subprocess.check_output(('git',) + args, cwd=TOP)
+
+
+def baseline():
+    """Parent of the commit that introduced the signature table."""
+    commit = git('log', '-1', '--format=%h', '-S_COMMANDS = ', '--', DRIVER)
+    return commit.strip() + '^'
+
+
+def checkout(revision, directory):
+    for name in MODULES:
+        path = 'instrument/actuators/' + name
+        if revision is None:
+            shutil.copy(os.path.join(TOP, path), directory)
+        else:
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(git('show', '%s:%s' % (revision, path)))
+
+
+def probe(directory):
+    output = subprocess.check_output([sys.executable, '-c', PROBE,
+                                      directory] + USED)
+    return [float(field) for field in output.split()]
+
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+
+def measure(directory):
+    probe(directory)
+    runs = [probe(directory) for i in range(REPEAT)]
+    return [median(column) for column in zip(*runs)]
+
+
+def main():
+    revision = sys.argv[1] if len(sys.argv) > 1 else baseline()
+    results = []
+    for label, source in (('written out (%s)' % revision, revision),
+                          ('signature table', None)):
+        directory = tempfile.mkdtemp(prefix='bench_xps_import')
+        try:
+            checkout(source, directory)
+            results.append((label, measure(directory)))
+        finally:
+            shutil.rmtree(directory)
+
+    print 'Median of %d imports, %d commands looked up after each' % (
+        REPEAT, len(USED))
+    print '%-40s %10s %10s %12s' % ('driver', 'import ms', 'import kB',
+                                    'lookup ms')
+    for label, (imported, memory, lookup) in results:
+        print '%-40s %10.2f %10.0f %12.2f' % (label, 1e3 * imported, memory,
+                                              1e3 * lookup)
+
+
+if __name__ == '__main__':
+    main()
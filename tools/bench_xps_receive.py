@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""Benchmark of XPS reply reception on multi-kilobyte replies.
+
+Compares the legacy recv(1024) / string concatenation / find-from-start
+loop with the per-socket _ReceiveBuffer, on replies shaped like
+GatheringDataMultipleLinesGet output. A local socket pair stands in for
+the controller.
+
+Run from the top of the NESSI tree:
+
+    python tools/bench_xps_receive.py
+"""
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'instrument', 'actuators'))
+
+import XPS_C8_drivers as xps
+
+REPEAT = 20
+SIZES  = [4, 16, 64, 256]     # reply sizes in kB
+
+
+def gathering_reply(kbytes):
+    line = '12.345678;0.123456;-0.000012\n'
+    data = line * (kbytes * 1024 / len(line))
+    return '0,' + data + ',EndOfAPI'
+
+
+def legacy_receive(sock):
+    """The reception loop previously in XPS.__sendAndReceive."""
+    ret = sock.recv(1024)
+    while (ret.find(',EndOfAPI') == -1):
+        ret += sock.recv(1024)
+    for i in range(len(ret)):
+        if (ret[i] == ','):
+            return [int(ret[0:i]), ret[i+1:-9]]
+
+
+def buffered_receive(sock, buffer):
+    [reply] = buffer.receive(sock)
+    return xps._splitReply(reply)
+
+
+def serve(sock, reply, count):
+    for i in range(count):
+        sock.recv(1)
+        sock.sendall(reply)
+
+
+def bench(receive, reply):
+    server, client = socket.socketpair()
+    writer = threading.Thread(target=serve, args=(server, reply, REPEAT))
+    writer.start()
+    start = time.time()
+    for i in range(REPEAT):
+        client.sendall('?')
+        result = receive(client)
+    elapsed = time.time() - start
+    writer.join()
+    server.close()
+    client.close()
+    assert result[0] == 0 and len(result[1]) == len(reply) - 11
+    return elapsed / REPEAT
+
+
+def main():
+    print '%-8s %12s %12s %8s' % ('reply', 'legacy', 'buffer', 'speedup')
+    for kbytes in SIZES:
+        reply  = gathering_reply(kbytes)
+        buffer = xps._ReceiveBuffer()
+        legacy = bench(legacy_receive, reply)
+        new    = bench(lambda sock: buffered_receive(sock, buffer), reply)
+        print '%5d kB %9.2f ms %9.2f ms %7.1fx' % (
+            kbytes, 1e3 * legacy, 1e3 * new, legacy / new)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Microbenchmark of XPS reply decoding.
+
+Compares the legacy character scanning / eval() parser that every method of
+XPS_C8_drivers used to carry with the signature driven _ReplyDecoder, on the
+replies that dominate wheel searches, FPA limit loops and status reads.
+
+Run from the top of the NESSI tree:
+
+    python tools/bench_xps_reply.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'instrument', 'actuators'))
+
+import XPS_C8_drivers as xps
+
+NUMBER = 20000
+
+# (command, output signature, reply as returned by __sendAndReceive)
+CASES = [
+    ('GPIODigitalGet', ('unsigned short',), '1021'),
+    ('GroupPositionCurrentGet', ('double',), '-12.3456789012'),
+    ('GroupVelocityCurrentGet', ('double',), '0'),
+    ('PositionerSGammaParametersGet', ('double',) * 4,
+     '10,200,0.005,0.05'),
+    ('ControllerMotionKernelTimeLoadGet', ('double',) * 4,
+     '0.312,0.0451,0.117,0.8764'),
+    ('GroupJogParametersGet', ('double',) * 6,
+     '1.25,400,-0.5,400,0,200'),
+]
+
+
+def legacy_parse(error, returnedString, nbParam):
+    """The parser previously inlined in every XPS method."""
+    i, j, retList = 0, 0, [error]
+    for paramNb in range(nbParam):
+        while ((i+j) < len(returnedString) and returnedString[i+j] != ','):
+            j += 1
+        retList.append(eval(returnedString[i:i+j]))
+        i, j = i+j+1, 0
+    return retList
+
+
+def bench(name, signature, reply):
+    decoder = xps._replyDecoder(signature)
+    legacy = timeit.timeit(lambda: legacy_parse(0, reply, len(signature)),
+                           number=NUMBER)
+    decoded = timeit.timeit(lambda: xps._replyDecoder(signature)(0, reply),
+                            number=NUMBER)
+    assert legacy_parse(0, reply, len(signature)) == decoder(0, reply)
+    print '%-36s %9.2f us %9.2f us %7.1fx' % (
+        name, 1e6 * legacy / NUMBER, 1e6 * decoded / NUMBER, legacy / decoded)
+
+
+def main():
+    print '%-36s %12s %12s %8s' % ('command', 'legacy', 'decoder', 'speedup')
+    for name, signature, reply in CASES:
+        bench(name, signature, reply)
+
+
+if __name__ == '__main__':
+    main()
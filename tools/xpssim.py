@@ -0,0 +1,854 @@
+#!/usr/bin/env python
+"""Local simulator of the Newport XPS-C8 motion controller.
+
+Speaks the controller's TCP protocol (Command(arguments) in,
+error,returns,EndOfAPI out) so that newport.py, the dewar wheels, the
+k-mirror and the FPA focus code can run against a laptop instead of the
+controller at 10.90.20.1. The groups, GPIO4.DI switch bits and directions
+are read from nessisettings.ini:
+
+    wheels      Detents every SLOT_PITCH degrees drive the position bit,
+                every slots-th detent also drives the home bit.
+    array       The lower and upper limit bits close at either end of
+                FPA_TRAVEL degrees of motor travel.
+    others      Plain positioners (the k-mirror).
+
+Each group moves at constant velocity (the SGamma velocity for moves, the
+commanded one for jog and spin). Moves block their socket until done, like
+the controller. Home searches re-reference a group where it stands, so a
+wheel starts wherever its seeded initial position put it and has to find
+its own way home. Extended events on a switch edge with a MoveAbort action
+and controller-side gathering are simulated as well.
+
+Run it from the top of the NESSI tree and point the instrument at it:
+
+    python tools/xpssim.py --port 5001 --latency 2 --speedup 10
+
+or start it from a benchmark:
+
+    sim = XPSSimulator(latency=0.002)
+    host, port = sim.start()
+    ...
+    sim.stop()
+
+Only the commands the instrument uses are implemented; anything else is
+answered with error -8. TCL scripts cannot be interpreted, so the scripts
+shipped in instrument/actuators/tcl are mirrored by Python methods (see
+SimController.scripts).
+"""
+import bisect
+import math
+import optparse
+import random
+import socket
+import SocketServer
+import threading
+import time
+
+from configobj import ConfigObj
+
+# Degrees between two wheel detents.  Two fast moves of newport.WHEEL_GAP
+# leave the wheel short of the next detent, as on the real wheels.
+SLOT_PITCH = 720.0
+
+# Half width of a detent, in degrees.  At the 30 deg/s search speed the
+# position switch stays closed for 0.2 s, two polls of wheelcheck.
+DETENT = 3.0
+
+# Motor travel between the FPA limit switches, and the hard stops beyond.
+FPA_TRAVEL  = 9000.0
+FPA_OVERRUN = 50.0
+
+# Degrees a MoveAbort event lets a group run past the switch edge that fired
+# it, so the group stops with the switch closed as the real ones do.
+EVENT_OVERRUN = 0.05
+
+# Error codes returned by the simulator.
+ERRORS = {
+    0:   'Successful command',
+    -8:  'Unknown command or wrong number of parameters',
+    -17: 'Parameter out of range or incorrect',
+    -19: 'Group or positioner name does not exist',
+    -22: 'Not allowed action',
+    -27: 'Move Aborted',
+    -30: 'Gathering not configured',
+    -31: 'Gathering running',
+    -110: 'Extended event configuration incomplete',
+}
+
+# GroupStatusGet codes of the simulated states.
+STATUS = {
+    'notinit': 7,
+    'notref':  42,
+    'ready':   12,
+    'move':    44,
+    'jog':     47,
+    'spin':    80,
+}
+
+
+class _Detent(object):
+    """A switch closed within DETENT of every pitch-th degree (every
+    pitch*slots-th for a home switch)."""
+
+    def __init__(self, pitch, width, every=None):
+        self.pitch = pitch
+        self.width = width
+        self.every = every
+
+    def _centre(self, k):
+        return self.every is None or k % self.every == 0
+
+    def active(self, p):
+        k = int(round(p / self.pitch))
+        return self._centre(k) and abs(p - k*self.pitch) <= self.width
+
+    def edge(self, p, sign, closing):
+        """Distance travelled from p in direction sign until the switch
+        closes (closing) or opens."""
+        span = (self.every or 1) + 2
+        k0   = int(math.floor(p / self.pitch))
+        for i in range(-1, span + 1):
+            k = k0 + sign*i
+            if not self._centre(k):
+                continue
+            bound = k*self.pitch - sign*self.width*(1 if closing else -1)
+            if (bound - p)*sign > 0:
+                return abs(bound - p)
+        return None
+
+
+class _Limit(object):
+    """A switch closed over the interval [lo, hi] of positions."""
+
+    def __init__(self, lo, hi):
+        self.lo = lo
+        self.hi = hi
+
+    def active(self, p):
+        return self.lo <= p <= self.hi
+
+    def edge(self, p, sign, closing):
+        bounds = [self.lo, self.hi] if sign > 0 else [self.hi, self.lo]
+        for bound in bounds:
+            if (bound - p)*sign > 0 and (bound == bounds[0]) == closing:
+                return abs(bound - p)
+        return None
+
+
+class _ScriptEnd(Exception):
+    """Ends a simulated TCL script with its result string."""
+
+
+class _Switch(object):
+    """A GPIO4.DI bit driven by the physical position of a group."""
+
+    def __init__(self, group, bit, val, shape):
+        self.group = group
+        self.bit   = bit
+        self.val   = val
+        self.shape = shape
+
+
+class SimGroup(object):
+    """One single positioner group.
+
+    Its motion is kept as a list of constant velocity segments (start,
+    position, velocity, stop) in motor units, so positions can be read at
+    any past time for gathering.  The physical position, which drives the
+    switches, is the motor position plus offset.
+    """
+
+    def __init__(self, name, positioner, physical=0.0, travel=None):
+        self.name       = name
+        self.positioner = positioner
+        self.offset     = physical
+        self.travel     = travel
+        self.profile    = [200.0, 800.0, 0.005, 0.05]
+        self.state      = 'notinit'
+        self.segments   = [(0.0, 0.0, 0.0, None)]
+        self.aborted    = False
+
+    def _segment(self, t):
+        i = bisect.bisect_right(self.segments, (t, float('inf'))) - 1
+        return self.segments[max(i, 0)]
+
+    def position(self, t):
+        start, p, v, stop = self._segment(t)
+        end = t if stop is None else min(t, stop)
+        p  += v*max(end - start, 0.0)
+        if self.travel is not None:
+            lo, hi = self.travel
+            p = min(max(p + self.offset, lo), hi) - self.offset
+        return p
+
+    def velocity(self, t):
+        start, p, v, stop = self._segment(t)
+        return v if stop is None or t < stop else 0.0
+
+    def physical(self, t):
+        return self.position(t) + self.offset
+
+    def stop_time(self):
+        return self.segments[-1][3]
+
+    def settle(self, t):
+        """Ends a move or an aborted spin whose stop time has passed."""
+        stop = self.stop_time()
+        if self.state in ('move', 'spin') and stop is not None and t >= stop:
+            self.state = 'ready'
+
+    def run(self, t, v, stop=None):
+        """Starts a constant velocity segment at t, dropping any planned
+        segments after t."""
+        p = self.position(t)
+        while len(self.segments) > 1 and self.segments[-1][0] > t:
+            self.segments.pop()
+        start, p0, v0, stop0 = self.segments[-1]
+        if stop0 is None or stop0 > t:
+            self.segments[-1] = (start, p0, v0, t)
+        self.segments.append((t, p, v, stop))
+
+    def halt(self, t):
+        self.run(t, 0.0)
+
+    def forget(self, before):
+        """Drops segments that ended before time before."""
+        while len(self.segments) > 1 and self.segments[1][0] <= before:
+            self.segments.pop(0)
+
+
+class SimController(object):
+    """State and command set of the simulated controller.
+
+    Attributes:
+        groups   -- SimGroup by group name -> dict
+        switches -- _Switch by GPIO4.DI bit -> dict
+        speedup  -- Simulated seconds per real second -> float
+        files    -- Contents of files stored on the controller (trajectory
+                    files), by file name -> dict
+    """
+
+    def __init__(self, config='nessisettings.ini', speedup=1.0, seed=0):
+        self.speedup  = float(speedup)
+        self.groups   = {}
+        self.switches = {}
+        self.lock     = threading.Condition()
+        self._epoch   = time.time()
+        self._random  = random.Random(seed)
+        self._trigger = None
+        self._action  = None
+        self._events  = {}
+        self._next_id = 1
+        self._gather  = None
+        self.files    = {}
+        self._load(ConfigObj(config))
+
+    def _load(self, cfg):
+        for name, section in cfg.items():
+            if not isinstance(section, dict) or 'group' not in section:
+                continue
+            direction = int(section.get('direction', 1))
+            group = section['group']
+            if 'slots' in section:
+                # Wheels start somewhere between two detents.
+                start = SLOT_PITCH*(self._random.randrange(16) +
+                                    self._random.uniform(0.1, 0.9))
+                self.groups[group] = SimGroup(group, section['positioner'],
+                                              start)
+                self._switch(group, section['position'],
+                             _Detent(SLOT_PITCH, DETENT))
+                self._switch(group, section['home'],
+                             _Detent(SLOT_PITCH, DETENT, int(section['slots'])))
+            elif 'lower' in section:
+                # Travel is measured up from the lower limit switch and
+                # mapped onto the motor by its direction.
+                def span(lo, hi):
+                    return sorted([direction*lo, direction*hi])
+                self.groups[group] = SimGroup(
+                    group, section['positioner'], direction*FPA_TRAVEL/2,
+                    span(-FPA_OVERRUN, FPA_TRAVEL + FPA_OVERRUN))
+                lower = _Limit(*span(-FPA_OVERRUN, 0.0))
+                upper = _Limit(*span(FPA_TRAVEL, FPA_TRAVEL + FPA_OVERRUN))
+                self._switch(group, section['lower'], lower)
+                self._switch(group, section['upper'], upper)
+                if 'home' in section:
+                    self._switch(group, section['home'], lower)
+            else:
+                self.groups[group] = SimGroup(group, section['positioner'])
+
+    def _switch(self, group, section, shape):
+        bit = int(section['bit'])
+        self.switches[bit] = _Switch(group, bit, int(section['val']), shape)
+
+    def now(self):
+        """Simulated seconds since start."""
+        return (time.time() - self._epoch)*self.speedup
+
+    def wait(self, t):
+        """Waits, with the lock held, until simulated time t."""
+        remaining = t - self.now()
+        if remaining > 0:
+            self.lock.wait(remaining/self.speedup)
+
+    def gpio(self, t):
+        word = 0
+        for bit, switch in self.switches.items():
+            group  = self.groups[switch.group]
+            closed = switch.shape.active(group.physical(t))
+            if (switch.val if closed else 1 - switch.val):
+                word |= 1 << bit
+        return word
+
+    def execute(self, name, args):
+        """Runs one command and returns (error, returned string)."""
+        command = getattr(self, 'do_' + name, None)
+        if command is None:
+            return -8, ''
+        with self.lock:
+            t = self.now()
+            self._forget(t)
+            for group in self.groups.values():
+                group.settle(t)
+            try:
+                return command(t, *args)
+            except (TypeError, ValueError):
+                return -8, ''
+            except KeyError:
+                return -19, ''
+
+    # Motion
+    ################################################################
+    def _start(self, group, t, v, stop=None):
+        """Starts group at velocity v until stop, cut short by any armed
+        MoveAbort event on one of its switches."""
+        group.aborted = False
+        if v != 0:
+            sign = 1 if v > 0 else -1
+            p = group.physical(t)
+            for trigger, action in self._events.values():
+                edge, bit = trigger
+                switch = self.switches.get(bit)
+                if action != group.name + '.MoveAbort' or switch is None or \
+                   switch.group != group.name:
+                    continue
+                closing = (edge == 'DIHighLow') == (switch.val == 0)
+                distance = switch.shape.edge(p, sign, closing)
+                if distance is None:
+                    continue
+                fire = t + (distance + EVENT_OVERRUN)/abs(v)
+                if stop is None or fire < stop:
+                    stop = fire
+                    group.aborted = True
+        group.run(t, v, stop)
+        self.lock.notify_all()
+
+    def _move(self, t, group, displacement):
+        if group.state != 'ready':
+            return -22, ''
+        v = group.profile[0]
+        if displacement < 0:
+            v = -v
+        stop = t + abs(displacement)/group.profile[0]
+        self._start(group, t, v if displacement else 0.0, stop)
+        group.state = 'move'
+        segment = group.segments[-1]
+        while group.segments[-1] is segment and self.now() < segment[3]:
+            self.wait(segment[3])
+        if group.segments[-1] is not segment or group.aborted:
+            if group.state == 'move':
+                group.state = 'ready'
+            return -27, ''
+        group.state = 'ready'
+        return 0, ''
+
+    def _trajectory(self, name):
+        """Segments (duration, displacement, end velocity) of a trajectory
+        file."""
+        rows = []
+        for line in self.files[name].splitlines():
+            if line.strip():
+                rows.append([float(x) for x in line.split(',')])
+        return rows
+
+    def do_MultipleAxesPVTVerification(self, t, name, filename):
+        self.groups[name]
+        try:
+            rows = self._trajectory(filename)
+        except (KeyError, ValueError):
+            return -17, ''
+        if not rows or min(row[0] for row in rows) <= 0:
+            return -17, ''
+        return 0, ''
+
+    def do_MultipleAxesPVTExecution(self, t, name, filename, count):
+        """Runs the trajectory with each segment at its mean velocity."""
+        group = self.groups[name]
+        if group.state != 'ready':
+            return -22, ''
+        rows = self._trajectory(filename) * int(count)
+        group.halt(t)
+        p, start = group.position(t), t
+        for duration, displacement, velocity in rows:
+            group.segments.append((start, p, displacement/duration,
+                                   start + duration))
+            p, start = p + displacement, start + duration
+        group.segments.append((start, p, 0.0, None))
+        group.state = 'move'
+        self.lock.notify_all()
+        segment = group.segments[-1]
+        while group.segments[-1] is segment and self.now() < start:
+            self.wait(start)
+        if group.segments[-1] is not segment:
+            if group.state == 'move':
+                group.state = 'ready'
+            return -27, ''
+        group.state = 'ready'
+        return 0, ''
+
+    def do_GroupMoveRelative(self, t, name, displacement):
+        return self._move(t, self.groups[name], float(displacement))
+
+    def do_GroupMoveAbsolute(self, t, name, position):
+        group = self.groups[name]
+        return self._move(t, group, float(position) - group.position(t))
+
+    def do_GroupKill(self, t, name):
+        group = self.groups[name]
+        group.halt(t)
+        group.state = 'notinit'
+        self.lock.notify_all()
+        return 0, ''
+
+    def do_KillAll(self, t):
+        for name in self.groups:
+            self.do_GroupKill(t, name)
+        return 0, ''
+
+    def do_GroupMoveAbort(self, t, name):
+        group = self.groups[name]
+        if group.state not in ('move', 'spin', 'jog'):
+            return -22, ''
+        group.halt(t)
+        group.state = 'ready' if group.state != 'jog' else 'jog'
+        self.lock.notify_all()
+        return 0, ''
+
+    def do_GroupInitialize(self, t, name):
+        group = self.groups[name]
+        if group.state != 'notinit':
+            return -22, ''
+        group.state = 'notref'
+        return 0, ''
+
+    def do_GroupHomeSearch(self, t, name):
+        group = self.groups[name]
+        if group.state != 'notref':
+            return -22, ''
+        # The reference is taken where the group stands.
+        group.offset = group.physical(t)
+        group.segments = [(t, 0.0, 0.0, None)]
+        group.state = 'ready'
+        return 0, ''
+
+    def do_GroupHomeSearchAndRelativeMove(self, t, name, displacement):
+        error = self.do_GroupHomeSearch(t, name)
+        if error[0] != 0:
+            return error
+        return self.do_GroupMoveRelative(t, name, displacement)
+
+    def do_GroupSpinParametersSet(self, t, name, velocity, acceleration):
+        group = self.groups[name]
+        if group.state not in ('ready', 'spin'):
+            return -22, ''
+        velocity = float(velocity)
+        if velocity == 0:
+            group.halt(t)
+            group.state = 'ready'
+        else:
+            self._start(group, t, velocity)
+            group.state = 'spin'
+        return 0, ''
+
+    def do_GroupSpinModeStop(self, t, name, acceleration):
+        group = self.groups[name]
+        if group.state != 'spin':
+            return -22, ''
+        group.halt(t)
+        group.state = 'ready'
+        return 0, ''
+
+    def do_GroupJogModeEnable(self, t, name):
+        group = self.groups[name]
+        if group.state != 'ready':
+            return -22, ''
+        group.state = 'jog'
+        return 0, ''
+
+    def do_GroupJogModeDisable(self, t, name):
+        group = self.groups[name]
+        if group.state != 'jog':
+            return -22, ''
+        group.halt(t)
+        group.state = 'ready'
+        return 0, ''
+
+    def do_GroupJogParametersSet(self, t, name, velocity, acceleration):
+        group = self.groups[name]
+        if group.state != 'jog':
+            return -22, ''
+        self._start(group, t, float(velocity))
+        return 0, ''
+
+    def do_GroupJogCurrentGet(self, t, name, *outputs):
+        return 0, '%.6f,0' % self.groups[name].velocity(t)
+
+    def do_GroupPositionCurrentGet(self, t, name, *outputs):
+        return 0, '%.6f' % self.groups[name].position(t)
+
+    do_GroupPositionSetpointGet = do_GroupPositionCurrentGet
+
+    def do_GroupPositionTargetGet(self, t, name, *outputs):
+        group = self.groups[name]
+        stop  = group.stop_time()
+        return 0, '%.6f' % group.position(t if stop is None else stop)
+
+    def do_GroupVelocityCurrentGet(self, t, name, *outputs):
+        return 0, '%.6f' % self.groups[name].velocity(t)
+
+    def do_GroupStatusGet(self, t, name, *outputs):
+        return 0, str(STATUS[self.groups[name].state])
+
+    def _positioner(self, name):
+        for group in self.groups.values():
+            if group.positioner == name:
+                return group
+        raise KeyError(name)
+
+    def do_PositionerSGammaParametersGet(self, t, name, *outputs):
+        return 0, ','.join(repr(x) for x in self._positioner(name).profile)
+
+    def do_PositionerSGammaParametersSet(self, t, name, *profile):
+        profile = [float(x) for x in profile]
+        if len(profile) != 4 or min(profile) <= 0:
+            return -17, ''
+        self._positioner(name).profile = profile
+        return 0, ''
+
+    # TCL scripts
+    ################################################################
+    # Seconds between switch polls of the simulated scripts.
+    SCRIPT_POLL = 0.01
+
+    @property
+    def scripts(self):
+        """Simulated TCL scripts by file name."""
+        return {'nessiwheel.tcl': self._nessiwheel}
+
+    def do_TCLScriptExecuteAndWait(self, t, filename, task, *params):
+        script = self.scripts.get(filename)
+        if script is None:
+            return -17, ''
+        try:
+            script(*params[:-1])
+        except _ScriptEnd as end:
+            return 0, end.args[0]
+
+    def _call(self, name, *args):
+        t = self.now()
+        for group in self.groups.values():
+            group.settle(t)
+        return getattr(self, 'do_' + name)(t, *args)
+
+    def _nessiwheel(self, group, posbit, posval, homebit, homeval, gap, speed,
+                    slots, count, home, reverse, backlash):
+        """instrument/actuators/tcl/nessiwheel.tcl"""
+        posbit, posval, homebit, homeval, slots, count, home, reverse = [
+            int(x) for x in (posbit, posval, homebit, homeval, slots, count,
+                             home, reverse)]
+        state = {'moved': 0, 'gap': gap, 'speed': speed}
+
+        def xps(name, *args):
+            error = self._call(name, *args)[0]
+            if error != 0:
+                raise _ScriptEnd('%d,%s,%d' % (error, name, state['moved']))
+
+        def switch_is(bit, val):
+            return (self.gpio(self.now()) >> bit) & 1 == val
+
+        def search():
+            xps('GroupSpinParametersSet', group, state['speed'], '800')
+            deadline = self.now() + 20.0
+            while not switch_is(posbit, posval):
+                if self.now() >= deadline:
+                    xps('GroupSpinModeStop', group, '1200')
+                    raise _ScriptEnd('2,GPIODigitalGet,%d'
+                                     % state['moved'])
+                self.wait(self.now() + self.SCRIPT_POLL)
+            xps('GroupSpinModeStop', group, '1200')
+
+        def next_position():
+            xps('GroupMoveRelative', group, state['gap'])
+            xps('GroupMoveRelative', group, state['gap'])
+            search()
+            state['moved'] += 1
+
+        if not switch_is(posbit, posval):
+            search()
+            count -= 1
+        if home:
+            found = switch_is(homebit, homeval)
+            for i in range(slots):
+                if found:
+                    break
+                next_position()
+                found = switch_is(homebit, homeval)
+            if not found:
+                raise _ScriptEnd('1,,%d' % state['moved'])
+        elif reverse and slots - count < count:
+            state['gap'], state['speed'] = str(-float(gap)), str(-float(speed))
+            for i in range(count, slots):
+                next_position()
+            state['speed'] = speed
+            if float(backlash) != 0:
+                xps('GroupMoveRelative', group, str(-float(backlash)))
+                search()
+        else:
+            for i in range(count):
+                next_position()
+        raise _ScriptEnd('0,,%d' % state['moved'])
+
+    # I/O and housekeeping
+    ################################################################
+    def do_GPIODigitalGet(self, t, name, *outputs):
+        if name != 'GPIO4.DI':
+            return 0, '0'
+        return 0, str(self.gpio(t))
+
+    def do_ElapsedTimeGet(self, t, *outputs):
+        return 0, '%.3f' % t
+
+    def do_ErrorStringGet(self, t, code, *outputs):
+        return 0, ERRORS.get(int(code), 'Unknown error')
+
+    def do_FirmwareVersionGet(self, t, *outputs):
+        return 0, 'XPS-C8 simulator'
+
+    def do_TestTCP(self, t, *strings):
+        return 0, ','.join(s for s in strings if s != 'char *')
+
+    # Extended events
+    ################################################################
+    def do_EventExtendedConfigurationTriggerSet(self, t, name, bit, *params):
+        if not name.startswith('GPIO4.DI.'):
+            return -17, ''
+        self._trigger = (name[len('GPIO4.DI.'):], int(bit))
+        return 0, ''
+
+    def do_EventExtendedConfigurationActionSet(self, t, name, *params):
+        self._action = name
+        return 0, ''
+
+    def do_EventExtendedStart(self, t, *outputs):
+        if self._trigger is None or self._action is None:
+            return -110, ''
+        event = self._next_id
+        self._next_id += 1
+        self._events[event] = (self._trigger, self._action)
+        self._trigger = self._action = None
+        return 0, str(event)
+
+    def do_EventExtendedRemove(self, t, event):
+        if self._events.pop(int(event), None) is None:
+            return -17, ''
+        return 0, ''
+
+    # Gathering
+    ################################################################
+    def do_GatheringConfigurationSet(self, t, *types):
+        if self._gather is not None and self._gather['stop'] is None:
+            return -31, ''
+        columns = []
+        for gathered in types:
+            positioner, quantity = gathered.rsplit('.', 1)
+            columns.append((self._positioner(positioner), quantity))
+        self._gather = {'columns': columns, 'start': None, 'stop': None}
+        return 0, ''
+
+    def do_GatheringRun(self, t, points, divisor):
+        if self._gather is None:
+            return -30, ''
+        self._gather.update(start=t, stop=None, points=int(points),
+                            period=int(divisor)/10000.0)
+        return 0, ''
+
+    def do_GatheringStop(self, t):
+        if self._gather is None or self._gather['start'] is None:
+            return -30, ''
+        if self._gather['stop'] is not None or \
+           self._gathered(t) >= self._gather['points']:
+            return -22, ''
+        self._gather['stop'] = t
+        return 0, ''
+
+    def _gathered(self, t):
+        gather = self._gather
+        end = t if gather['stop'] is None else gather['stop']
+        return min(int((end - gather['start'])/gather['period']),
+                   gather['points'])
+
+    def do_GatheringCurrentNumberGet(self, t, *outputs):
+        if self._gather is None or self._gather['start'] is None:
+            return 0, '0,0'
+        return 0, '%d,%d' % (self._gathered(t), self._gather['points'])
+
+    def do_GatheringDataMultipleLinesGet(self, t, index, lines, *outputs):
+        gather = self._gather
+        index, lines = int(index), int(lines)
+        if gather is None or gather['start'] is None or \
+           index + lines > self._gathered(t):
+            return -17, ''
+        rows = []
+        for i in range(index, index + lines):
+            ts = gather['start'] + i*gather['period']
+            row = []
+            for group, quantity in gather['columns']:
+                if quantity in ('CurrentPosition', 'SetpointPosition'):
+                    row.append('%.6f' % group.position(ts))
+                elif quantity in ('CurrentVelocity', 'SetpointVelocity'):
+                    row.append('%.6f' % group.velocity(ts))
+                else:
+                    row.append('0')
+            rows.append(';'.join(row))
+        return 0, '\n'.join(rows) + '\n'
+
+    def _forget(self, t):
+        """Drops motion history that no gathering can still ask for."""
+        if self._gather is not None and self._gather['start'] is not None:
+            t = min(t, self._gather['start'])
+        for group in self.groups.values():
+            group.forget(t)
+
+
+def parse(command):
+    """Splits 'Name(a,b,c)' into ('Name', ['a', 'b', 'c'])."""
+    name, _, args = command.partition('(')
+    args = args.rstrip(')')
+    return name.strip(), [a.strip() for a in args.split(',')] if args else []
+
+
+class _Handler(SocketServer.BaseRequestHandler):
+    """Serves one controller socket.  Commands are handled in the order
+    they arrive and each reply is sent once its command completes, so a
+    move blocks the socket it was sent on."""
+
+    def setup(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.clients.add(self.request)
+
+    def finish(self):
+        self.server.clients.discard(self.request)
+
+    def handle(self):
+        server  = self.server
+        pending = ''
+        while True:
+            try:
+                data = self.request.recv(4096)
+            except Exception:
+                return
+            if not data:
+                return
+            pending += data
+            end = pending.find(')')
+            while end != -1:
+                command, pending = pending[:end + 1], pending[end + 1:]
+                error, returned = server.controller.execute(*parse(command))
+                server.delay()
+                try:
+                    self.request.sendall('%d,%s,EndOfAPI' % (error, returned))
+                except Exception:
+                    return
+                end = pending.find(')')
+
+
+class XPSSimulator(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    """TCP front end of a SimController.
+
+    Attributes:
+        controller -- Simulated controller state -> SimController
+        latency    -- Seconds added before every reply -> float
+        jitter     -- Extra uniformly distributed delay, in seconds -> float
+    """
+
+    daemon_threads      = True
+    allow_reuse_address = True
+
+    def __init__(self, host='localhost', port=0, config='nessisettings.ini',
+                 latency=0.0, jitter=0.0, speedup=1.0, seed=0):
+        SocketServer.TCPServer.__init__(self, (host, port), _Handler)
+        self.controller = SimController(config, speedup, seed)
+        self.latency    = latency
+        self.jitter     = jitter
+        self.clients    = set()
+        self._random    = random.Random(seed)
+        self._thread    = None
+
+    def delay(self):
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def start(self):
+        """Serves on a background thread and returns the bound address."""
+        self._thread = threading.Thread(name='XPSSimulator',
+                                        target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self.server_address
+
+    def stop(self):
+        """Stops serving and drops every client connection."""
+        self.shutdown()
+        for client in list(self.clients):
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+        self.server_close()
+
+
+def main():
+    parser = optparse.OptionParser(usage='%prog [options]')
+    parser.add_option('--host', default='localhost')
+    parser.add_option('--port', type='int', default=5001)
+    parser.add_option('--config', default='nessisettings.ini',
+                      help='NESSI settings file giving groups and bits')
+    parser.add_option('--latency', type='float', default=0.0,
+                      help='delay before every reply, in ms')
+    parser.add_option('--jitter', type='float', default=0.0,
+                      help='extra random delay before every reply, in ms')
+    parser.add_option('--speedup', type='float', default=1.0,
+                      help='simulated seconds per real second')
+    parser.add_option('--seed', type='int', default=0,
+                      help='seed of the initial wheel positions and jitter')
+    options, args = parser.parse_args()
+
+    sim = XPSSimulator(options.host, options.port, options.config,
+                       options.latency/1000.0, options.jitter/1000.0,
+                       options.speedup, options.seed)
+    print 'XPS simulator listening on %s:%d' % sim.server_address
+    for name in sorted(sim.controller.groups):
+        group = sim.controller.groups[name]
+        print '  %-3s %-6s at %.1f' % (name, group.positioner, group.offset)
+    try:
+        sim.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    sim.server_close()
+
+
+if __name__ == '__main__':
+    main()